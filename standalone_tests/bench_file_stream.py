@@ -0,0 +1,114 @@
+"""Benchmark file_stream uploads against a local stand-in server.
+
+Starts an http server on localhost that accepts file_stream posts (adding a
+fixed latency to each one), pushes history lines through FileStreamApi with
+and without gzip bodies and reports posts, bytes on the wire and lines/sec.
+
+    python standalone_tests/bench_file_stream.py [num_lines] [latency_ms]
+"""
+
+import json
+import random
+import sys
+import threading
+import time
+import zlib
+
+from six.moves import BaseHTTPServer
+from wandb.internal import file_stream
+
+
+class Stats(object):
+    def __init__(self):
+        self.posts = 0
+        self.wire_bytes = 0
+        self.lines = 0
+
+
+def make_handler(stats, latency):
+    class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+        def do_POST(self):  # noqa: N802
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            stats.posts += 1
+            stats.wire_bytes += len(body)
+            if self.headers.get("Content-Encoding") == "gzip":
+                body = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+            data = json.loads(body.decode("utf-8"))
+            for f in data.get("files", {}).values():
+                stats.lines += len(f["content"])
+            time.sleep(latency)
+            resp = b'{"exitcode": null, "limits": {}}'
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(resp)))
+            self.end_headers()
+            self.wfile.write(resp)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+class FakeApi(object):
+    api_key = "key"
+    user_agent = "bench"
+    dynamic_settings = {"heartbeat_seconds": 30}
+
+    def __init__(self, base_url):
+        self._base_url = base_url
+
+    def settings(self):
+        return dict(base_url=self._base_url, entity="e", project="p")
+
+
+def make_lines(num_lines):
+    lines = []
+    for i in range(num_lines):
+        row = {"_step": i, "_runtime": i * 0.01, "_timestamp": 1600000000 + i}
+        for k in range(20):
+            row["metric_%d" % k] = random.random()
+        lines.append(json.dumps(row))
+    return lines
+
+
+def run(lines, latency, compress):
+    stats = Stats()
+    server = BaseHTTPServer.HTTPServer(("127.0.0.1", 0), make_handler(stats, latency))
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    api = FakeApi("http://127.0.0.1:%d" % server.server_address[1])
+
+    fs = file_stream.FileStreamApi(api, "bench", time.time(), compress=compress)
+    fs.set_file_policy("wandb-history.jsonl", file_stream.JsonlFilePolicy())
+    start = time.time()
+    fs.start()
+    for line in lines:
+        fs.push("wandb-history.jsonl", line)
+    fs.finish(0)
+    elapsed = time.time() - start
+    server.shutdown()
+    assert stats.lines == len(lines)
+    return stats, elapsed
+
+
+def main():
+    num_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    latency = (int(sys.argv[2]) if len(sys.argv) > 2 else 50) / 1000.0
+    lines = make_lines(num_lines)
+    raw_bytes = sum(len(line) for line in lines)
+    print("{} lines, {:.1f} MiB of json".format(num_lines, raw_bytes / 2.0 ** 20))
+    for compress in (False, True):
+        stats, elapsed = run(lines, latency, compress)
+        print(
+            "{:5s} posts: {:4d}  wire: {:8.1f} KiB  {:10.0f} lines/sec".format(
+                "gzip" if compress else "plain",
+                stats.posts,
+                stats.wire_bytes / 1024.0,
+                num_lines / elapsed,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Stress StepUpload scheduling with a large backlog of upload events.
+
+Queues num_events upload requests spread over num_files run files, plus a hot
+file that is rewritten all the time (like a live tfevents file), against an
+api whose uploads only sleep for a moment. Reports how many uploads actually
+ran after coalescing and how fast the events were scheduled.
+
+    python standalone_tests/bench_step_upload.py [num_events] [num_files]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from six.moves import queue
+from wandb.filesync import stats, step_upload
+
+
+class FakeApi(object):
+    api_url = "http://localhost"
+
+    def __init__(self, upload_seconds):
+        self._upload_seconds = upload_seconds
+        self._lock = threading.Lock()
+        self.uploads = 0
+        self.url_calls = 0
+
+    def get_project(self):
+        return "bench"
+
+    def upload_urls(self, project, files):
+        with self._lock:
+            self.url_calls += 1
+        result = dict((f, {"name": f, "url": "http://localhost/" + f}) for f in files)
+        return "run", [], result
+
+    def upload_file_retry(self, url, f, callback, extra_headers=None):
+        time.sleep(self._upload_seconds)
+        with self._lock:
+            self.uploads += 1
+
+
+def main():
+    num_events = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    num_files = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    tmpdir = tempfile.mkdtemp()
+    try:
+        paths = []
+        for i in range(num_files + 1):
+            path = os.path.join(tmpdir, "media_%d.png" % i)
+            with open(path, "wb") as f:
+                f.write(b"x" * 100)
+            paths.append(path)
+        hot = paths.pop()
+
+        api = FakeApi(upload_seconds=0.005)
+        event_queue = queue.Queue()
+        step = step_upload.StepUpload(api, stats.Stats(), event_queue, 64)
+        start = time.time()
+        step.start()
+        for i in range(num_events):
+            if i % 2:
+                path, save_name = hot, "events.out.tfevents"
+            else:
+                path = paths[(i // 2) % num_files]
+                save_name = "media/" + os.path.basename(path)
+            event_queue.put(
+                step_upload.RequestUpload(
+                    path, save_name, None, None, False, None, None
+                )
+            )
+        event_queue.put(step_upload.RequestFinish())
+        step._thread.join()
+        elapsed = time.time() - start
+    finally:
+        shutil.rmtree(tmpdir)
+
+    print(
+        "{} events over {} files: {} uploads, {} url calls in {:.2f}s"
+        " ({:.0f} events/sec)".format(
+            num_events,
+            num_files + 1,
+            api.uploads,
+            api.url_calls,
+            elapsed,
+            num_events / elapsed,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
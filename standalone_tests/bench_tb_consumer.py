@@ -0,0 +1,127 @@
+"""Replay a large tfevents file through TBEventConsumer.
+
+Events are read from the file (or from a generated one with num_steps steps
+of a few scalars each) and fed to the consumer at the rate they'd come from
+a TBDirWatcher reading a busy log directory. Reports how long the consumer
+took to get through them and how far behind it fell, the time events waited
+beyond the consumer's delay.
+
+    python standalone_tests/bench_tb_consumer.py [tfevents_file | num_steps] [delay]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from six.moves import queue
+import wandb
+from wandb.internal import tb_watcher
+from wandb.internal import tfevents
+from wandb.proto import wandb_tfevents_pb2
+
+
+def write_events(path, num_steps):
+    path = os.path.join(path, "events.out.tfevents.0.bench")
+    now = time.time()
+    with open(path, "wb") as f:
+        for step in range(num_steps):
+            summary = wandb_tfevents_pb2.Summary(
+                value=[
+                    wandb_tfevents_pb2.Summary.Value(tag=tag, simple_value=step * 0.1)
+                    for tag in ("loss", "accuracy", "lr")
+                ]
+            )
+            event = wandb_tfevents_pb2.Event(
+                wall_time=now + step * 0.001, step=step, summary=summary
+            )
+            f.write(tfevents.encode_record(event.SerializeToString()))
+    return path
+
+
+def read_events(path):
+    return [
+        e for e in tfevents.EventFileReader(path).read_events() if e.HasField("summary")
+    ]
+
+
+class FakeSender(object):
+    def __init__(self):
+        self.rows = 0
+
+    def _save_history(self, data):
+        self.rows += 1
+
+
+class FakeTBWatcher(object):
+    def __init__(self):
+        self._sender = FakeSender()
+
+
+class TimingConsumer(tb_watcher.TBEventConsumer):
+    def __init__(self, *args, **kwargs):
+        super(TimingConsumer, self).__init__(*args, **kwargs)
+        self.handled = 0
+        self.max_lag = 0
+
+    def _handle_event(self, event, history=None):
+        lag = time.time() - event.created_at - self._delay
+        self.max_lag = max(self.max_lag, lag)
+        self.handled += 1
+        super(TimingConsumer, self)._handle_event(event, history=history)
+
+
+def main():
+    arg = sys.argv[1] if len(sys.argv) > 1 else "20000"
+    delay = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+    tmpdir = None
+    if os.path.isfile(arg):
+        path = arg
+    else:
+        tmpdir = tempfile.mkdtemp()
+        path = write_events(tmpdir, int(arg))
+    try:
+        events = read_events(path)
+    finally:
+        if tmpdir:
+            shutil.rmtree(tmpdir)
+    print("replaying %d events from %s with a %.1fs delay" % (len(events), path, delay))
+
+    wandb.tensorboard.reset_state()
+    tbwatcher = FakeTBWatcher()
+    q = queue.Queue()
+    consumer = TimingConsumer(tbwatcher, q, delay=delay)
+    consumer.start()
+    start = time.time()
+
+    # TBDirWatcher loads whatever was written every second, in bursts
+    def produce():
+        burst = max(1, len(events) // 10)
+        for i in range(0, len(events), burst):
+            for event in events[i : i + burst]:
+                q.put(tb_watcher.Event(event, None))
+            time.sleep(0.1)
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    producer.join()
+    while consumer.handled < len(events):
+        time.sleep(0.01)
+    elapsed = time.time() - start
+    consumer.finish()
+    print(
+        "handled %d events (%d rows) in %.2fs, %.0f events/s, max lag %.2fs"
+        % (
+            consumer.handled,
+            tbwatcher._sender.rows,
+            elapsed,
+            consumer.handled / elapsed,
+            consumer.max_lag,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark the user process -> internal process record transport.
+
+Sends history records through BackendSender to a child process that drains
+the queues the way wandb_internal does, and reports records/sec for the
+plain queue transport, the batched transport and the shared memory ring.
+
+    python standalone_tests/bench_transport.py [num_records]
+"""
+
+import multiprocessing
+import sys
+import time
+
+from wandb.interface import batch, constants, ringbuffer
+from wandb.interface.interface import BackendSender
+from wandb.proto import wandb_internal_pb2  # type: ignore
+
+
+def consume(notify_q, process_q, done_q, ring_path):
+    ring = ringbuffer.RingBuffer(ring_path) if ring_path else None
+    count = 0
+    while True:
+        if ring and not ring.request_doorbell():
+            i = constants.NOTIFY_PROCESS_RING
+        else:
+            i = notify_q.get()
+        if ring:
+            for data in ring.get_all():
+                rec = wandb_internal_pb2.Record()
+                rec.ParseFromString(data)
+                count += 1
+        if i == constants.NOTIFY_PROCESS:
+            process_q.get()
+            count += 1
+        elif i == constants.NOTIFY_PROCESS_BATCH:
+            for _ in batch.decode_records(process_q.get()):
+                count += 1
+        elif i == constants.NOTIFY_SHUTDOWN:
+            break
+    done_q.put(count)
+
+
+def make_records(num_records):
+    records = []
+    for i in range(num_records):
+        history = wandb_internal_pb2.HistoryRecord()
+        for k, v in (("loss", 1.0 / (i + 1)), ("acc", i % 100), ("_step", i)):
+            item = history.item.add()
+            item.key = k
+            item.value_json = str(v)
+        records.append(wandb_internal_pb2.Record(history=history))
+    return records
+
+
+def run(records, batch_bytes=None, ring=None):
+    ctx = multiprocessing.get_context("spawn")
+    notify_q, process_q, done_q = ctx.Queue(), ctx.Queue(), ctx.Queue()
+    ring_path = ring.path if ring else None
+    proc = ctx.Process(target=consume, args=(notify_q, process_q, done_q, ring_path))
+    proc.start()
+
+    sender = BackendSender(
+        process_queue=process_q,
+        notify_queue=notify_q,
+        batch_bytes=batch_bytes,
+        batch_seconds=0.05,
+        ring=ring,
+    )
+    start = time.time()
+    for rec in records:
+        sender._queue_process(rec)
+    sender.flush()
+    notify_q.put(constants.NOTIFY_SHUTDOWN)
+    count = done_q.get()
+    elapsed = time.time() - start
+    proc.join()
+    assert count == len(records)
+    return len(records) / elapsed
+
+
+def main():
+    num_records = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    records = make_records(num_records)
+    queue_rate = run(records)
+    print("queue: {:10.0f} records/sec".format(queue_rate))
+    for batch_bytes in (16 * 1024, 256 * 1024):
+        rate = run(records, batch_bytes=batch_bytes)
+        print(
+            "batch ({:3d} KiB): {:10.0f} records/sec ({:.1f}x)".format(
+                batch_bytes // 1024, rate, rate / queue_rate
+            )
+        )
+    ring = ringbuffer.RingBuffer.create(8 * 1024 * 1024)
+    try:
+        rate = run(records, ring=ring)
+    finally:
+        ring.close()
+        ring.unlink()
+    print(
+        "shm ring:        {:10.0f} records/sec ({:.1f}x)".format(
+            rate, rate / queue_rate
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
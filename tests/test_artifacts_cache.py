@@ -0,0 +1,260 @@
+"""artifacts cache tests."""
+
+from __future__ import print_function
+
+import base64
+import hashlib
+import os
+import threading
+import time
+
+import pytest
+from wandb.lib import filesystem
+from wandb.sdk import wandb_artifacts
+
+
+def md5(data):
+    return base64.b64encode(hashlib.md5(data).digest()).decode("ascii")
+
+
+def add(cache, tmpdir, data, age):
+    """Add data to the cache as if it was last used age seconds ago."""
+    src = str(tmpdir.join("src"))
+    with open(src, "wb") as f:
+        f.write(data)
+    path = cache.copy_md5_obj(src, md5(data), len(data))
+    then = time.time() - age
+    os.utime(path, (then, then))
+    return path
+
+
+@pytest.fixture()
+def cache(tmpdir):
+    return wandb_artifacts.ArtifactsCache(str(tmpdir.join("cache")))
+
+
+def test_copy_md5_obj(cache, tmpdir):
+    path = add(cache, tmpdir, b"hello", 0)
+    assert open(path, "rb").read() == b"hello"
+    assert cache.check_md5_obj_path(md5(b"hello"), 5) == (path, True)
+    assert os.listdir(os.path.dirname(path)) == [os.path.basename(path)]
+
+
+def test_cleanup_lru(cache, tmpdir):
+    oldest = add(cache, tmpdir, b"a" * 100, 5000)
+    used = add(cache, tmpdir, b"b" * 100, 4000)
+    newer = add(cache, tmpdir, b"c" * 100, 3000)
+    # a hit makes it the most recently used
+    assert cache.check_md5_obj_path(md5(b"a" * 100), 100) == (oldest, True)
+    result = cache.cleanup(150)
+    assert result == (100, 200, 2)
+    assert [os.path.exists(p) for p in (oldest, used, newer)] == [True, False, False]
+
+
+def test_hit_keeps_mtime(cache, tmpdir):
+    # downloads compare the object's mtime to their copy's
+    path = add(cache, tmpdir, b"hello", 5000)
+    mtime = os.stat(path).st_mtime
+    assert cache.check_md5_obj_path(md5(b"hello"), 5) == (path, True)
+    assert os.stat(path).st_mtime == mtime
+    assert os.stat(path).st_atime > mtime + 4000
+
+
+def test_cleanup_skips_pinned(cache, tmpdir):
+    pinned = add(cache, tmpdir, b"a" * 100, 5000)
+    other = add(cache, tmpdir, b"b" * 100, 4000)
+    cache.pin(pinned)
+    cache.pin(pinned)
+    assert cache.cleanup(0) == (0, 100, 1)
+    assert os.path.exists(pinned) and not os.path.exists(other)
+    cache.unpin(pinned)
+    cache.cleanup(0)
+    assert os.path.exists(pinned)
+    cache.unpin(pinned)
+    assert os.listdir(cache._pins_dir) == []
+    assert cache.cleanup(0) == (0, 100, 1)
+
+
+def test_pins_of_exited_processes_removed(cache, tmpdir, monkeypatch):
+    path = add(cache, tmpdir, b"a" * 100, 5000)
+    cache.pin(path)
+    monkeypatch.setattr(wandb_artifacts.psutil, "pid_exists", lambda pid: False)
+    assert cache.cleanup(0) == (0, 100, 1)
+    assert os.listdir(cache._pins_dir) == []
+
+
+def test_cleanup_keeps_recent_and_removes_stale_tmp(cache, tmpdir):
+    recent = add(cache, tmpdir, b"recent", 10)
+    tmp_dir = os.path.join(cache.md5_obj_dir, "aa")
+    os.makedirs(tmp_dir)
+    stale = os.path.join(tmp_dir, ".stale.tmp")
+    writing = os.path.join(tmp_dir, ".writing.tmp")
+    for path in (stale, writing):
+        with open(path, "wb") as f:
+            f.write(b"x" * 10)
+    os.utime(stale, (0, 0))
+    result = cache.cleanup(0)
+    assert result == (6, 10, 1)
+    assert os.path.exists(recent) and os.path.exists(writing)
+    assert not os.path.exists(stale)
+
+
+def test_cleanup_while_locked(cache, tmpdir):
+    add(cache, tmpdir, b"data", 5000)
+    with filesystem.file_lock(cache._lock_path):
+        assert cache.cleanup(0, blocking=False) is None
+    assert cache.cleanup(0, blocking=False) == (0, 4, 1)
+
+
+def test_max_bytes(tmpdir):
+    cache = wandb_artifacts.ArtifactsCache(str(tmpdir.join("cache")), max_bytes=1000)
+    paths = [add(cache, tmpdir, os.urandom(300), 5000 - i) for i in range(6)]
+    # cleaned up to make room on the first addition and every 100 bytes after
+    assert [os.path.exists(p) for p in paths] == [False] * 3 + [True] * 3
+
+
+class FakeResponse(object):
+    def __init__(self, session, data, status_code=200):
+        self.session = session
+        self.data = data
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        try:
+            for i in range(0, len(self.data), chunk_size):
+                yield self.data[i : i + chunk_size]
+        finally:
+            self.close()
+
+    def close(self):
+        with self.session.lock:
+            self.session.in_flight -= 1
+
+
+class FakeSession(object):
+    def __init__(self, data, ranges=False, delay=0.1):
+        self.data = data
+        self.ranges = ranges
+        self.delay = delay
+        self.gets = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def get(self, url, headers=None, **kwargs):
+        byte_range = (headers or {}).get("Range")
+        with self.lock:
+            self.gets.append(byte_range)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        if byte_range and self.ranges:
+            start, end = [int(i) for i in byte_range[len("bytes=") :].split("-")]
+            return FakeResponse(self, self.data[start : end + 1], 206)
+        return FakeResponse(self, self.data)
+
+
+class FakeArtifact(object):
+    entity = "mock_server_entity"
+
+
+def storage_policy(cache, session):
+    policy = wandb_artifacts.WandbStoragePolicy()
+    policy._cache = cache
+    policy._session = session
+    return policy
+
+
+def entry(data):
+    return wandb_artifacts.ArtifactManifestEntry(
+        "f.bin", None, md5(data), size=len(data)
+    )
+
+
+def test_load_file_downloads_once(cache, runner):
+    data = os.urandom(3 * 1024 * 1024 + 5)
+    session = FakeSession(data)
+    policy = storage_policy(cache, session)
+    artifact = FakeArtifact()
+    paths = []
+    threads = [
+        threading.Thread(
+            target=lambda: paths.append(
+                policy.load_file(artifact, "f.bin", entry(data))
+            )
+        )
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert session.gets == [None]
+    assert len(set(paths)) == 1 and open(paths[0], "rb").read() == data
+    assert os.listdir(os.path.dirname(paths[0])) == [os.path.basename(paths[0])]
+
+
+def test_load_file_digest_mismatch(cache, runner):
+    data = b"expected data"
+    policy = storage_policy(cache, FakeSession(b"corrupt data!"))
+    artifact = FakeArtifact()
+    with pytest.raises(ValueError):
+        policy.load_file(artifact, "f.bin", entry(data))
+    path, hit = cache.check_md5_obj_path(md5(data), len(data))
+    assert not hit
+    assert os.listdir(os.path.dirname(path)) == []
+
+
+@pytest.fixture()
+def small_parts(monkeypatch):
+    monkeypatch.setattr(wandb_artifacts, "RANGED_DOWNLOAD_MIN_BYTES", 1000)
+    monkeypatch.setattr(wandb_artifacts, "RANGED_DOWNLOAD_PART_BYTES", 100)
+
+
+@pytest.mark.skipif(not hasattr(os, "pwrite"), reason="needs os.pwrite")
+def test_ranged_download(cache, runner, small_parts, monkeypatch):
+    monkeypatch.setattr(wandb_artifacts, "_download_slots", threading.Semaphore(3))
+    data = os.urandom(1050)
+    session = FakeSession(data, ranges=True, delay=0.01)
+    path = storage_policy(cache, session).load_file(
+        FakeArtifact(), "f.bin", entry(data)
+    )
+    assert open(path, "rb").read() == data
+    assert sorted(session.gets) == sorted(
+        "bytes=%d-%d" % (i, min(i + 99, 1049)) for i in range(0, 1050, 100)
+    )
+    # parts run in parallel, within the global limit
+    assert session.max_in_flight == 3
+    assert os.listdir(os.path.dirname(path)) == [os.path.basename(path)]
+
+
+@pytest.mark.skipif(not hasattr(os, "pwrite"), reason="needs os.pwrite")
+def test_ranged_download_resumes(cache, runner, small_parts):
+    data = os.urandom(1050)
+    path, _ = cache.check_md5_obj_path(md5(data), len(data))
+    dir_name, base_name = os.path.split(path)
+    # a previous attempt got parts 0 and 3 before it was interrupted
+    with open(os.path.join(dir_name, ".%s.download.tmp" % base_name), "wb") as f:
+        f.write(data[:100] + b"\0" * 200 + data[300:400] + b"\0" * 650)
+    with open(os.path.join(dir_name, ".%s.parts.tmp" % base_name), "w") as f:
+        f.write("1050 100\n0\n3\n")
+    session = FakeSession(data, ranges=True, delay=0)
+    storage_policy(cache, session).load_file(FakeArtifact(), "f.bin", entry(data))
+    assert open(path, "rb").read() == data
+    assert len(session.gets) == 9
+    assert "bytes=0-99" not in session.gets and "bytes=300-399" not in session.gets
+    assert os.listdir(dir_name) == [base_name]
+
+
+def test_ranged_download_not_supported(cache, runner, small_parts):
+    data = os.urandom(1050)
+    session = FakeSession(data, ranges=False, delay=0)
+    path = storage_policy(cache, session).load_file(
+        FakeArtifact(), "f.bin", entry(data)
+    )
+    assert open(path, "rb").read() == data
+    assert session.gets[-1] is None
+    assert os.listdir(os.path.dirname(path)) == [os.path.basename(path)]
@@ -229,6 +229,25 @@ def test_artifact_upload(runner, git_repo, mock_server, mocker, mocked_run):
     assert "test/simple:v0" in result.output
 
 
+def test_artifact_cache_cleanup(runner, mocker):
+    cache = wandb.wandb_sdk.wandb_artifacts.ArtifactsCache(os.path.join(os.getcwd(), "cache"))
+    mocker.patch("wandb.wandb_sdk.wandb_artifacts.get_artifacts_cache", lambda: cache)
+    with open("big.bin", "wb") as f:
+        f.write(b"x" * 2048)
+    path = cache.copy_md5_obj("big.bin", "z7dn8iXVhGnF3jYyqIA5WA==", 2048)
+    os.utime(path, (0, 0))
+    result = runner.invoke(cli.artifact, ["cache", "cleanup", "1KB"])
+    print(result.output)
+    print(result.exception)
+    print(traceback.print_tb(result.exc_info[2]))
+    assert result.exit_code == 0
+    assert "Reclaimed 2.0KiB in 1 files, the cache now uses 0.0B" in result.output
+    assert not os.path.exists(path)
+    result = runner.invoke(cli.artifact, ["cache", "cleanup", "lots"])
+    assert result.exit_code != 0
+    assert "Invalid target size" in result.output
+
+
 def test_artifact_ls(runner, git_repo, mock_server):
     result = runner.invoke(cli.artifact, ["ls", "test"])
     print(result.output)
@@ -130,3 +130,205 @@ def test_data_write_fill(with_datastore):
     records = 3
     lengths = (7, 32753, 0, 0), (32760, 8, 0, 0), (32768, 8, 0, 0)
     check(with_datastore, chunk_sizes=sizes, expected_records=records, expected_record_sizes=lengths)
+
+
+def scan(ds):
+    ds.close()
+    reader = datastore.DataStore()
+    reader.open_for_scan(FNAME)
+    records = list(reader)
+    reader.close()
+    return records
+
+
+def test_scan_empty(with_datastore):
+    """A file holding only the header has no records."""
+    assert scan(with_datastore) == []
+
+
+def test_scan_multi_block(with_datastore):
+    """Records split into first/middle/last are reassembled."""
+    ds = with_datastore
+    chunks = [
+        b'\x01' * 10,
+        b'\x02' * (32768 * 3 + 5),
+        b'\x03' * (32768 - 7 - 7 - 6),
+        b'',
+        b'\x04' * 100,
+    ]
+    for chunk in chunks:
+        ds._write_data(chunk)
+    assert scan(ds) == chunks
+
+
+def test_scan_proto(with_datastore):
+    """Protos written through write() parse back from the scanned data."""
+    ds = with_datastore
+    recs = []
+    for i in range(1000):
+        rec = wandb_internal_pb2.Record()
+        item = rec.history.item.add()
+        item.key = "step"
+        item.value_json = json.dumps(i)
+        ds.write(rec)
+        recs.append(rec)
+    scanned = []
+    for data in scan(ds):
+        rec = wandb_internal_pb2.Record()
+        rec.ParseFromString(data)
+        scanned.append(rec)
+    assert scanned == recs
+
+
+def test_scan_truncated(with_datastore):
+    """A record cut short by a crash ends the scan."""
+    ds = with_datastore
+    ds._write_data(b'\x01' * 10)
+    ds._write_data(b'\x02' * 40000)
+    ds.close()
+    with open(FNAME, "r+b") as f:
+        f.truncate(32768 + 100)
+    assert scan(ds) == [b'\x01' * 10]
+
+
+def test_commit_writes_group(with_datastore):
+    """Records only reach the file when their group is committed."""
+    ds = with_datastore
+    first = ds._write_data(b'\x01' * 10)
+    second = ds._write_data(b'\x02' * 10)
+    assert os.stat(FNAME).st_size == 0
+    assert ds.commit() == 1
+    assert os.stat(FNAME).st_size == 7 + 2 * (7 + 10)
+    third = ds._write_data(b'\x03' * 10)
+    assert first[2:] == second[2:] == (0, 0)
+    assert third[2:] == (1, 7 + 2 * (7 + 10))
+    assert ds.commit() == 2
+    # nothing new, no new group
+    assert ds.commit() == 2
+    assert scan(ds) == [b'\x01' * 10, b'\x02' * 10, b'\x03' * 10]
+
+
+def test_commit_large_group(with_datastore):
+    """Groups bigger than the write buffer are written as they fill up."""
+    ds = with_datastore
+    chunks = [bytes(bytearray([i % 256])) * 5000 for i in range(100)]
+    for chunk in chunks:
+        ds._write_data(chunk)
+    assert os.stat(FNAME).st_size % datastore.LEVELDBLOG_BLOCK_LEN == 0
+    ds.commit()
+    assert scan(ds) == chunks
+
+
+@pytest.mark.parametrize("durability", datastore.DURABILITY_MODES)
+def test_durability(durability):
+    """Every durability mode writes the same file."""
+    try:
+        os.unlink(FNAME)
+    except (IOError, OSError):
+        pass
+    wandb._set_internal_process()
+    ds = datastore.DataStore(durability=durability, fsync_seconds=0)
+    ds.open_for_write(FNAME)
+    try:
+        ds._write_data(b'\x01' * 10)
+        ds.commit()
+        size = os.stat(FNAME).st_size
+        assert size == (0 if durability == datastore.DURABILITY_NONE else 24)
+        assert scan(ds) == [b'\x01' * 10]
+    finally:
+        os.unlink(FNAME)
+
+
+def test_durability_unknown():
+    wandb._set_internal_process()
+    with pytest.raises(ValueError):
+        datastore.DataStore(durability="sometimes")
+
+
+def reopen(ds):
+    ds.close()
+    appender = datastore.DataStore()
+    appender.open_for_append(FNAME)
+    return appender
+
+
+def test_append(with_datastore):
+    """Records appended after a reopen follow the existing ones."""
+    ds = with_datastore
+    chunks = [b'\x01' * 10, b'\x02' * 40000, b'\x03' * (32768 - 7 - 7 - 3)]
+    for chunk in chunks[:2]:
+        ds._write_data(chunk)
+    ds = reopen(ds)
+    assert ds.tell() == os.stat(FNAME).st_size
+    ds._write_data(chunks[2])
+    ds = reopen(ds)
+    # the next record starts in a new block
+    ds._write_data(b'\x04')
+    chunks.append(b'\x04')
+    assert scan(ds) == chunks
+
+
+def test_append_torn_tail(with_datastore):
+    """A record cut short by a crash is truncated before appending."""
+    ds = with_datastore
+    ds._write_data(b'\x01' * 10)
+    ds._write_data(b'\x02' * 100000)
+    ds.close()
+    with open(FNAME, "r+b") as f:
+        f.truncate(32768 * 2 + 100)
+    ds = reopen(ds)
+    assert ds.tell() == 7 + 7 + 10
+    ds._write_data(b'\x03' * 10)
+    assert scan(ds) == [b'\x01' * 10, b'\x03' * 10]
+
+
+def test_append_corrupt_tail(with_datastore):
+    """Garbage after the last record is truncated before appending."""
+    ds = with_datastore
+    ds._write_data(b'\x01' * 10)
+    ds.close()
+    with open(FNAME, "ab") as f:
+        f.write(b'\x00' * 20)
+    ds = reopen(ds)
+    ds._write_data(b'\x02' * 10)
+    assert scan(ds) == [b'\x01' * 10, b'\x02' * 10]
+
+
+def test_append_empty(with_datastore):
+    """A file without a complete header is started over."""
+    ds = with_datastore
+    ds.close()
+    with open(FNAME, "wb") as f:
+        f.write(b':W')
+    ds = reopen(ds)
+    ds._write_data(b'\x01' * 10)
+    assert scan(ds) == [b'\x01' * 10]
+
+
+def test_append_bad_header(with_datastore):
+    ds = with_datastore
+    ds.close()
+    with open(FNAME, "wb") as f:
+        f.write(b'garbage' * 10)
+    with pytest.raises(Exception):
+        reopen(ds)
+
+
+def test_append_bad_checksum(with_datastore):
+    """A damaged last record is found without relying on asserts."""
+    ds = with_datastore
+    ds._write_data(b'\x01' * 10)
+    ds._write_data(b'\x02' * 10)
+    ds.close()
+    with open(FNAME, "r+b") as f:
+        f.seek(7 + 17 + 7)
+        f.write(b'\x09')
+    s = datastore.DataStore()
+    s.open_for_scan(FNAME)
+    assert s.scan_data() == b'\x01' * 10
+    with pytest.raises(datastore.DataStoreCorruptError):
+        s.scan_data()
+    s.close()
+    ds = reopen(ds)
+    ds._write_data(b'\x03' * 10)
+    assert scan(ds) == [b'\x01' * 10, b'\x03' * 10]
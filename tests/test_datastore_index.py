@@ -0,0 +1,177 @@
+"""datastore index tests."""
+
+from __future__ import print_function
+
+import json
+import os
+
+import pytest
+import wandb
+from wandb.internal import datastore, datastore_index
+from wandb.proto import wandb_internal_pb2  # type: ignore
+
+
+def history(step):
+    rec = wandb_internal_pb2.Record()
+    for k, v in (("_step", step), ("loss", 1.0 / (step + 1))):
+        item = rec.history.item.add()
+        item.key = k
+        item.value_json = json.dumps(v)
+    return rec
+
+
+def summary(step):
+    rec = wandb_internal_pb2.Record()
+    item = rec.summary.update.add()
+    item.key = "best"
+    item.value_json = json.dumps(step)
+    return rec
+
+
+@pytest.fixture()
+def run_file(tmpdir):
+    """Fixture which writes a datastore and its index, returning the file name."""
+    wandb._set_internal_process()
+    fname = str(tmpdir.join("run.wandb"))
+    ds = datastore.DataStore()
+    ds.open_for_write(fname)
+    index = datastore_index.IndexWriter(datastore_index.index_path(fname))
+    index.open_for_write()
+    for step in range(500):
+        rec = history(step)
+        if step == 250:
+            # big enough to span blocks
+            rec.history.item[1].value_json = json.dumps("x" * 70000)
+        index.add(rec, ds.write(rec)[0])
+        if step % 100 == 0:
+            rec = summary(step)
+            index.add(rec, ds.write(rec)[0])
+        if step % 10 == 0:
+            ds.commit()
+            index.commit()
+    ds.close()
+    index.close()
+    return fname
+
+
+def test_read_index(run_file):
+    entries = datastore_index.read_index(run_file)
+    assert len(entries) == 505
+    assert entries[0] == (7, 0, "history")
+    assert entries[1].record_type == "summary"
+    assert entries[1].step == datastore_index.NO_STEP
+
+
+def test_last_records(run_file):
+    recs = datastore_index.last_history(run_file, 3)
+    assert recs == [history(497), history(498), history(499)]
+    assert datastore_index.last_records(run_file, "summary") == [summary(400)]
+    assert datastore_index.last_records(run_file, "config") == []
+    assert datastore_index.last_step(run_file) == 499
+
+
+def test_multi_block_record(run_file):
+    entries = datastore_index.read_index(run_file)
+    entry = [e for e in entries if e.step == 250][0]
+    (rec,) = datastore_index.read_records(run_file, [entry])
+    assert rec.history.item[1].value_json == json.dumps("x" * 70000)
+
+
+def test_index_past_data(run_file):
+    """Entries for data that never made it to the file are ignored."""
+    entries = datastore_index.read_index(run_file)
+    last = entries[-1]
+    with open(run_file, "r+b") as f:
+        f.truncate(last.offset)
+    with open(datastore_index.index_path(run_file), "ab") as f:
+        f.write(b"\x01\x02\x03")
+    assert datastore_index.read_index(run_file) == entries[:-1]
+    assert datastore_index.last_step(run_file) == 498
+
+
+def test_build_index(run_file):
+    """A missing index is rebuilt by scanning the file."""
+    entries = datastore_index.read_index(run_file)
+    os.remove(datastore_index.index_path(run_file))
+    assert datastore_index.read_index(run_file) is None
+    assert datastore_index.last_step(run_file) == 499
+    assert datastore_index.read_index(run_file) == entries
+
+
+def test_append(run_file):
+    """Reopening for append drops entries of records that did not survive."""
+    entries = datastore_index.read_index(run_file)
+    with open(run_file, "r+b") as f:
+        f.truncate(entries[-1].offset + 3)
+    ds = datastore.DataStore()
+    ds.open_for_append(run_file)
+    index = datastore_index.IndexWriter(datastore_index.index_path(run_file))
+    index.open_for_append(run_file, ds.tell())
+    rec = history(1000)
+    index.add(rec, ds.write(rec)[0])
+    ds.close()
+    index.close()
+    assert datastore_index.read_index(run_file)[:-1] == entries[:-1]
+    assert datastore_index.last_history(run_file, 2) == [history(498), history(1000)]
+
+
+def test_index_behind_data(run_file):
+    """Records that made it to the datastore but not to the index are found."""
+    entries = datastore_index.read_index(run_file)
+    with open(datastore_index.index_path(run_file), "r+b") as f:
+        f.truncate(datastore_index._HEADER.size + 100 * datastore_index._ENTRY.size)
+    assert datastore_index.last_step(run_file) == 499
+    assert datastore_index.last_history(run_file, 2) == [history(498), history(499)]
+
+    ds = datastore.DataStore()
+    ds.open_for_append(run_file)
+    index = datastore_index.IndexWriter(datastore_index.index_path(run_file))
+    index.open_for_append(run_file, ds.tell())
+    rec = history(1000)
+    index.add(rec, ds.write(rec)[0])
+    ds.close()
+    index.close()
+    assert datastore_index.read_index(run_file)[:-1] == entries
+    assert datastore_index.last_step(run_file) == 1000
+
+
+def test_header_only_index(tmpdir):
+    wandb._set_internal_process()
+    fname = str(tmpdir.join("run.wandb"))
+    ds = datastore.DataStore()
+    ds.open_for_write(fname)
+    index = datastore_index.IndexWriter(datastore_index.index_path(fname))
+    index.open_for_write()
+    for step in range(5):
+        ds.write(history(step))
+    ds.close()
+    index.close()
+    assert datastore_index.last_step(fname) == 4
+
+    ds = datastore.DataStore()
+    ds.open_for_append(fname)
+    index = datastore_index.IndexWriter(datastore_index.index_path(fname))
+    index.open_for_append(fname, ds.tell())
+    rec = history(5)
+    index.add(rec, ds.write(rec)[0])
+    ds.close()
+    index.close()
+    assert [e.step for e in datastore_index.read_index(fname)] == list(range(6))
+
+
+def test_fsync_index(run_file, monkeypatch):
+    synced = []
+    monkeypatch.setattr(os, "fsync", synced.append)
+    index = datastore_index.IndexWriter(
+        datastore_index.index_path(run_file),
+        durability=datastore.DURABILITY_FSYNC,
+        fsync_seconds=3600,
+    )
+    index.open_for_append(run_file, os.path.getsize(run_file))
+    index.add(history(1000), os.path.getsize(run_file) + 7)
+    index.commit()
+    index.add(history(1001), os.path.getsize(run_file) + 100)
+    index.commit()
+    assert len(synced) == 1
+    index.close()
+    assert len(synced) == 2
@@ -0,0 +1,203 @@
+"""dir_watcher tests."""
+
+from __future__ import print_function
+
+import os
+import threading
+import time
+
+import pytest
+from watchdog.observers.polling import PollingObserver
+from wandb.filesync import dir_watcher
+
+
+class FakeSettings(object):
+    def __init__(self, files_dir):
+        self.files_dir = files_dir
+        self.ignore_globs = []
+
+
+class FakeFilePusher(object):
+    def __init__(self):
+        self.changed = []
+
+    def file_changed(self, save_name, path, copy=True):
+        self.changed.append(save_name)
+
+
+def write(path, data=b"data"):
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+@pytest.fixture()
+def watcher(tmpdir):
+    watchers = []
+
+    def make():
+        pusher = FakeFilePusher()
+        w = dir_watcher.DirWatcher(FakeSettings(str(tmpdir)), None, pusher)
+        watchers.append(w)
+        return w, pusher
+
+    yield make
+    for w in watchers:
+        if w._file_observer.is_alive():
+            w._file_observer.stop()
+
+
+@pytest.mark.skipif(dir_watcher.InotifyObserver is None, reason="needs inotify")
+def test_inotify_sees_new_files(tmpdir, watcher):
+    w, _ = watcher()
+    assert not w._polling
+    write(str(tmpdir.join("model.h5")))
+    deadline = time.time() + 5
+    while "model.h5" not in w._file_event_handlers and time.time() < deadline:
+        time.sleep(0.05)
+    assert "model.h5" in w._file_event_handlers
+
+
+def test_polls_network_filesystems(watcher, monkeypatch):
+    monkeypatch.setattr(dir_watcher, "filesystem_type", lambda path: "nfs4")
+    w, _ = watcher()
+    assert w._polling
+    assert isinstance(w._file_observer, PollingObserver)
+
+
+def test_polls_without_inotify_watches(watcher, monkeypatch):
+    class NoWatchesObserver(PollingObserver):
+        def start(self):
+            raise OSError(28, "inotify watch limit reached")
+
+    monkeypatch.setattr(dir_watcher, "InotifyObserver", NoWatchesObserver)
+    w, _ = watcher()
+    assert w._polling
+    assert w._file_observer.is_alive()
+
+
+def test_finish_scans_unseen_files(tmpdir, watcher):
+    w, pusher = watcher()
+    write(str(tmpdir.join("seen.txt")))
+    write(str(tmpdir.join("deleted.txt")))
+    w._get_file_event_handler(str(tmpdir.join("seen.txt")), "seen.txt")
+    w._get_file_event_handler(str(tmpdir.join("deleted.txt")), "deleted.txt")
+    os.remove(str(tmpdir.join("deleted.txt")))
+    os.makedirs(str(tmpdir.join("media")))
+    write(str(tmpdir.join("media", "unseen.png")))
+    w.finish()
+    assert sorted(pusher.changed) == ["media/unseen.png", "seen.txt"]
+
+
+@pytest.mark.parametrize(
+    "save_name,policy",
+    [
+        ("checkpoints/a.txt", "live"),
+        ("checkpoints/.hidden", None),
+        ("checkpoints/x/y.txt", None),
+        ("checkpoints/best.pt", "now"),
+        ("model.h5", "now"),
+        ("sub/model.h5", None),
+        ("ckpt/model_3.pt", "now"),
+        ("ckpt/model_x.pt", None),
+        ("a/b1.txt", "live"),
+        ("a/b1.txt.bak", None),
+        ("other.txt", None),
+        ("logs/a.txt", "live"),
+        ("logs/]a.txt", None),
+    ],
+)
+def test_policy_matcher(save_name, policy):
+    matcher = dir_watcher.PolicyMatcher()
+    matcher.add("checkpoints/*", "live")
+    matcher.add("checkpoints/best*", "now")
+    matcher.add("*.h5", "now")
+    matcher.add("ckpt/model_[0-9].pt", "now")
+    matcher.add("./a/b?.txt", "live")
+    matcher.add("logs/[!]]*", "live")
+    assert matcher.policy(save_name) == policy
+
+
+def test_new_files_classified_without_globbing(tmpdir, watcher, monkeypatch):
+    w, _ = watcher()
+    w.update_policy("checkpoints/*", "live")
+    w.update_policy("*.json", "now")
+    monkeypatch.setattr(dir_watcher.glob, "glob", None)
+    handler = w._get_file_event_handler(
+        str(tmpdir.join("checkpoints", "a.pt")), os.path.join("checkpoints", "a.pt")
+    )
+    assert isinstance(handler, dir_watcher.PolicyLive)
+    handler = w._get_file_event_handler(str(tmpdir.join("b.json")), "b.json")
+    assert isinstance(handler, dir_watcher.PolicyNow)
+    handler = w._get_file_event_handler(str(tmpdir.join("c.txt")), "c.txt")
+    assert isinstance(handler, dir_watcher.PolicyEnd)
+
+
+@pytest.mark.skipif(dir_watcher.InotifyObserver is None, reason="needs inotify")
+def test_live_symlinked_file_uploaded_on_change(tmpdir):
+    # wandb.save links the user's files into the run directory
+    run_dir = tmpdir.mkdir("files")
+    target = write(str(tmpdir.mkdir("user").join("model.ckpt")))
+    os.symlink(target, str(run_dir.join("model.ckpt")))
+    pusher = FakeFilePusher()
+    w = dir_watcher.DirWatcher(FakeSettings(str(run_dir)), None, pusher)
+    try:
+        assert not w._polling
+        w.update_policy("model.ckpt", "live")
+        assert pusher.changed == ["model.ckpt"]
+        time.sleep(0.1)
+        with open(target, "ab") as f:
+            f.write(b"more data")
+        deadline = time.time() + 5
+        while len(pusher.changed) < 2 and time.time() < deadline:
+            time.sleep(0.05)
+        assert pusher.changed == ["model.ckpt", "model.ckpt"]
+    finally:
+        w.finish()
+
+
+@pytest.mark.skipif(dir_watcher.InotifyObserver is None, reason="needs inotify")
+def test_symlink_policy_while_dispatching(tmpdir, monkeypatch):
+    """The observer can be waiting for the watcher's lock as a link gets a policy."""
+    run_dir = tmpdir.mkdir("files")
+    target = write(str(tmpdir.mkdir("user").join("model.ckpt")))
+    os.symlink(target, str(run_dir.join("model.ckpt")))
+    w = dir_watcher.DirWatcher(FakeSettings(str(run_dir)), None, FakeFilePusher())
+    orig_watch = w._watch_link_target
+
+    def watch_link_target(file_path, save_name):
+        # an event comes in, the observer blocks on the lock we hold
+        write(str(run_dir.join("output.log")))
+        time.sleep(0.5)
+        return orig_watch(file_path, save_name)
+
+    monkeypatch.setattr(w, "_watch_link_target", watch_link_target)
+    thread = threading.Thread(target=w.update_policy, args=("model.ckpt", "live"))
+    thread.daemon = True
+    thread.start()
+    thread.join(10)
+    assert not thread.is_alive()
+    assert w._target_dirs == set([os.path.realpath(str(tmpdir.join("user")))])
+    w.finish()
+
+
+@pytest.mark.skipif(dir_watcher.InotifyObserver is None, reason="needs inotify")
+def test_symlink_into_run_dir(tmpdir):
+    run_dir = tmpdir.mkdir("files")
+    target = write(str(run_dir.mkdir("ckpt").join("model.ckpt")))
+    os.symlink(target, str(run_dir.join("best.ckpt")))
+    pusher = FakeFilePusher()
+    w = dir_watcher.DirWatcher(FakeSettings(str(run_dir)), None, pusher)
+    try:
+        w.update_policy("best.ckpt", "live")
+        # the recursive watch of the run directory covers the target
+        assert w._target_dirs == set()
+        time.sleep(0.1)
+        with open(target, "ab") as f:
+            f.write(b"more data")
+        deadline = time.time() + 5
+        while pusher.changed.count("best.ckpt") < 2 and time.time() < deadline:
+            time.sleep(0.05)
+        assert pusher.changed.count("best.ckpt") == 2
+    finally:
+        w.finish()
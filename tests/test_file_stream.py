@@ -0,0 +1,252 @@
+"""file_stream tests."""
+
+from __future__ import print_function
+
+import json
+import os
+import time
+import zlib
+
+import pytest
+import requests
+import wandb
+from wandb import util
+from wandb.internal import file_stream
+from wandb.proto import wandb_internal_pb2  # type: ignore
+from wandb.sdk import wandb_run
+
+
+class FakeApi(object):
+    api_key = "key"
+    user_agent = "test"
+    dynamic_settings = {"heartbeat_seconds": 30}
+
+    def settings(self):
+        return dict(base_url="http://localhost", entity="e", project="p")
+
+
+class FakeResponse(object):
+    def __init__(self, status_code=200, text=""):
+        self.status_code = status_code
+        self.text = text
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(response=self)
+
+    def json(self):
+        return {}
+
+
+class FakeClient(object):
+    def __init__(self, reject_gzip=None):
+        # the response for gzipped posts, if they are rejected
+        self.reject_gzip = reject_gzip
+        self.posts = []
+
+    def post(self, url, **kwargs):
+        self.posts.append(kwargs)
+        if self.reject_gzip and "data" in kwargs:
+            return self.reject_gzip
+        return FakeResponse()
+
+
+def chunks(sizes):
+    return [file_stream.Chunk("f", "x" * size) for size in sizes]
+
+
+def test_gzip_compress():
+    data = json.dumps({"files": ["a" * 1000]}).encode("utf-8")
+    body = file_stream.gzip_compress(data)
+    assert len(body) < len(data)
+    assert zlib.decompress(body, 16 + zlib.MAX_WBITS) == data
+
+
+def test_split():
+    sizer = file_stream.BatchSizer(initial_bytes=100)
+    batches = sizer.split(chunks([40, 40, 40, 500, 10]))
+    assert [[len(c.data) for c in b] for b in batches] == [[40, 40], [40], [500], [10]]
+    assert sizer.split([]) == []
+
+
+def test_sizer_follows_throughput():
+    sizer = file_stream.BatchSizer(
+        target_seconds=1, min_bytes=1000, max_bytes=100000, initial_bytes=10000
+    )
+    sizer.observe(10000, 0.2)
+    assert sizer.max_bytes == 50000
+    for _ in range(20):
+        sizer.observe(sizer.max_bytes, 0.01)
+    assert sizer.max_bytes == 100000
+    for _ in range(50):
+        sizer.observe(sizer.max_bytes, 100)
+    assert sizer.max_bytes == 1000
+    # small, quick posts do not change the budget
+    sizer.observe(10, 0.5)
+    assert sizer.max_bytes == 1000
+
+
+def test_post_gzip():
+    fs = file_stream.FileStreamApi(FakeApi(), "run", 0, compress=True)
+    fs._client = FakeClient()
+    fs._send(chunks([10, 20]))
+    (post,) = fs._client.posts
+    assert post["headers"]["Content-Encoding"] == "gzip"
+    body = zlib.decompress(post["data"], 16 + zlib.MAX_WBITS)
+    assert json.loads(body.decode("utf-8")) == {
+        "files": {"f": {"offset": 0, "content": ["x" * 10, "x" * 20]}}
+    }
+
+
+@pytest.mark.parametrize(
+    "response",
+    [FakeResponse(415), FakeResponse(400, "Unsupported Content-Encoding: gzip")],
+)
+def test_post_gzip_rejected(response):
+    """A server that cannot read gzip bodies gets plain json from then on."""
+    fs = file_stream.FileStreamApi(FakeApi(), "run", 0, compress=True)
+    fs._client = FakeClient(reject_gzip=response)
+    fs._send(chunks([10]))
+    fs._send(chunks([10]))
+    assert ["data" in p for p in fs._client.posts] == [True, False, False]
+    assert fs._client.posts[1]["json"]["files"]["f"]["content"] == ["x" * 10]
+
+
+def test_post_bad_request():
+    """A 400 about the payload itself does not turn compression off."""
+    fs = file_stream.FileStreamApi(FakeApi(), "run", 0, compress=True)
+    fs._client = FakeClient(reject_gzip=FakeResponse(400, "invalid offset"))
+    with pytest.raises(requests.exceptions.HTTPError):
+        fs._send(chunks([10]))
+    assert ["data" in p for p in fs._client.posts] == [True]
+    fs._client.reject_gzip = None
+    fs._send(chunks([10]))
+    assert ["data" in p for p in fs._client.posts] == [True, True]
+
+
+class SlowClient(FakeClient):
+    def __init__(self, delay):
+        super(SlowClient, self).__init__()
+        self.delay = delay
+
+    def post(self, url, **kwargs):
+        time.sleep(self.delay)
+        return super(SlowClient, self).post(url, **kwargs)
+
+
+def history_lines(posts):
+    lines = []
+    for post in posts:
+        chunk = post["json"].get("files", {}).get("f", {})
+        lines.extend(chunk.get("content", []))
+    return lines
+
+
+def test_pipelined_posts():
+    """Chunks pushed while a post is in flight all arrive, in order."""
+    fs = file_stream.FileStreamApi(FakeApi(), "run", time.time())
+    fs._client = SlowClient(0.05)
+    fs._sizer = file_stream.BatchSizer(min_bytes=100, initial_bytes=100)
+    fs.start()
+    for i in range(200):
+        fs.push("f", "%05d" % i)
+    fs.finish(0)
+    posts = fs._client.posts
+    assert history_lines(posts) == ["%05d" % i for i in range(200)]
+    assert posts[-1]["json"] == {"complete": True, "exitcode": 0}
+    stats = fs.stats()
+    assert stats["pending_bytes"] == 0
+    assert stats["queue_depth"] == 0
+    assert stats["posted_bytes"] == 1000
+    assert stats["posts"] == len(posts) - 1
+
+
+def test_push_backpressure():
+    """push blocks while too much data is waiting to be posted."""
+    fs = file_stream.FileStreamApi(FakeApi(), "run", time.time(), max_pending_bytes=100)
+    fs._client = SlowClient(0.2)
+    fs._sizer = file_stream.BatchSizer(min_bytes=10, initial_bytes=10)
+    fs.start()
+    start = time.time()
+    fs.push("f", "x" * 101)
+    assert fs.stats()["pending_bytes"] == 101
+    fs.push("f", "y")
+    assert time.time() - start >= 0.2
+    fs.finish(0)
+    assert history_lines(fs._client.posts) == ["x" * 101, "y"]
+
+
+class FlakyClient(FakeClient):
+    """Fails every post until told the network is back."""
+
+    def __init__(self):
+        super(FlakyClient, self).__init__()
+        self.down = True
+
+    def post(self, url, **kwargs):
+        if self.down and "files" in kwargs.get("json", {}):
+            raise requests.exceptions.ConnectionError()
+        return super(FlakyClient, self).post(url, **kwargs)
+
+
+def test_spool_outage(tmpdir, monkeypatch):
+    """Chunks wait in the spool through an outage and are posted in order."""
+    monkeypatch.setattr(
+        util, "request_with_retry", lambda func, *a, **kw: _once(func, *a, **kw)
+    )
+    fs = file_stream.FileStreamApi(FakeApi(), "run", time.time(), spool_dir=str(tmpdir))
+    fs._client = FlakyClient()
+    fs._sizer = file_stream.BatchSizer(min_bytes=10, initial_bytes=10)
+    fs.start()
+    for i in range(100):
+        fs.push("f", "%05d" % i)
+    time.sleep(0.5)
+    assert fs.stats()["pending_bytes"] > 0
+    assert fs._queue.qsize() == 0
+    fs._client.down = False
+    fs.finish(0)
+    assert history_lines(fs._client.posts) == ["%05d" % i for i in range(100)]
+    assert fs.stats()["pending_bytes"] == 0
+    assert os.listdir(str(tmpdir)) == []
+
+
+def _once(func, *args, **kwargs):
+    try:
+        return func(*args, **kwargs)
+    except requests.exceptions.ConnectionError as e:
+        time.sleep(0.01)
+        return e
+
+
+class StatusInterface(object):
+    def send_status_request(self, check_stop_req):
+        return wandb_internal_pb2.StatusResponse()
+
+
+def test_falling_behind_warning(monkeypatch):
+    warnings = []
+    now = [1000.0]
+    monkeypatch.setattr(wandb, "termwarn", warnings.append)
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    checker = wandb_run.RunStatusChecker(StatusInterface(), polling_interval=3600)
+    checker.join()
+
+    def poll(pending_bytes):
+        now[0] += 15
+        status = wandb_internal_pb2.FileStreamStatus(pending_bytes=pending_bytes)
+        checker._check_file_stream(status)
+
+    # a small backlog that keeps growing is not worth a warning
+    for i in range(20):
+        poll(1024 * (i + 1))
+    assert warnings == []
+
+    # neither is a big one that only grew for a moment
+    poll(100 * 1024 * 1024)
+    poll(0)
+    assert warnings == []
+
+    mib = 1024 * 1024
+    for i in range(6):
+        poll(20 * mib * (i + 1))
+    assert warnings == ["Uploads are falling behind: 100 MiB waiting to be streamed"]
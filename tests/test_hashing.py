@@ -0,0 +1,124 @@
+"""hashing tests."""
+
+from __future__ import print_function
+
+import os
+
+import pytest
+from wandb.interface.artifacts import md5_file_b64
+from wandb.lib import hashing
+
+
+def write(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def test_hash_file(tmpdir):
+    data = os.urandom(2 * hashing.READ_BYTES + 5)
+    path = write(str(tmpdir.join("big.bin")), data)
+    digest = hashing.hash_file(path)
+    assert digest == (path, md5_file_b64(path), len(data), os.path.getmtime(path))
+    assert hashing.hash_file(write(str(tmpdir.join("empty")), b"")).size == 0
+
+
+def test_hash_file_fills_cache(tmpdir):
+    obj_dir = str(tmpdir.join("obj", "md5"))
+    path = write(str(tmpdir.join("a.txt")), b"hello")
+    digest = hashing.hash_file(path, obj_dir=obj_dir)
+    obj_path = hashing.md5_obj_path(obj_dir, digest.md5)
+    assert obj_path == os.path.join(obj_dir, "5d", "41402abc4b2a76b9719d911017c592")
+    assert open(obj_path, "rb").read() == b"hello"
+    # hashing it again leaves the object alone and no temp files behind
+    mtime = os.path.getmtime(obj_path)
+    assert hashing.hash_file(path, obj_dir=obj_dir) == digest
+    assert os.path.getmtime(obj_path) == mtime
+    assert os.listdir(obj_dir) == ["5d"]
+
+
+@pytest.mark.parametrize("processes", [None, 2])
+def test_hash_files(tmpdir, processes):
+    paths = [write(str(tmpdir.join("f%d" % i)), os.urandom(i * 100)) for i in range(50)]
+    obj_dir = str(tmpdir.join("obj"))
+    digests = hashing.hash_files(paths, obj_dir=obj_dir, processes=processes)
+    assert [d.path for d in digests] == paths
+    assert [d.md5 for d in digests] == [md5_file_b64(p) for p in paths]
+    assert [d.size for d in digests] == [i * 100 for i in range(50)]
+    for d in digests:
+        assert os.path.getsize(hashing.md5_obj_path(obj_dir, d.md5)) == d.size
+    assert hashing.hash_files([]) == []
+
+
+@pytest.fixture()
+def old_files(tmpdir):
+    """Files last modified long enough ago to be cached."""
+    paths = []
+    for i in range(5):
+        path = write(str(tmpdir.join("f%d" % i)), b"data %d" % i)
+        os.utime(path, (1000000000, 1000000000 + i))
+        paths.append(path)
+    return paths
+
+
+def hashed_paths(monkeypatch):
+    hashed = []
+    orig_hash_files = hashing._hash_files
+
+    def _hash_files(paths, obj_dir, processes):
+        hashed.extend(paths)
+        return orig_hash_files(paths, obj_dir, processes)
+
+    monkeypatch.setattr(hashing, "_hash_files", _hash_files)
+    return hashed
+
+
+def test_digest_cache(tmpdir, monkeypatch, old_files):
+    cache = hashing.DigestCache(str(tmpdir.join("cache", "digests.db")))
+    first = hashing.hash_files(old_files, digest_cache=cache)
+    cache.close()
+
+    hashed = hashed_paths(monkeypatch)
+    cache = hashing.DigestCache(str(tmpdir.join("cache", "digests.db")))
+    assert hashing.hash_files(old_files, digest_cache=cache) == first
+    assert hashing.hash_file(old_files[0], digest_cache=cache) == first[0]
+    assert hashed == []
+
+    # a changed file is read again, even with the same size
+    write(old_files[1], b"DATA 1")
+    os.utime(old_files[1], (1000000000, 1000000100))
+    digests = hashing.hash_files(old_files, digest_cache=cache)
+    assert hashed == [old_files[1]]
+    assert digests[1].md5 == md5_file_b64(old_files[1])
+
+
+def test_digest_cache_fills_obj_dir(tmpdir, monkeypatch, old_files):
+    cache = hashing.DigestCache(str(tmpdir.join("digests.db")))
+    hashing.hash_files(old_files, digest_cache=cache)
+    obj_dir = str(tmpdir.join("obj"))
+    hashed = hashed_paths(monkeypatch)
+    digests = hashing.hash_files(old_files, obj_dir=obj_dir, digest_cache=cache)
+    # cached files are read again to copy them to the object store
+    assert hashed == old_files
+    for path, digest in zip(old_files, digests):
+        with open(hashing.md5_obj_path(obj_dir, digest.md5), "rb") as f:
+            assert f.read() == open(path, "rb").read()
+    del hashed[:]
+    hashing.hash_files(old_files, obj_dir=obj_dir, digest_cache=cache)
+    assert hashed == []
+
+
+def test_digest_cache_skips_recent_files(tmpdir, monkeypatch):
+    cache = hashing.DigestCache(str(tmpdir.join("digests.db")))
+    path = write(str(tmpdir.join("live.txt")), b"hello")
+    hashing.hash_file(path, digest_cache=cache)
+    hashed = hashed_paths(monkeypatch)
+    hashing.hash_file(path, digest_cache=cache)
+    assert hashed == [path]
+
+
+def test_digest_cache_broken(tmpdir, old_files):
+    db = write(str(tmpdir.join("digests.db")), b"not a database" * 100)
+    cache = hashing.DigestCache(db)
+    digests = hashing.hash_files(old_files, digest_cache=cache)
+    assert [d.md5 for d in digests] == [md5_file_b64(p) for p in old_files]
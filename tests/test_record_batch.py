@@ -0,0 +1,73 @@
+"""record batch tests."""
+
+from __future__ import print_function
+
+import time
+
+from six.moves import queue
+from wandb.interface import batch, constants
+from wandb.interface.interface import BackendSender
+from wandb.proto import wandb_internal_pb2  # type: ignore
+
+
+def make_record(i):
+    rec = wandb_internal_pb2.Record()
+    item = rec.history.item.add()
+    item.key = "step"
+    item.value_json = str(i)
+    return rec
+
+
+def test_encode_decode():
+    """Records survive a round trip through a batch."""
+    records = [make_record(i) for i in range(100)]
+    data = batch.encode_records(records)
+    assert list(batch.decode_records(data)) == records
+    assert list(batch.decode_records(b"")) == []
+
+
+def test_flush_on_size():
+    """A batch is handed off as soon as it reaches max_bytes."""
+    batches = []
+    b = batch.RecordBatcher(batches.append, max_bytes=100, max_seconds=60)
+    for i in range(20):
+        b.add(make_record(i))
+    assert len(batches) > 1
+    assert all(len(data) >= 100 for data in batches)
+    b.finish()
+    records = [r for data in batches for r in batch.decode_records(data)]
+    assert records == [make_record(i) for i in range(20)]
+
+
+def test_flush_on_time():
+    """A partial batch is sent once it has been held for max_seconds."""
+    batches = []
+    b = batch.RecordBatcher(batches.append, max_bytes=1 << 20, max_seconds=0.05)
+    b.add(make_record(1))
+    for _ in range(100):
+        if batches:
+            break
+        time.sleep(0.05)
+    assert len(batches) == 1
+    b.finish()
+
+
+def test_sender_batches_records():
+    """BackendSender queues one batch for many records."""
+    process_q, notify_q = queue.Queue(), queue.Queue()
+    sender = BackendSender(
+        process_queue=process_q,
+        notify_queue=notify_q,
+        batch_bytes=1 << 20,
+        batch_seconds=60,
+    )
+    for i in range(10):
+        sender.send_summary({"step": i})
+    assert notify_q.empty()
+    sender.flush()
+    assert notify_q.get_nowait() == constants.NOTIFY_PROCESS_BATCH
+    records = list(batch.decode_records(process_q.get_nowait()))
+    assert [r.summary.update[0].value_json for r in records] == [
+        str(i) for i in range(10)
+    ]
+    assert notify_q.empty()
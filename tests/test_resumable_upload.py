@@ -0,0 +1,116 @@
+"""resumable upload tests."""
+
+from __future__ import print_function
+
+import os
+
+import pytest
+from wandb.internal import internal_api
+from wandb.old import retry
+
+from .utils.object_store import ObjectStore
+
+CHUNK = 256 * 1024
+# a resumable upload session url
+SESSION = "/ckpt?upload_id=abc"
+
+
+@pytest.fixture()
+def api(monkeypatch):
+    api = internal_api.Api(load_settings=False)
+    monkeypatch.setattr(api, "RESUMABLE_UPLOAD_MIN_BYTES", CHUNK)
+    monkeypatch.setattr(api, "RESUMABLE_CHUNK_BYTES", CHUNK)
+    monkeypatch.setattr(api, "RESUMABLE_RETRY_SECONDS", 0)
+    return api
+
+
+@pytest.fixture()
+def data_file(tmpdir):
+    data = os.urandom(4 * CHUNK + 100)
+    path = str(tmpdir.join("model.ckpt"))
+    with open(path, "wb") as f:
+        f.write(data)
+    return path, data
+
+
+def test_upload_resumes_after_failures(api, data_file):
+    path, data = data_file
+    progress = []
+    with ObjectStore() as store:
+        # the whole file PUT and the second chunk get cut off
+        store.drop_after = [CHUNK + 1000, None, None, CHUNK // 2]
+        with open(path, "rb") as f:
+            response = api.upload_file(
+                store.url + SESSION, f, lambda _, total: progress.append(total)
+            )
+    assert response.status_code == 200
+    assert store.objects[SESSION] == data
+    # the bytes persisted before each failure weren't sent again
+    assert store.received_bytes == len(data)
+    size = len(data)
+    assert [r[1] for r in store.requests] == [
+        None,
+        "bytes */%d" % size,
+        "bytes %d-%d/%d" % (CHUNK + 1000, 2 * CHUNK + 999, size),
+        "bytes %d-%d/%d" % (2 * CHUNK + 1000, 3 * CHUNK + 999, size),
+        "bytes */%d" % size,
+        "bytes %d-%d/%d" % (5 * CHUNK // 2 + 1000, 7 * CHUNK // 2 + 999, size),
+        "bytes %d-%d/%d" % (7 * CHUNK // 2 + 1000, size - 1, size),
+    ]
+    assert progress[-1] == len(data)
+
+
+def test_upload_not_resumable(api, data_file):
+    path, data = data_file
+    with ObjectStore(resumable=False) as store:
+        store.drop_after = [CHUNK]
+        with open(path, "rb") as f:
+            with pytest.raises(retry.TransientException):
+                api.upload_file(store.url + "/ckpt", f)
+            # a plain upload url is uploaded again from the start
+            f.seek(0)
+            assert api.upload_file(store.url + "/ckpt", f).status_code == 200
+    assert store.objects["/ckpt"] == data
+
+
+def test_upload_complete_on_status_query(api, data_file):
+    path, data = data_file
+    with ObjectStore() as store:
+        # the upload is stored but its reply never arrives
+        store.lose_reply = [True]
+        with open(path, "rb") as f:
+            response = api.upload_file(store.url + SESSION, f)
+    assert response.status_code == 200
+    assert store.objects[SESSION] == data
+    assert [r[1] for r in store.requests] == [None, "bytes */%d" % len(data)]
+
+
+def test_upload_finalized_with_empty_put(api, data_file):
+    path, data = data_file
+    size = len(data)
+    with ObjectStore() as store:
+        store.defer_finalize = True
+        store.drop_after = [size - 100]
+        with open(path, "rb") as f:
+            response = api.upload_file(store.url + SESSION, f)
+    assert response.status_code == 200
+    assert store.objects[SESSION] == data
+    assert [r[1] for r in store.requests] == [
+        None,
+        "bytes */%d" % size,
+        "bytes %d-%d/%d" % (size - 100, size - 1, size),
+        "bytes */%d" % size,
+    ]
+
+
+def test_plain_url_not_probed(api, data_file):
+    path, data = data_file
+    with ObjectStore(resumable=False) as store:
+        # the upload is stored but its reply never arrives
+        store.lose_reply = [True]
+        with open(path, "rb") as f:
+            with pytest.raises(retry.TransientException):
+                api.upload_file(store.url + "/ckpt", f)
+    # no request that could replace the object was sent
+    assert store.objects["/ckpt"] == data
+    assert store.requests == [("/ckpt", None)]
@@ -0,0 +1,110 @@
+"""ring buffer transport tests."""
+
+from __future__ import print_function
+
+import os
+
+import pytest
+from six.moves import queue
+from wandb.interface import constants, ringbuffer
+from wandb.interface.interface import BackendSender
+from wandb.proto import wandb_internal_pb2  # type: ignore
+
+
+@pytest.fixture()
+def ring(request):
+    """Fixture which returns a small ring buffer."""
+    r = ringbuffer.RingBuffer.create(64)
+
+    def fin():
+        r.close()
+        r.unlink()
+
+    request.addfinalizer(fin)
+    return r
+
+
+def test_put_get(ring):
+    """Frames come out in the order they went in."""
+    assert ring.empty()
+    assert ring.put(b"hello")
+    assert ring.put(b"")
+    assert ring.put(b"world")
+    assert ring.get_all() == [b"hello", b"", b"world"]
+    assert ring.empty()
+
+
+def test_marker(ring):
+    """The marker frame can't be confused with an empty record."""
+    assert ring.put(b"")
+    assert ring.put(ringbuffer.MARKER)
+    assert ring.put(b"abc")
+    frames = ring.get_all()
+    assert frames == [b"", ringbuffer.MARKER, b"abc"]
+    assert frames[0] is not ringbuffer.MARKER
+    assert frames[1] is ringbuffer.MARKER
+
+
+def test_wrap_around(ring):
+    """Frames (and their length prefix) can straddle the end of the ring."""
+    for i in range(100):
+        data = (b"%d" % i) * (i % 7 + 1)
+        assert ring.put(data)
+        assert ring.get_all() == [data]
+
+
+def test_full(ring):
+    """A frame only goes in once there is room for it."""
+    assert ring.put(b"x" * 40)
+    assert not ring.put(b"y" * 20)
+    assert ring.get_all() == [b"x" * 40]
+    assert ring.put(b"y" * 20)
+    assert not ring.fits(b"z" * 61)
+
+
+def test_shared_between_mappings(ring):
+    """A second mapping of the same file sees the same frames."""
+    other = ringbuffer.RingBuffer(ring.path)
+    assert other.capacity == ring.capacity
+    ring.put(b"abc")
+    assert other.get_all() == [b"abc"]
+    assert ring.empty()
+    other.close()
+
+
+def test_doorbell(ring):
+    """The producer only rings when the consumer asked for it."""
+    assert not ring.take_doorbell()
+    assert ring.request_doorbell()
+    ring.put(b"abc")
+    assert ring.take_doorbell()
+    assert not ring.take_doorbell()
+    # pending frames mean there is no reason to sleep
+    assert not ring.request_doorbell()
+    assert not ring.take_doorbell()
+
+
+def test_sender_ring(ring):
+    """Records go through the ring, oversized ones through the process queue."""
+    process_q, notify_q = queue.Queue(), queue.Queue()
+    sender = BackendSender(process_queue=process_q, notify_queue=notify_q, ring=ring)
+    ring.request_doorbell()
+    sender.send_summary({"a": 1})
+    sender.send_summary({"b": "x" * 100})
+    assert notify_q.get_nowait() == constants.NOTIFY_PROCESS_RING
+    assert notify_q.empty()
+
+    frames = ring.get_all()
+    assert len(frames) == 2
+    rec = wandb_internal_pb2.Record()
+    rec.ParseFromString(frames[0])
+    assert rec.summary.update[0].key == "a"
+    assert frames[1] is ringbuffer.MARKER
+    assert process_q.get_nowait().summary.update[0].key == "b"
+
+
+def test_unlink(ring):
+    path = ring.path
+    assert os.path.exists(path)
+    ring.unlink()
+    assert not os.path.exists(path)
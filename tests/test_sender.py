@@ -1,3 +1,4 @@
+import json
 import os
 import pytest
 from six.moves import queue
@@ -7,6 +8,7 @@ import shutil
 
 from wandb.util import mkdir_exists_ok
 from wandb.internal.sender import SendManager
+from wandb.internal.settings_static import SettingsStatic
 from wandb.interface import constants
 from wandb.interface.interface import BackendSender
 
@@ -97,6 +99,13 @@ def test_send_status_request(mock_server, sm, sender, start_rcv_thread):
     assert status_resp.run_should_stop
 
 
+def test_send_status_file_stream(mock_server, sm, sender, start_rcv_thread):
+    start_rcv_thread(sm)
+    status_resp = sender.send_status_request(check_stop_req=False)
+    assert status_resp.HasField("file_stream")
+    assert status_resp.file_stream.pending_bytes >= 0
+
+
 def test_parallel_requests(mock_server, sm, sender, start_rcv_thread):
     mock_server.ctx["stopped"] = True
     work_queue = queue.Queue()
@@ -371,4 +380,22 @@ def test_save_now_twice(mocked_run, mock_server, sender, sm, process_q):
     assert len(mock_server.ctx["storage?file=foo/test.txt"]) == 2
 
 
+def test_summary_flushed_on_finish(mocked_run, mock_server, sender, sm, process_q):
+    for i in range(5):
+        sender.send_summary({"acc": i})
+        sm.send(process_q.get())
+    sm.finish()
+    with open(os.path.join(mocked_run.dir, "wandb-summary.json")) as f:
+        assert json.load(f) == {"acc": 4}
+    assert len(mock_server.ctx["storage?file=wandb-summary.json"]) == 1
+
+
+def test_minimal_settings(tmpdir, process_q, notify_q, resp_q):
+    # wandb sync builds its settings from just these keys
+    settings = SettingsStatic(dict(files_dir=str(tmpdir), _start_time=0))
+    sm = SendManager(settings, process_q, notify_q, resp_q)
+    assert sm._summary._flush_seconds == 1
+    assert sm._summary._flush_steps is None
+
+
 # TODO: test other sender methods
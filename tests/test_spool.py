@@ -0,0 +1,93 @@
+"""file_stream spool tests."""
+
+from __future__ import print_function
+
+import os
+
+from wandb.internal import spool
+
+
+def test_read_ack(tmpdir):
+    s = spool.ChunkSpool(str(tmpdir))
+    s.append("a", "1")
+    s.append("b", u"é")
+    s.append("a", "22")
+    chunks = s.read(100)
+    # files take turns
+    assert [(c.filename, c.data) for c in chunks] == [
+        ("a", "1"),
+        ("b", u"é"),
+        ("a", "22"),
+    ]
+    assert s.read(100) == []
+    assert s.pending_bytes() == 4 + 1 + 4 + 2 + 4 + 2
+    s.ack({"a": chunks[2].end})
+    assert s.pending_bytes() == 4 + 2
+    # fully acknowledged files are truncated
+    assert os.path.getsize(str(tmpdir.join("0.0.spool"))) == 0
+    s.ack({"b": chunks[1].end})
+    s.close()
+    assert os.listdir(str(tmpdir)) == []
+
+
+def test_read_budget(tmpdir):
+    s = spool.ChunkSpool(str(tmpdir))
+    for i in range(10):
+        s.append("a", "x" * 10)
+    assert len(s.read(35)) == 3
+    # always at least one chunk
+    s.append("b", "y" * 100)
+    assert len(s.read(1)) == 1
+    assert len(s.read(1000)) == 7
+    s.close()
+
+
+def test_read_round_robin(tmpdir):
+    s = spool.ChunkSpool(str(tmpdir))
+    for i in range(100):
+        s.append("history", "h" * 10)
+    s.append("output", "o" * 10)
+    s.append("events", "e" * 10)
+    # a history backlog doesn't hold up the other files
+    chunks = s.read(60)
+    assert [c.filename for c in chunks] == [
+        "history",
+        "output",
+        "events",
+        "history",
+        "history",
+        "history",
+    ]
+    s.close()
+
+
+def test_segments(tmpdir, monkeypatch):
+    monkeypatch.setattr(spool, "SEGMENT_BYTES", 50)
+    s = spool.ChunkSpool(str(tmpdir))
+    for i in range(10):
+        s.append("a", "%09d" % i)
+    # 13 byte records, 3 per segment
+    assert sorted(os.listdir(str(tmpdir))) == [
+        "0.0.spool",
+        "0.1.spool",
+        "0.2.spool",
+        "0.3.spool",
+    ]
+    chunks = s.read(1000)
+    s.ack({"a": chunks[6].end})
+    # segments that were acknowledged entirely are gone
+    assert sorted(os.listdir(str(tmpdir))) == ["0.2.spool", "0.3.spool"]
+    s.append("a", "%09d" % 10)
+    assert [c.data for c in s.read(1000)] == ["%09d" % 10]
+    assert s.pending_bytes() == 4 * 13
+    s.ack({"a": chunks[9].end})
+    assert s.pending_bytes() == 13
+    s.close()
+    assert os.listdir(str(tmpdir)) == ["0.3.spool"]
+
+
+def test_unsent_kept(tmpdir):
+    s = spool.ChunkSpool(str(tmpdir))
+    s.append("a", "1")
+    s.close()
+    assert os.listdir(str(tmpdir)) == ["0.0.spool"]
@@ -0,0 +1,126 @@
+"""step_checksum and snapshot tests."""
+
+from __future__ import print_function
+
+import os
+import threading
+
+import pytest
+import wandb.util
+from six.moves import queue
+from wandb.compat import tempfile
+from wandb.filesync import snapshot, stats, step_checksum, step_upload
+
+
+def write(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+@pytest.mark.parametrize("reflink", [True, False])
+def test_snapshot(tmpdir, monkeypatch, reflink):
+    if not reflink:
+        monkeypatch.setattr(snapshot, "_reflink", lambda src, dst: False)
+    data = os.urandom(3 * snapshot.COPY_CHUNK_BYTES + 17)
+    src = write(str(tmpdir.join("src.bin")), data)
+    dst = str(tmpdir.join("dst.bin"))
+    checksum = snapshot.snapshot(src, dst, md5=True)
+    assert checksum == wandb.util.md5_file(src)
+    assert open(dst, "rb").read() == data
+    assert os.path.getmtime(dst) == os.path.getmtime(src)
+    # the snapshot doesn't follow later writes to the source
+    write(src, b"changed")
+    assert open(dst, "rb").read() == data
+    assert snapshot.snapshot(src, str(tmpdir.join("other.bin"))) is None
+
+
+class Checksum(object):
+    def __init__(self):
+        self.tempdir = tempfile.TemporaryDirectory("wandb")
+        self.requests = queue.Queue()
+        self.output = queue.Queue()
+        self.step = step_checksum.StepChecksum(
+            None, self.tempdir, self.requests, self.output, stats.Stats()
+        )
+        self.step.start()
+
+    def upload(self, path, save_name, artifact_id=None):
+        self.requests.put(
+            step_checksum.RequestUpload(
+                path, save_name, artifact_id, True, False, None, None
+            )
+        )
+
+    def events(self):
+        events = []
+        while True:
+            event = self.output.get(timeout=10)
+            if isinstance(event, step_upload.RequestFinish):
+                return events
+            events.append(event)
+
+
+def test_big_file_does_not_block(tmpdir, monkeypatch):
+    """Other files are snapshotted while a big one is still being copied."""
+    release = threading.Event()
+    orig_snapshot = snapshot.snapshot
+
+    def slow_snapshot(src, dst, md5=False):
+        if src.endswith("big.ckpt"):
+            assert release.wait(10)
+        return orig_snapshot(src, dst, md5)
+
+    monkeypatch.setattr(snapshot, "snapshot", slow_snapshot)
+    checksum = Checksum()
+    checksum.upload(write(str(tmpdir.join("big.ckpt")), b"big"), "big.ckpt")
+    checksum.upload(write(str(tmpdir.join("config.yaml")), b"a: 1"), "config.yaml")
+    event = checksum.output.get(timeout=10)
+    assert event.save_name == "config.yaml"
+    assert open(event.path, "rb").read() == b"a: 1"
+    checksum.requests.put(step_checksum.RequestCommitArtifact("art", None))
+    checksum.requests.put(step_checksum.RequestFinish())
+    release.set()
+    events = checksum.events()
+    # the commit waits for files still being snapshotted
+    assert [e.save_name for e in events[:1]] == ["big.ckpt"]
+    assert isinstance(events[1], step_upload.RequestCommitArtifact)
+    assert not checksum.step.is_alive()
+
+
+def test_snapshots_of_same_file_coalesced(tmpdir, monkeypatch):
+    release = threading.Event()
+    orig_snapshot = snapshot.snapshot
+
+    def slow_snapshot(src, dst, md5=False):
+        assert release.wait(10)
+        return orig_snapshot(src, dst, md5)
+
+    monkeypatch.setattr(snapshot, "snapshot", slow_snapshot)
+    checksum = Checksum()
+    path = write(str(tmpdir.join("events.out")), b"v0")
+    for _ in range(5):
+        checksum.upload(path, "events.out")
+    checksum.upload(path, "events.out", artifact_id="art")
+    checksum.upload(path, "events.out", artifact_id="art")
+    checksum.requests.put(step_checksum.RequestFinish())
+    write(path, b"v1")
+    release.set()
+    events = checksum.events()
+    assert [e.artifact_id for e in events] == [None, None, "art", "art"]
+    assert [open(e.path, "rb").read() for e in events[1:]] == [b"v1"] * 3
+
+
+def test_failed_artifact_file_reported(tmpdir):
+    checksum = Checksum()
+    checksum.upload(str(tmpdir.join("missing.json")), "missing.json")
+    checksum.upload(
+        str(tmpdir.join("wandb_manifest.json")), "wandb_manifest.json", "art"
+    )
+    checksum.requests.put(step_checksum.RequestCommitArtifact("art", None))
+    checksum.requests.put(step_checksum.RequestFinish())
+    events = checksum.events()
+    # the run file is only logged, the artifact can't be committed without it
+    assert events[0] == step_upload.EventPrepareFailed("art", "wandb_manifest.json")
+    assert isinstance(events[1], step_upload.RequestCommitArtifact)
+    assert len(events) == 2
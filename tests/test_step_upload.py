@@ -0,0 +1,239 @@
+"""step_upload tests."""
+
+from __future__ import print_function
+
+import os
+import threading
+import time
+
+import pytest
+from six.moves import queue
+from wandb.errors.error import CommError
+from wandb.filesync import stats, step_upload, step_upload_urls
+
+
+class FakeApi(object):
+    """Records uploads, blocking each one until its save_name is released."""
+
+    def __init__(self, block=()):
+        self.lock = threading.Lock()
+        self.uploaded = []
+        self.uploaded_paths = []
+        self.active = 0
+        self.max_active = 0
+        self.released = dict((name, threading.Event()) for name in block)
+        self.started = dict((name, threading.Event()) for name in block)
+
+    def upload(self, save_name, path=None):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        if save_name in self.started:
+            self.started[save_name].set()
+            self.released[save_name].wait(5)
+        with self.lock:
+            self.active -= 1
+            self.uploaded.append(save_name)
+            self.uploaded_paths.append(path)
+        return False
+
+
+@pytest.fixture()
+def make_file(tmpdir):
+    def make(name, size=10):
+        path = str(tmpdir.join(name.replace("/", "_")))
+        with open(path, "wb") as f:
+            f.write(b"x" * size)
+        return path
+
+    return make
+
+
+def request(api, path, save_name, copied=False):
+    return step_upload.RequestUpload(
+        path, save_name, None, None, copied, lambda _: api.upload(save_name, path), None
+    )
+
+
+def run_steps(api, requests, max_jobs):
+    event_queue = queue.Queue()
+    step = step_upload.StepUpload(api, stats.Stats(), event_queue, max_jobs)
+    step.start()
+    for req in requests:
+        event_queue.put(req)
+    event_queue.put(step_upload.RequestFinish())
+    step._thread.join(10)
+    assert not step.is_alive()
+    return step
+
+
+def test_bounded_pool(make_file):
+    api = FakeApi()
+    reqs = [request(api, make_file("f%d" % i), "f%d" % i) for i in range(200)]
+    step = run_steps(api, reqs, max_jobs=4)
+    assert sorted(api.uploaded) == sorted("f%d" % i for i in range(200))
+    assert len(step._workers) == 4
+    assert api.max_active <= 4
+    assert not any(w.is_alive() for w in step._workers)
+
+
+def test_priority(make_file):
+    """Small wandb files go ahead of files queued before them."""
+    api = FakeApi(block=["first.bin"])
+    reqs = [
+        request(api, make_file("first.bin"), "first.bin"),
+        request(api, make_file("model.h5", 100), "model.h5"),
+        request(api, make_file("media/a.png"), "media/a.png"),
+        request(api, make_file("wandb-summary.json"), "wandb-summary.json"),
+        request(api, make_file("config.yaml"), "config.yaml"),
+        request(
+            api,
+            make_file("output.log", step_upload.SMALL_FILE_BYTES + 1),
+            "output.log",
+        ),
+    ]
+
+    event_queue = queue.Queue()
+    step = step_upload.StepUpload(api, stats.Stats(), event_queue, 1)
+    step.start()
+    event_queue.put(reqs[0])
+    assert api.started["first.bin"].wait(5)
+    for req in reqs[1:]:
+        event_queue.put(req)
+    # wait for the upload thread to queue them for the busy worker
+    while step._job_queue.qsize() < len(reqs) - 1:
+        time.sleep(0.01)
+    api.released["first.bin"].set()
+    event_queue.put(step_upload.RequestFinish())
+    step._thread.join(10)
+    assert api.uploaded == [
+        "first.bin",
+        "wandb-summary.json",
+        "config.yaml",
+        "model.h5",
+        "media/a.png",
+        "output.log",
+    ]
+
+
+def test_same_file_serialized(make_file):
+    """A file being uploaded is not uploaded again until the first one is done."""
+    api = FakeApi(block=["f"])
+    path = make_file("f")
+    event_queue = queue.Queue()
+    step = step_upload.StepUpload(api, stats.Stats(), event_queue, 4)
+    step.start()
+    event_queue.put(request(api, path, "f"))
+    assert api.started["f"].wait(5)
+    event_queue.put(request(api, path, "f"))
+    event_queue.put(request(api, make_file("g"), "g"))
+    while "g" not in api.uploaded:
+        time.sleep(0.01)
+    assert api.uploaded == ["g"]
+    api.started.pop("f")
+    api.released["f"].set()
+    event_queue.put(step_upload.RequestFinish())
+    step._thread.join(10)
+    assert api.uploaded == ["g", "f", "f"]
+    assert os.path.exists(path)
+
+
+def test_superseded_uploads_coalesced(make_file):
+    """Only the newest of the uploads waiting for a running one is kept."""
+    api = FakeApi(block=["f"])
+    event_queue = queue.Queue()
+    step = step_upload.StepUpload(api, stats.Stats(), event_queue, 4)
+    step.start()
+    event_queue.put(request(api, make_file("f0"), "f", copied=True))
+    assert api.started["f"].wait(5)
+    copies = [make_file("f%d" % i) for i in range(1, 6)]
+    for path in copies:
+        event_queue.put(request(api, path, "f", copied=True))
+    while len(step._pending_jobs.get("f", ())) != 1 or os.path.exists(copies[-2]):
+        time.sleep(0.01)
+    api.started.pop("f")
+    api.released["f"].set()
+    event_queue.put(step_upload.RequestFinish())
+    step._thread.join(10)
+    assert api.uploaded == ["f", "f"]
+    assert api.uploaded_paths[1] == copies[-1]
+    assert not any(os.path.exists(path) for path in copies)
+    assert not step._pending_jobs
+
+
+class FakeUrlApi(object):
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def get_project(self):
+        return "proj"
+
+    def upload_urls(self, project, files):
+        self.calls.append(list(files))
+        if self.fail:
+            raise CommError("boom")
+        result = dict((f, {"name": f, "url": "https://storage/" + f}) for f in files)
+        result.pop("missing", None)
+        return "run-id", ["X-Header:1"], result
+
+
+def upload_urls_from_threads(api, names):
+    urls = step_upload_urls.StepUploadUrls(api, 1, 0.2, 1000)
+    urls.start()
+    responses = {}
+
+    def get(name):
+        try:
+            responses[name] = urls.upload_url(name)
+        except CommError as e:
+            responses[name] = e
+
+    threads = [threading.Thread(target=get, args=(name,)) for name in names]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    urls.shutdown()
+    return responses
+
+
+def test_upload_urls_batched():
+    api = FakeUrlApi()
+    names = ["media/%d.png" % i for i in range(50)] + ["missing"]
+    responses = upload_urls_from_threads(api, names)
+    assert len(api.calls) == 1
+    assert sorted(api.calls[0]) == sorted(names)
+    assert responses["media/7.png"] == step_upload_urls.ResponseUploadUrl(
+        "https://storage/media/7.png", ["X-Header:1"]
+    )
+    assert isinstance(responses["missing"], CommError)
+
+
+def test_upload_urls_error():
+    api = FakeUrlApi(fail=True)
+    responses = upload_urls_from_threads(api, ["a.txt", "b.txt"])
+    assert all(isinstance(r, CommError) for r in responses.values())
+
+
+def test_prepare_failure_blocks_commit(make_file):
+    api = FakeApi()
+    committed = []
+    api.commit_artifact = committed.append
+    path = make_file("model.bin")
+    reqs = [
+        step_upload.RequestUpload(
+            path,
+            "model.bin",
+            "art",
+            None,
+            False,
+            lambda _: api.upload("model.bin"),
+            None,
+        ),
+        step_upload.EventPrepareFailed("art", "wandb_manifest.json"),
+        step_upload.RequestCommitArtifact("art", lambda: committed.append("callback")),
+    ]
+    run_steps(api, reqs, max_jobs=2)
+    assert api.uploaded == ["model.bin"]
+    assert committed == []
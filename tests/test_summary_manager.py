@@ -0,0 +1,73 @@
+"""summary manager tests."""
+
+from __future__ import print_function
+
+import json
+import os
+
+from wandb.internal import summary
+
+
+FNAME = "wandb-summary.json"
+
+
+def load():
+    with open(FNAME) as f:
+        return json.load(f)
+
+
+def test_first_update_flushes(runner):
+    """The first update is written out immediately."""
+    with runner.isolated_filesystem():
+        flushed = []
+        sm = summary.SummaryManager(FNAME, flush_seconds=60, on_flush=flushed.append)
+        sm.update({"a": 1, "b": [1, 2]})
+        assert load() == {"a": 1, "b": [1, 2]}
+        assert len(flushed) == 1
+        assert not sm.dirty
+
+
+def test_updates_coalesce(runner):
+    """Updates inside the flush window are coalesced into one write."""
+    with runner.isolated_filesystem():
+        flushed = []
+        sm = summary.SummaryManager(FNAME, flush_seconds=60, on_flush=flushed.append)
+        sm.update({"a": 1})
+        for i in range(100):
+            sm.update({"a": i, "_step": i})
+        assert load() == {"a": 1}
+        assert len(flushed) == 1
+        assert sm.dirty
+        assert sm.flush_if_due() is False
+
+        sm.flush()
+        assert load() == {"a": 99, "_step": 99}
+        assert json.loads(flushed[-1]) == {"a": 99, "_step": 99}
+        assert len(flushed) == 2
+
+
+def test_flush_steps(runner):
+    """A step window forces a flush even inside the time window."""
+    with runner.isolated_filesystem():
+        flushed = []
+        sm = summary.SummaryManager(
+            FNAME, flush_seconds=60, flush_steps=10, on_flush=flushed.append
+        )
+        for i in range(21):
+            sm.update({"a": i})
+        assert [json.loads(s)["a"] for s in flushed] == [0, 10, 20]
+
+
+def test_flush_matches_json_dumps(runner):
+    """Assembled fragments serialize the same as the full dict."""
+    with runner.isolated_filesystem():
+        sm = summary.SummaryManager(FNAME, flush_seconds=0)
+        expected = dict()
+        for i in range(10):
+            row = {"k%d" % (i % 4): {"nested": i}, "s": u"✓ %d" % i}
+            expected.update(row)
+            sm.update(row)
+        with open(FNAME) as f:
+            assert f.read() == json.dumps(expected)
+        assert sm.summary == expected
+        assert not [f for f in os.listdir(".") if f.endswith(".tmp")]
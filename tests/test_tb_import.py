@@ -0,0 +1,141 @@
+"""tensorboard import tests."""
+
+from __future__ import print_function
+
+import os
+import re
+
+from wandb.cli import cli
+from wandb.internal import tfevents
+from wandb.proto import wandb_tfevents_pb2
+from wandb.sync import tb_import
+
+
+def write_events(path, steps, tag="loss", start=0):
+    if not os.path.isdir(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path))
+    with open(path, "ab") as f:
+        version = wandb_tfevents_pb2.Event(
+            wall_time=start, file_version="brain.Event:2"
+        )
+        f.write(tfevents.encode_record(version.SerializeToString()))
+        for step, value in steps:
+            summary = wandb_tfevents_pb2.Summary(
+                value=[wandb_tfevents_pb2.Summary.Value(tag=tag, simple_value=value)]
+            )
+            event = wandb_tfevents_pb2.Event(
+                wall_time=start + step, step=step, summary=summary
+            )
+            f.write(tfevents.encode_record(event.SerializeToString()))
+
+
+def test_find_event_files(tmpdir):
+    write_events(str(tmpdir.join("events.out.tfevents.1.host")), [])
+    write_events(str(tmpdir.join("train", "events.out.tfevents.1.host")), [])
+    write_events(
+        str(tmpdir.join("train", "events.out.tfevents.1.host.profile-empty")), []
+    )
+    tmpdir.join("train", "checkpoint").write("")
+    assert tb_import.find_event_files(str(tmpdir)) == [
+        (str(tmpdir.join("events.out.tfevents.1.host")), None),
+        (str(tmpdir.join("train", "events.out.tfevents.1.host")), "train"),
+    ]
+
+
+def test_rows_merged_by_step(tmpdir):
+    train = str(tmpdir.join("train", "events.out.tfevents.1.host"))
+    validation = str(tmpdir.join("validation", "events.out.tfevents.1.host"))
+    write_events(train, [(0, 1.0), (1, 0.5), (2, 0.25)], start=1000)
+    # validation runs every other step and its events come later
+    write_events(validation, [(0, 2.0), (2, 1.5)], start=1100)
+    rows = tb_import.merge_steps(
+        [
+            tb_import.read_event_file((train, "train")),
+            tb_import.read_event_file((validation, "validation")),
+        ]
+    )
+    assert rows == [
+        {
+            "train/loss": 1.0,
+            "train/global_step": 0,
+            "validation/loss": 2.0,
+            "validation/global_step": 0,
+            "global_step": 0,
+            "_timestamp": 1100,
+            "_step": 0,
+        },
+        {
+            "train/loss": 0.5,
+            "train/global_step": 1,
+            "global_step": 1,
+            "_timestamp": 1001,
+            "_step": 1,
+        },
+        {
+            "train/loss": 0.25,
+            "train/global_step": 2,
+            "validation/loss": 1.5,
+            "validation/global_step": 2,
+            "global_step": 2,
+            "_timestamp": 1102,
+            "_step": 2,
+        },
+    ]
+
+
+def test_sync_tensorboard(runner, mock_server, monkeypatch, tmpdir):
+    monkeypatch.setenv("WANDB_API_KEY", "X" * 40)
+    for name in ("run_a", "run_b"):
+        write_events(
+            str(tmpdir.join(name, "events.out.tfevents.1.host")),
+            [(step, step * 0.1) for step in range(100)],
+        )
+    tmpdir.join("empty").ensure(dir=True)
+    result = runner.invoke(
+        cli.sync,
+        [
+            "--tensorboard",
+            "--jobs",
+            "2",
+            "-p",
+            "test",
+            str(tmpdir.join("run_a")),
+            str(tmpdir.join("run_b")),
+            str(tmpdir.join("empty")),
+        ],
+    )
+    print(result.output)
+    assert result.exit_code == 0
+    assert "No tfevents files found in {}".format(tmpdir.join("empty")) in result.output
+    imported = re.findall(
+        r"Imported 100 steps from (.*) to mock_server_entity/test/(\w+)", result.output
+    )
+    assert [logdir for logdir, _ in imported] == [
+        str(tmpdir.join("run_a")),
+        str(tmpdir.join("run_b")),
+    ]
+    # each logdir gets a run of its own, even from the same path elsewhere
+    assert len(set(run for _, run in imported)) == 2
+    # gzipped posts are only recorded decoded, the raw request leaves a None
+    posts = [post for post in mock_server.ctx["file_stream"] if post is not None]
+    history = []
+    for post in posts:
+        files = post.get("files") or {}
+        history.extend(files.get("wandb-history.jsonl", {}).get("content", []))
+    assert len(history) == 200
+    assert sum(post.get("complete", False) for post in posts) == 2
+
+
+def test_sync_tensorboard_id(runner, mock_server, monkeypatch, tmpdir):
+    monkeypatch.setenv("WANDB_API_KEY", "X" * 40)
+    for name in ("run_a", "run_b"):
+        write_events(str(tmpdir.join(name, "events.out.tfevents.1.host")), [(0, 1.0)])
+    logdirs = [str(tmpdir.join("run_a")), str(tmpdir.join("run_b"))]
+    result = runner.invoke(cli.sync, ["--tensorboard", "--id", "myrun", logdirs[0]])
+    print(result.output)
+    assert result.exit_code == 0
+    assert "mock_server_entity/test/myrun" in result.output
+
+    result = runner.invoke(cli.sync, ["--tensorboard", "--id", "myrun"] + logdirs)
+    assert result.exit_code == 1
+    assert "--id can only be used with a single log directory" in result.output
@@ -0,0 +1,140 @@
+"""tb_watcher tests."""
+
+from __future__ import print_function
+
+import json
+import time
+
+import numpy as np
+import pytest
+from six.moves import queue
+from wandb.internal import tb_watcher
+from wandb.internal import tfevents
+from wandb.proto import wandb_tfevents_pb2
+from wandb.util import json_dumps_safer_history
+
+
+class FakeTFEvent(object):
+    def __init__(self, wall_time):
+        self.wall_time = wall_time
+        self.step = 0
+
+
+class RecordingConsumer(tb_watcher.TBEventConsumer):
+    def __init__(self, *args, **kwargs):
+        super(RecordingConsumer, self).__init__(*args, **kwargs)
+        self.handled = []
+
+    def _handle_event(self, event, history=None):
+        self.handled.append((event.event.wall_time, time.time() - event.created_at))
+
+
+def test_events_released_in_wall_time_order_after_delay():
+    q = queue.Queue()
+    consumer = RecordingConsumer(None, q, delay=0.5)
+    consumer.start()
+    for wall_time in (3, 1, 2):
+        q.put(tb_watcher.Event(FakeTFEvent(wall_time), None))
+    time.sleep(0.2)
+    assert consumer.handled == []
+    deadline = time.time() + 5
+    while len(consumer.handled) < 3 and time.time() < deadline:
+        time.sleep(0.05)
+    assert [wall_time for wall_time, _ in consumer.handled] == [1, 2, 3]
+    # released right at the deadline, not by polling
+    assert all(0.5 <= waited < 0.7 for _, waited in consumer.handled)
+    consumer.finish()
+
+
+def test_backlog_released_in_one_batch():
+    q = queue.Queue()
+    consumer = RecordingConsumer(None, q, delay=0.2)
+    consumer.start()
+    for i in range(5000):
+        q.put(tb_watcher.Event(FakeTFEvent(i), None))
+    time.sleep(0.6)
+    assert [wall_time for wall_time, _ in consumer.handled] == list(range(5000))
+    consumer.finish()
+
+
+def test_finish_flushes_pending_events():
+    q = queue.Queue()
+    consumer = RecordingConsumer(None, q, delay=60)
+    consumer.start()
+    q.put(tb_watcher.Event(FakeTFEvent(1), None))
+    start = time.time()
+    consumer.finish()
+    assert time.time() - start < 1
+    assert [wall_time for wall_time, _ in consumer.handled] == [1]
+
+
+class FakeSettings(object):
+    def __init__(self, start_time):
+        self._start_time = start_time
+
+
+class FakeTBWatcher(object):
+    def __init__(self, start_time):
+        self._settings = FakeSettings(start_time)
+        self._sender = None
+
+
+def write_scalars(path, steps):
+    with open(path, "ab") as f:
+        for step in steps:
+            summary = wandb_tfevents_pb2.Summary(
+                value=[wandb_tfevents_pb2.Summary.Value(tag="loss", simple_value=step)]
+            )
+            event = wandb_tfevents_pb2.Event(wall_time=step, step=step, summary=summary)
+            f.write(tfevents.encode_record(event.SerializeToString()))
+
+
+def test_dir_watcher_polls_new_events(tmpdir):
+    q = queue.Queue()
+    watcher = tb_watcher.TBDirWatcher(
+        FakeTBWatcher(time.time() - 60), str(tmpdir), False, "train", q
+    )
+    watcher.poll()
+    assert q.empty()
+    first = str(tmpdir.join("events.out.tfevents.1.host"))
+    write_scalars(first, [0, 1])
+    tmpdir.join("events.out.tfevents.1.host.profile-empty").write("")
+    tmpdir.join("checkpoint").write("")
+    watcher.poll()
+    write_scalars(first, [2])
+    write_scalars(str(tmpdir.join("events.out.tfevents.2.host")), [3])
+    watcher.poll()
+    events = [q.get_nowait() for _ in range(q.qsize())]
+    assert [e.event.step for e in events] == [0, 1, 2, 3]
+    assert all(e.namespace == "train" for e in events)
+
+
+def test_dir_watcher_skips_old_files(tmpdir):
+    q = queue.Queue()
+    write_scalars(str(tmpdir.join("events.out.tfevents.1.host")), [0])
+    watcher = tb_watcher.TBDirWatcher(
+        FakeTBWatcher(time.time() + 60), str(tmpdir), False, None, q
+    )
+    watcher.poll()
+    assert q.empty()
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        1.5,
+        float("nan"),
+        7,
+        "text",
+        np.float32(0.25),
+        np.array(3, dtype="int64"),
+        np.arange(6, dtype="float16").reshape(2, 3),
+        np.arange(100, dtype="float32"),
+        {"_type": "histogram", "values": [1.0, 2.0], "bins": [0.0, 0.5, 1.0]},
+    ],
+)
+def test_history_value_matches_json_round_trip(value):
+    expected = json.loads(json_dumps_safer_history(value))
+    converted = tb_watcher._history_value(value)
+    assert json.dumps(converted) == json.dumps(expected)
+    assert type(converted) == type(expected)
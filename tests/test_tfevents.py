@@ -0,0 +1,121 @@
+"""tfevents reader tests."""
+
+from __future__ import print_function
+
+import struct
+
+import numpy as np
+import pytest
+from wandb.internal import tfevents
+from wandb.proto import wandb_tfevents_pb2
+
+
+def scalar_event(step, tag="loss", value=0.5):
+    summary = wandb_tfevents_pb2.Summary(
+        value=[wandb_tfevents_pb2.Summary.Value(tag=tag, simple_value=value)]
+    )
+    return wandb_tfevents_pb2.Event(wall_time=1000 + step, step=step, summary=summary)
+
+
+def append(path, data):
+    with open(path, "ab") as f:
+        f.write(data)
+
+
+def test_crc32c():
+    # the check value of the Castagnoli crc
+    assert tfevents.crc32c(b"123456789") == 0xE3069283
+
+
+def test_tail_stops_at_partial_record(tmpdir):
+    path = str(tmpdir.join("events.out.tfevents.1.host"))
+    records = [
+        tfevents.encode_record(scalar_event(i).SerializeToString()) for i in range(3)
+    ]
+    append(path, records[0] + records[1][:5])
+    reader = tfevents.EventFileReader(path)
+    assert [e.step for e in reader.read_events()] == [0]
+    assert reader.offset == len(records[0])
+    append(path, records[1][5:-2])
+    assert list(reader.read_events()) == []
+    append(path, records[1][-2:] + records[2])
+    events = list(reader.read_events())
+    assert [e.step for e in events] == [1, 2]
+    assert events[1].summary.value[0].simple_value == 0.5
+    assert reader.offset == sum(len(r) for r in records)
+
+
+def test_resumes_from_offset(tmpdir):
+    path = str(tmpdir.join("events.out.tfevents.1.host"))
+    records = [
+        tfevents.encode_record(scalar_event(i).SerializeToString()) for i in range(3)
+    ]
+    append(path, b"".join(records))
+    reader = tfevents.EventFileReader(path, offset=len(records[0]))
+    assert [e.step for e in reader.read_events()] == [1, 2]
+
+
+def test_corrupt_length_stops_reading(tmpdir):
+    path = str(tmpdir.join("events.out.tfevents.1.host"))
+    good = tfevents.encode_record(scalar_event(0).SerializeToString())
+    bad = struct.pack("<QI", 1 << 40, 0)
+    append(path, good + bad)
+    reader = tfevents.EventFileReader(path)
+    assert [e.step for e in reader.read_events()] == [0]
+    assert list(reader.read_events()) == []
+    assert reader.offset == len(good)
+
+
+def test_reads_tensorboard_event_files(tmpdir):
+    pytest.importorskip("tensorboard")
+    from tensorboard.compat.proto import event_pb2, summary_pb2
+    from tensorboard.summary.writer.event_file_writer import EventFileWriter
+
+    writer = EventFileWriter(str(tmpdir))
+    value = summary_pb2.Summary.Value(tag="hist")
+    value.histo.bucket_limit.extend([0.0, 1.0, 2.0])
+    value.histo.bucket.extend([1.0, 2.0, 3.0])
+    writer.add_event(
+        event_pb2.Event(
+            wall_time=1.5, step=7, summary=summary_pb2.Summary(value=[value])
+        )
+    )
+    writer.close()
+    reader = tfevents.EventFileReader(str(tmpdir.listdir()[0]))
+    events = list(reader.read_events())
+    assert events[0].file_version.startswith("brain.Event")
+    assert events[1].step == 7
+    assert list(events[1].summary.value[0].histo.bucket) == [1.0, 2.0, 3.0]
+
+
+def tensor(dtype, dims, **values):
+    proto = wandb_tfevents_pb2.TensorProto(dtype=dtype, **values)
+    for size in dims:
+        proto.tensor_shape.dim.add(size=size)
+    return proto
+
+
+def test_make_ndarray_from_content():
+    array = np.arange(6, dtype="float32").reshape(2, 3)
+    result = tfevents.make_ndarray(tensor(1, [2, 3], tensor_content=array.tobytes()))
+    assert result.dtype == np.float32
+    assert (result == array).all()
+
+
+def test_make_ndarray_from_values():
+    assert tfevents.make_ndarray(tensor(1, [], float_val=[1.5])) == 1.5
+    assert tfevents.make_ndarray(tensor(9, [3], int64_val=[1, 2])).tolist() == [1, 2, 2]
+    assert tfevents.make_ndarray(tensor(10, [2], bool_val=[True, False])).tolist() == [
+        True,
+        False,
+    ]
+    half = np.array([0.5, 2.0], dtype="float16").view("uint16").tolist()
+    assert tfevents.make_ndarray(tensor(19, [2], half_val=half)).tolist() == [0.5, 2.0]
+    assert tfevents.make_ndarray(tensor(3, [2, 2])).tolist() == [[0, 0], [0, 0]]
+
+
+def test_make_ndarray_unsupported():
+    assert tfevents.make_ndarray(tensor(7, [1], string_val=[b"text"])) is None
+    with pytest.raises(ValueError):
+        # complex64
+        tfevents.make_ndarray(tensor(8, [1]))
@@ -10,6 +10,7 @@ import wandb
 import logging
 from six.moves import urllib
 import threading
+import zlib
 from tests.utils.mock_requests import RequestsMock
 
 
@@ -212,8 +213,10 @@ def create_app(user_ctx=None):
                 return json.dumps({"errors": ["Server down"]}), 500
         body = request.get_json()
         if body["variables"].get("files"):
-            file = body["variables"]["files"][0]
-            url = request.url_root + "/storage?file=%s" % urllib.parse.quote(file)
+            edges = []
+            for file in body["variables"]["files"]:
+                url = request.url_root + "/storage?file=%s" % urllib.parse.quote(file)
+                edges.append({"node": {"name": file, "url": url}})
             return json.dumps(
                 {
                     "data": {
@@ -222,7 +225,7 @@ def create_app(user_ctx=None):
                                 "id": "storageid",
                                 "files": {
                                     "uploadHeaders": [],
-                                    "edges": [{"node": {"name": file, "url": url}}],
+                                    "edges": edges,
                                 },
                             }
                         }
@@ -540,7 +543,12 @@ def create_app(user_ctx=None):
     def file_stream(entity, project, run):
         ctx = get_ctx()
         ctx["file_stream"] = ctx.get("file_stream", [])
-        ctx["file_stream"].append(request.get_json())
+        if request.headers.get("Content-Encoding") == "gzip":
+            body = zlib.decompress(request.get_data(), 16 + zlib.MAX_WBITS)
+            data = json.loads(body.decode("utf-8"))
+        else:
+            data = request.get_json()
+        ctx["file_stream"].append(data)
         return json.dumps({"exitcode": None, "limits": {}})
 
     @app.route("/api/v1/namespaces/default/pods/test")
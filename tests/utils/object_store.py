@@ -0,0 +1,142 @@
+"""A local stand-in for cloud object storage, for upload tests.
+
+Objects are PUT to any path. With resumable sessions on, uploads follow the
+GCS resumable upload protocol: a PUT with "Content-Range: bytes */<size>"
+asks for the persisted range, answered with a 308, or a 200 once the
+upload is complete, and chunks are PUT with
+"Content-Range: bytes <first>-<last>/<size>". Failures are injected by
+dropping the connection after some bytes of a request body were read, or
+instead of replying to a request that was handled.
+"""
+
+import re
+import socket
+import threading
+
+from six.moves import BaseHTTPServer, socketserver
+
+
+class ObjectStore(object):
+    def __init__(self, resumable=True):
+        self.resumable = resumable
+        self.objects = {}
+        self.sessions = {}
+        # drop the connection once a request body reached these many bytes,
+        # one entry per request, None to let it through
+        self.drop_after = []
+        # handle the request but drop the connection instead of replying,
+        # one entry per request
+        self.lose_reply = []
+        # sessions that got every byte are only finalized by an empty PUT
+        self.defer_finalize = False
+        self.requests = []
+        self.received_bytes = 0
+        self._lock = threading.Lock()
+        store = self
+
+        class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+            def do_PUT(self):
+                store._put(self)
+
+            def log_message(self, *args):
+                pass
+
+        class Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+            daemon_threads = True
+
+        self._server = Server(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:%d" % self._server.server_address[1]
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _read_body(self, handler, length):
+        with self._lock:
+            drop_after = self.drop_after.pop(0) if self.drop_after else None
+        body = b""
+        while len(body) < length:
+            want = length - len(body)
+            if drop_after is not None:
+                want = min(want, drop_after - len(body))
+                if want <= 0:
+                    break
+            chunk = handler.rfile.read(min(want, 64 * 1024))
+            if not chunk:
+                break
+            body += chunk
+        with self._lock:
+            self.received_bytes += len(body)
+        return body, len(body) == length
+
+    def _drop(self, handler):
+        handler.close_connection = True
+        try:
+            handler.connection.shutdown(socket.SHUT_RDWR)
+        except socket.error:
+            pass
+
+    def _reply(self, handler, status, headers=None):
+        if handler.lose_reply:
+            self._drop(handler)
+            return
+        handler.send_response(status)
+        for key, value in (headers or {}).items():
+            handler.send_header(key, value)
+        handler.send_header("Content-Length", "0")
+        handler.end_headers()
+
+    def _put(self, handler):
+        path = handler.path
+        content_range = handler.headers.get("Content-Range")
+        self.requests.append((path, content_range))
+        with self._lock:
+            handler.lose_reply = self.lose_reply.pop(0) if self.lose_reply else False
+        body, complete = self._read_body(
+            handler, int(handler.headers.get("Content-Length", 0))
+        )
+        if not self.resumable or content_range is None:
+            if complete:
+                self.objects[path] = body
+                self._reply(handler, 200)
+            else:
+                self.sessions[path] = body
+                self._drop(handler)
+            return
+
+        received = self.sessions.get(path, b"")
+        match = re.match(r"bytes \*/(\d+)$", content_range)
+        if match:
+            if self.defer_finalize and len(received) == int(match.group(1)):
+                self.objects[path] = received
+            if path in self.objects:
+                self._reply(handler, 200)
+            else:
+                self._reply(handler, 308, self._range(received))
+            return
+        first, last, total = [
+            int(i)
+            for i in re.match(r"bytes (\d+)-(\d+)/(\d+)$", content_range).groups()
+        ]
+        if first == len(received):
+            received += body
+            self.sessions[path] = received
+        if not complete:
+            self._drop(handler)
+        elif len(received) == total and not self.defer_finalize:
+            self.objects[path] = received
+            self._reply(handler, 200)
+        else:
+            self._reply(handler, 308, self._range(received))
+
+    def _range(self, received):
+        return {"Range": "bytes=0-%d" % (len(received) - 1)} if received else {}
@@ -66,3 +66,48 @@ def test_resume_auto_failure(live_mock_server, test_settings):
     assert run.id == "resumeme"
     run.join(exit_code=3)
     assert os.path.exists(test_settings.resume_fname)
+
+
+@pytest.mark.parametrize("transport", ["batch", "shm"])
+def test_transport(live_mock_server, test_settings, transport):
+    test_settings._transport = transport
+    run = wandb.init(reinit=True, settings=test_settings)
+    for i in range(20):
+        wandb.log({"acc": i})
+    run.join()
+    server_ctx = live_mock_server.get_ctx()
+    history = []
+    for req in server_ctx["file_stream"]:
+        chunk = req.get("files", {}).get("wandb-history.jsonl", {})
+        history.extend(json.loads(line) for line in chunk.get("content", []))
+    assert [row["acc"] for row in history] == list(range(20))
+
+
+def test_transport_shm_oversized(live_mock_server, test_settings):
+    # records that don't fit the ring go through the process queue in order
+    test_settings._transport = "shm"
+    test_settings._transport_shm_bytes = 4096
+    run = wandb.init(reinit=True, settings=test_settings)
+    for i in range(20):
+        wandb.log({"acc": i, "text": "x" * (8192 if i % 5 == 0 else 1)})
+    run.join()
+    server_ctx = live_mock_server.get_ctx()
+    history = []
+    for req in server_ctx["file_stream"]:
+        chunk = req.get("files", {}).get("wandb-history.jsonl", {})
+        history.extend(json.loads(line) for line in chunk.get("content", []))
+    assert [row["acc"] for row in history] == list(range(20))
+
+
+def test_file_stream_gzip(live_mock_server, test_settings):
+    test_settings._file_stream_gzip = True
+    run = wandb.init(reinit=True, settings=test_settings)
+    for i in range(20):
+        wandb.log({"acc": i})
+    run.join()
+    server_ctx = live_mock_server.get_ctx()
+    history = []
+    for req in server_ctx["file_stream"]:
+        chunk = req.get("files", {}).get("wandb-history.jsonl", {})
+        history.extend(json.loads(line) for line in chunk.get("content", []))
+    assert [row["acc"] for row in history] == list(range(20))
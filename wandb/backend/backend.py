@@ -12,7 +12,7 @@ import platform
 import sys
 
 import wandb
-from wandb.interface import constants, interface
+from wandb.interface import constants, interface, ringbuffer
 from wandb.internal.internal import wandb_internal
 
 logger = logging.getLogger("wandb")
@@ -29,6 +29,7 @@ class Backend(object):
         self.resp_queue = None
         self.cancel_queue = None
         self.notify_queue = None  # notify activity on ...
+        self.ring = None
 
         self._done = False
         self._wl = wandb.setup()
@@ -67,6 +68,16 @@ class Backend(object):
         cancel_queue = self._wl._multiprocessing.Queue()
         notify_queue = self._wl._multiprocessing.Queue()
 
+        transport = settings.get("_transport") or "queue"
+        ring = None
+        if transport == "shm":
+            try:
+                ring_bytes = settings.get("_transport_shm_bytes")
+                ring = ringbuffer.RingBuffer.create(ring_bytes)
+            except (EnvironmentError, ValueError) as e:
+                logger.warning("shared memory transport unavailable: %s", e)
+                transport = "queue"
+
         wandb_process = self._wl._multiprocessing.Process(
             target=wandb_internal,
             args=(
@@ -79,6 +90,7 @@ class Backend(object):
                 fd_pipe_child,
                 log_level,
                 use_redirect,
+                ring.path if ring else None,
             ),
         )
         wandb_process.name = "wandb_internal"
@@ -154,6 +166,14 @@ class Backend(object):
         self.resp_queue = resp_queue
         self.cancel_queue = cancel_queue
         self.notify_queue = notify_queue
+        self.ring = ring
+
+        batch_bytes, batch_seconds = None, None
+        if transport == "batch":
+            batch_bytes = settings.get("_transport_batch_bytes")
+            batch_seconds = settings.get("_transport_batch_seconds")
+        elif transport not in ("queue", "shm"):
+            logger.warning("unknown transport %s, using queue", transport)
 
         self.interface = interface.BackendSender(
             process=wandb_process,
@@ -161,6 +181,9 @@ class Backend(object):
             process_queue=process_queue,
             request_queue=req_queue,
             response_queue=resp_queue,
+            batch_bytes=batch_bytes,
+            batch_seconds=batch_seconds,
+            ring=ring,
         )
 
     def server_connect(self):
@@ -177,9 +200,13 @@ class Backend(object):
             return
         self._done = True
 
+        self.interface.flush()
         self.notify_queue.put(constants.NOTIFY_SHUTDOWN)
         # TODO: make sure this is last in the queue?  lock?
         self.notify_queue.close()
         self.wandb_process.join()
         self.interface.join()
+        if self.ring:
+            self.ring.close()
+            self.ring.unlink()
         # No printing allowed from here until redirect restore!!!
@@ -24,7 +24,7 @@ from wandb import wandb_agent
 from wandb import wandb_controller
 from wandb.apis import InternalApi, PublicApi
 from wandb.old.settings import Settings
-from wandb.sync import SyncManager
+from wandb.sync import SyncManager, TBImporter
 import yaml
 
 # whaaaaat depends on prompt_toolkit < 2, ipython now uses > 2 so we vendored for now
@@ -314,13 +314,30 @@ def init(ctx, project, entity, reset):
 @click.option("--ignore",
               help="A comma seperated list of globs to ignore syncing with wandb.")
 @click.option('--all', is_flag=True, default=False, help="Sync all runs")
+@click.option('--tensorboard', is_flag=True, default=False,
+              help="Import the paths as TensorBoard log directories, one run each.")
+@click.option('--jobs', type=int, default=None,
+              help="Processes parsing tfevents files with --tensorboard, defaults to the number of CPUs.")
 @display_error
-def sync(ctx, path, id, project, entity, ignore, all):
+def sync(ctx, path, id, project, entity, ignore, all, tensorboard, jobs):
     all_args = locals()
     unsupported = ("id", "project", "entity", "ignore")
+    if tensorboard:
+        # imported runs go to the project and entity given
+        unsupported = ("ignore",)
     for item in unsupported:
         if all_args.get(item):
             cli_unsupported(item)
+    if tensorboard:
+        if not path:
+            wandb.termerror("Pass the TensorBoard log directories to import")
+            sys.exit(1)
+        if id and len(path) > 1:
+            wandb.termerror("--id can only be used with a single log directory")
+            sys.exit(1)
+        TBImporter(path, project=project, entity=entity, processes=jobs,
+                   run_id=id).run()
+        return
     sm = SyncManager()
     if not path:
         # Show listing of possible paths to sync
@@ -802,6 +819,27 @@ def ls(path, type):
                                                          latest.name))
 
 
+@artifact.group(help="Commands for interacting with the artifact cache")
+def cache():
+    pass
+
+
+@cache.command(context_settings=CONTEXT,
+               help="Clean up least recently used files from the artifacts cache")
+@click.argument("target_size")
+@display_error
+def cleanup(target_size):
+    try:
+        target_bytes = util.from_human_size(target_size)
+    except ValueError:
+        raise ClickException("Invalid target size: %s, use something like 10GB" % target_size)
+    artifacts_cache = wandb.wandb_sdk.wandb_artifacts.get_artifacts_cache()
+    result = artifacts_cache.cleanup(target_bytes)
+    wandb.termlog("Reclaimed {} in {} files, the cache now uses {}".format(
+        util.sizeof_fmt(result.reclaimed_bytes), result.removed_files,
+        util.sizeof_fmt(result.total_bytes)))
+
+
 @cli.command(context_settings=CONTEXT, help="Pull files from Weights & Biases")
 @click.argument("run", envvar=env.RUN_ID)
 @click.option("--project", "-p", envvar=env.PROJECT, help="The project you want to download.")
@@ -59,6 +59,8 @@ ANONYMOUS = 'WANDB_ANONYMOUS'
 JUPYTER = 'WANDB_JUPYTER'
 CONFIG_DIR = 'WANDB_CONFIG_DIR'
 CACHE_DIR = 'WANDB_CACHE_DIR'
+ARTIFACT_HASH_PROCESSES = 'WANDB_ARTIFACT_HASH_PROCESSES'
+ARTIFACT_CACHE_MAX_BYTES = 'WANDB_ARTIFACT_CACHE_MAX_BYTES'
 
 
 def immutable_keys():
@@ -129,6 +131,27 @@ def get_http_timeout(default=10, env=None):
     return int(env.get(HTTP_TIMEOUT, default))
 
 
+def get_artifact_hash_processes(default=None, env=None):
+    """Processes to hash artifact files with, 0 for one per core.
+
+    None (the default) hashes on threads."""
+    if env is None:
+        env = os.environ
+
+    val = env.get(ARTIFACT_HASH_PROCESSES, default)
+    if val is None or val == '':
+        return None
+    return int(val)
+
+
+def get_artifact_cache_max_bytes(default=None, env=None):
+    """Size budget of the artifacts cache, like "10GB". None for no limit."""
+    if env is None:
+        env = os.environ
+
+    return env.get(ARTIFACT_CACHE_MAX_BYTES, default) or None
+
+
 def get_ignore(default=None, env=None):
     if env is None:
         env = os.environ
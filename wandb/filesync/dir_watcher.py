@@ -1,17 +1,135 @@
 import logging
 import os
-import six
-from six.moves import queue
+import re
+import sys
+import threading
 import time
 
 from watchdog.observers.polling import PollingObserver
-from watchdog.events import PatternMatchingEventHandler
+from watchdog.events import FileSystemEventHandler, PatternMatchingEventHandler
 from wandb import util
 import glob
 
+try:
+    from watchdog.observers.inotify import InotifyObserver
+except Exception:  # not linux, or no inotify in libc
+    InotifyObserver = None
+
 
 logger = logging.getLogger(__file__)
 
+# inotify only sees changes made through the local kernel, these filesystems
+# can be changed from other hosts so they get polled
+POLLED_FILESYSTEMS = frozenset([
+    "nfs", "nfs4", "cifs", "smbfs", "smb3", "9p", "afs", "ceph", "lustre",
+    "gpfs", "glusterfs", "fuse.sshfs", "fuse.gcsfuse", "fuse.s3fs",
+])
+
+
+def filesystem_type(path):
+    """The type of the filesystem path is on, from /proc/mounts, or None"""
+    if not sys.platform.startswith("linux"):
+        return None
+    path = os.path.realpath(path)
+    best, fstype = "", None
+    try:
+        with open("/proc/mounts") as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                # spaces and such are octal escaped, e.g. \040
+                mount_point = re.sub(
+                    r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), fields[1])
+                prefix = mount_point.rstrip("/") + "/"
+                if (path == mount_point or path.startswith(prefix)) and \
+                        len(mount_point) >= len(best):
+                    best, fstype = mount_point, fields[2]
+    except (IOError, OSError):
+        return None
+    return fstype
+
+
+def _translate_glob(pattern):
+    """Regex source matching the paths glob.glob(pattern) would return.
+
+    Like glob, wildcards don't match "/", nor a leading "." of a path component.
+    """
+    parts = []
+    for component in pattern.split("/"):
+        res = ""
+        i, n = 0, len(component)
+        while i < n:
+            c = component[i]
+            i += 1
+            if c == "*":
+                res += "[^/]*"
+            elif c == "?":
+                res += "[^/]"
+            elif c == "[":
+                j = i
+                if j < n and component[j] == "!":
+                    j += 1
+                if j < n and component[j] == "]":
+                    j += 1
+                while j < n and component[j] != "]":
+                    j += 1
+                if j >= n:
+                    res += "\\["
+                else:
+                    # a "]" can only lead the set, escape it so it doesn't
+                    # close the regex class
+                    stuff = component[i:j].replace("\\", "\\\\").replace("]", "\\]")
+                    i = j + 1
+                    if stuff[0] == "!":
+                        stuff = "^/" + stuff[1:]
+                    elif stuff[0] == "^":
+                        stuff = "\\" + stuff
+                    res += "[%s]" % stuff
+            else:
+                res += re.escape(c)
+        if component[:1] in ("*", "?", "["):
+            res = "(?!\\.)" + res
+        parts.append(res)
+    return "/".join(parts)
+
+
+class PolicyMatcher(object):
+    """Classifies save names by the globs of the live and now policies.
+
+    The globs are compiled into a single regex, so a save name is matched in
+    one pass, without listing the run directory.
+    """
+
+    # later policies take precedence
+    POLICIES = ("live", "now")
+
+    def __init__(self):
+        self._globs = dict((policy, []) for policy in self.POLICIES)
+        self._regex = None
+
+    def add(self, pattern, policy):
+        pattern = util.to_forward_slash_path(os.path.normpath(pattern))
+        if policy in self._globs and pattern not in self._globs[policy]:
+            self._globs[policy].append(pattern)
+            self._regex = None
+
+    def policy(self, save_name):
+        """The policy of save_name, or None if no glob matches it."""
+        if self._regex is None:
+            groups = [
+                "(?P<%s>%s)" % (
+                    policy, "|".join(_translate_glob(g) for g in self._globs[policy]))
+                for policy in reversed(self.POLICIES) if self._globs[policy]
+            ]
+            if not groups:
+                return None
+            # case insensitive where the filesystem usually is
+            flags = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+            self._regex = re.compile("(?:%s)\\Z" % "|".join(groups), flags)
+        match = self._regex.match(util.to_forward_slash_path(save_name))
+        return match.lastgroup if match else None
+
 
 class FileEventHandler(object):
     def __init__(self, file_path, save_name, api, file_pusher, *args, **kwargs):
@@ -46,6 +164,9 @@ class PolicyIgnore(FileEventHandler):
 class PolicyNow(FileEventHandler):
     """This policy only uploads files now"""
     def on_modified(self, force=False):
+        # an empty file was likely just created, wait for it to be written
+        if os.path.getsize(self.file_path) == 0:
+            return
         # only upload if we've never uploaded or when .save is called
         if self._last_sync is None or force:
             self._file_pusher.file_changed(self.save_name, self.file_path)
@@ -134,20 +255,106 @@ class DirWatcher(object):
         self._file_count = 0
         self._dir = settings.files_dir
         self._settings = settings
-        self._user_file_policies = {
-            "end": set(),
-            "live": set(),
-            "now": set()
-        }
+        self._policy_matcher = PolicyMatcher()
         self._file_pusher = file_pusher
         self._file_event_handlers = {}
-        self._file_observer = PollingObserver()
-        self._file_observer.schedule(
-            self._per_file_event_handler(), self._dir, recursive=True
-        )
-        self._file_observer.start()
+        # inotify doesn't see writes through a symlink, so the directories
+        # of symlinked files (e.g. from wandb.save) are watched too, and
+        # their events are routed to the save names linking to them
+        self._link_targets = {}
+        self._target_dirs = set()
+        # target directories found while holding _lock, they are scheduled
+        # once it's released: the observer holds its own lock while it waits
+        # for ours to dispatch events
+        self._unwatched_dirs = []
+        self._target_poller = None
+        self._finished = False
+        # events come in on the observer thread, policies from the sender
+        self._lock = threading.RLock()
+        self._file_observer = self._start_observer()
         logger.info("watching files in: %s", settings.files_dir)
 
+    def _start_observer(self):
+        """Watch the run directory with inotify where possible, polling otherwise."""
+        fstype = filesystem_type(self._dir)
+        if InotifyObserver is not None and fstype not in POLLED_FILESYSTEMS:
+            observer = InotifyObserver()
+            self._polling = False
+            try:
+                watch = observer.schedule(
+                    self._per_file_event_handler(), self._dir, recursive=True
+                )
+                # links to files in the run directory, on the same watch
+                observer.add_handler_for_watch(self._link_target_handler(), watch)
+                observer.start()
+                return observer
+            except (IOError, OSError) as e:
+                # e.g. out of inotify watches or instances
+                logger.warning("can't watch %s with inotify, polling: %s", self._dir, e)
+                try:
+                    observer.stop()
+                except Exception:
+                    pass
+        else:
+            logger.info("polling %s filesystem: %s", fstype, self._dir)
+        observer = PollingObserver()
+        self._polling = True
+        observer.schedule(self._per_file_event_handler(), self._dir, recursive=True)
+        observer.start()
+        return observer
+
+    def _watch_link_target(self, file_path, save_name):
+        """Note the directory a symlinked file really is in, to be watched."""
+        target = os.path.realpath(file_path)
+        self._link_targets.setdefault(target, set()).add(save_name)
+        target_dir = os.path.dirname(target)
+        root = os.path.realpath(self._dir)
+        if target_dir in self._target_dirs or target_dir == root or \
+                target_dir.startswith(root + os.sep):
+            # the run directory is already watched recursively
+            return
+        self._target_dirs.add(target_dir)
+        self._unwatched_dirs.append(target_dir)
+
+    def _watch_target_dirs(self):
+        """Schedule watches for the noted link target directories, without _lock."""
+        with self._lock:
+            target_dirs, self._unwatched_dirs = self._unwatched_dirs, []
+            if self._finished:
+                return
+        for target_dir in target_dirs:
+            handler = self._link_target_handler()
+            try:
+                self._file_observer.schedule(handler, target_dir, recursive=False)
+                continue
+            except (IOError, OSError) as e:
+                logger.warning("can't watch %s with inotify, polling: %s", target_dir, e)
+            with self._lock:
+                if self._target_poller is None:
+                    self._target_poller = PollingObserver()
+                    self._target_poller.start()
+            self._target_poller.schedule(handler, target_dir, recursive=False)
+
+    def _link_target_handler(self):
+        handler = FileSystemEventHandler()
+        handler.on_created = self._locked(self._on_target_modified)
+        handler.on_modified = self._locked(self._on_target_modified)
+        handler.on_moved = self._locked(self._on_target_moved)
+        return handler
+
+    def _on_target_modified(self, event, path=None):
+        if not self._link_targets or event.is_directory:
+            return
+        path = os.path.realpath(path or event.src_path)
+        for save_name in self._link_targets.get(path, ()):
+            handler = self._file_event_handlers.get(save_name)
+            if handler and os.path.isfile(handler.file_path):
+                handler.on_modified()
+
+    def _on_target_moved(self, event):
+        # files are often written to a temporary name and moved into place
+        self._on_target_modified(event, event.dest_path)
+
     @property
     def emitter(self):
         try:
@@ -156,18 +363,30 @@ class DirWatcher(object):
             return None
 
     def update_policy(self, path, policy):
-        self._user_file_policies[policy].add(path)
-        for src_path in glob.glob(os.path.join(self._dir, path)):
-            save_name = os.path.relpath(src_path, self._dir)
-            self._get_file_event_handler(src_path, save_name).on_modified(force=True)
+        with self._lock:
+            self._policy_matcher.add(path, policy)
+            # only this glob has to be listed, for the files we haven't seen yet
+            for src_path in glob.glob(os.path.join(self._dir, path)):
+                save_name = os.path.relpath(src_path, self._dir)
+                self._get_file_event_handler(src_path, save_name).on_modified(force=True)
+        self._watch_target_dirs()
+
+    def _locked(self, fn):
+        def locked(*args):
+            with self._lock:
+                result = fn(*args)
+            if self._unwatched_dirs:
+                self._watch_target_dirs()
+            return result
+        return locked
 
     def _per_file_event_handler(self):
         """Create a Watchdog file event handler that does different things for every file
         """
         file_event_handler = PatternMatchingEventHandler()
-        file_event_handler.on_created = self._on_file_created
-        file_event_handler.on_modified = self._on_file_modified
-        file_event_handler.on_moved = self._on_file_moved
+        file_event_handler.on_created = self._locked(self._on_file_created)
+        file_event_handler.on_modified = self._locked(self._on_file_modified)
+        file_event_handler.on_moved = self._locked(self._on_file_moved)
         file_event_handler._patterns = [os.path.join(self._dir, os.path.normpath("*"))]
         # Ignore hidden files/folders
         #  TODO: what other files should we skip?
@@ -190,7 +409,7 @@ class DirWatcher(object):
             return None
         self._file_count += 1
         # We do the directory scan less often as it grows
-        if self._file_count % 100 == 0:
+        if self._polling and self._file_count % 100 == 0:
             emitter = self.emitter
             if emitter:
                 emitter._timeout = int(self._file_count / 100) + 1
@@ -232,44 +451,27 @@ class DirWatcher(object):
                     file_path, save_name, self._api, self._file_pusher
                 )
             else:
-                Handler = PolicyEnd
-                for policy, globs in six.iteritems(self._user_file_policies):
-                    if policy == "end":
-                        continue
-                    # Convert set to list to avoid RuntimeError's
-                    # TODO: we may need to add locks
-                    for g in list(globs):
-                        paths = glob.glob(os.path.join(self._dir, g))
-                        if any(save_name in p for p in paths):
-                            if policy == "live":
-                                Handler = PolicyLive
-                            elif policy == "now":
-                                Handler = PolicyNow
+                Handler = {
+                    "live": PolicyLive,
+                    "now": PolicyNow,
+                }.get(self._policy_matcher.policy(save_name), PolicyEnd)
                 self._file_event_handlers[save_name] = Handler(
                     file_path, save_name, self._api, self._file_pusher)
+            if not self._polling and not self._finished and os.path.islink(file_path):
+                self._watch_link_target(file_path, save_name)
         return self._file_event_handlers[save_name]
 
     def finish(self):
         logger.info("shutting down directory watcher")
+        self._finished = True
         try:
             # avoid hanging if we crashed before the observer was started
-            if self._file_observer.is_alive():
-                # rather unfortunatly we need to manually do a final scan of the dir
-                # with `queue_events`, then iterate through all events before stopping
-                # the observer to catch all files written.  First we need to prevent the
-                # existing thread from consuming our final events, then we process them
-                self._file_observer._timeout = 0
-                self._file_observer._stopped_event.set()
-                self._file_observer.join()
-                self.emitter.queue_events(0)
-                while True:
-                    try:
-                        self._file_observer.dispatch_events(
-                            self._file_observer.event_queue, 0)
-                    except queue.Empty:
-                        break
-                # Calling stop unschedules any inflight events so we handled them above
-                self._file_observer.stop()
+            for observer in (self._file_observer, self._target_poller):
+                if observer is not None and observer.is_alive():
+                    # Files changed since the last event are handled by the
+                    # scan below, there's no need to wait for their events
+                    observer.stop()
+                    observer.join()
         # TODO: py2 TypeError: PyCObject_AsVoidPtr called with null pointer
         except TypeError:
             pass
@@ -277,13 +479,23 @@ class DirWatcher(object):
         except SystemError:
             pass
 
-        # Ensure we've at least noticed every file in the run directory. Sometimes
-        # we miss things because asynchronously watching filesystems isn't reliable.
+        # Finish the files we know about, then ensure we've at least noticed
+        # every file in the run directory. Sometimes we miss things because
+        # asynchronously watching filesystems isn't reliable. Files are handled
+        # as if their last change was noticed, as it may not have been.
+        for handler in list(self._file_event_handlers.values()):
+            if os.path.isfile(handler.file_path):
+                handler.on_modified()
+                handler.finish()
         logger.info("scan: %s", self._dir)
 
         for dirpath, _, filenames in os.walk(self._dir):
             for fname in filenames:
                 file_path = os.path.join(dirpath, fname)
                 save_name = os.path.relpath(file_path, self._dir)
+                if save_name in self._file_event_handlers:
+                    continue
                 logger.info("scan save: %s %s", file_path, save_name)
-                self._get_file_event_handler(file_path, save_name).finish()
+                handler = self._get_file_event_handler(file_path, save_name)
+                handler.on_modified()
+                handler.finish()
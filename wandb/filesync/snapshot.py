@@ -0,0 +1,94 @@
+"""Point in time copies of files that may still be written to.
+
+snapshot() first tries a reflink (FICLONE on Linux), a copy on write clone
+that shares the data blocks of the source and takes constant time. When the
+filesystem can't clone (or source and destination are on different devices)
+it streams the copy, hashing the data in the same pass when asked to.
+
+Hardlinks are not used: they share the inode, so a file that keeps being
+written in place would change under the upload.
+"""
+
+import base64
+import errno
+import hashlib
+import logging
+import os
+import shutil
+import sys
+import threading
+
+logger = logging.getLogger(__name__)
+
+# _IOW(0x94, 9, int) from linux/fs.h
+FICLONE = 0x40049409
+
+COPY_CHUNK_BYTES = 1024 * 1024
+
+# (src device, dst device) pairs that failed to reflink, not tried again
+_no_reflink = set()
+_no_reflink_lock = threading.Lock()
+
+_REFLINK_UNSUPPORTED = set(
+    getattr(errno, name) for name in (
+        'EOPNOTSUPP', 'ENOTSUP', 'EXDEV', 'EINVAL', 'ENOTTY', 'ENOSYS')
+    if hasattr(errno, name))
+
+
+def _reflink(src, dst):
+    """Clone src to dst, returns False if that's not possible here."""
+    if not sys.platform.startswith('linux'):
+        return False
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    devices = (os.stat(src).st_dev, os.stat(os.path.dirname(dst) or '.').st_dev)
+    if devices in _no_reflink:
+        return False
+    with open(src, 'rb') as fsrc:
+        with open(dst, 'wb') as fdst:
+            try:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                return True
+            except (IOError, OSError) as e:
+                if e.errno not in _REFLINK_UNSUPPORTED:
+                    raise
+    with _no_reflink_lock:
+        _no_reflink.add(devices)
+    logger.info('reflink not supported for %s, copying', dst)
+    return False
+
+
+def _stream_copy(src, dst, hash_md5):
+    with open(src, 'rb') as fsrc:
+        with open(dst, 'wb') as fdst:
+            for chunk in iter(lambda: fsrc.read(COPY_CHUNK_BYTES), b''):
+                fdst.write(chunk)
+                if hash_md5 is not None:
+                    hash_md5.update(chunk)
+
+
+def snapshot(src, dst, md5=False):
+    """Copy src to dst, keeping its metadata like shutil.copy2.
+
+    Returns:
+        The base64 md5 of the copy (as wandb.util.md5_file) if md5 is set,
+        otherwise None.
+    """
+    if _reflink(src, dst):
+        shutil.copystat(src, dst)
+        if md5:
+            # the clone doesn't change anymore, hash it instead of the source
+            hash_md5 = hashlib.md5()
+            with open(dst, 'rb') as f:
+                for chunk in iter(lambda: f.read(COPY_CHUNK_BYTES), b''):
+                    hash_md5.update(chunk)
+            return base64.b64encode(hash_md5.digest()).decode('ascii')
+        return None
+    hash_md5 = hashlib.md5() if md5 else None
+    _stream_copy(src, dst, hash_md5)
+    shutil.copystat(src, dst)
+    if hash_md5 is not None:
+        return base64.b64encode(hash_md5.digest()).decode('ascii')
+    return None
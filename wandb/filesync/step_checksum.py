@@ -1,13 +1,17 @@
 """Batching file prepare requests to our API."""
 
 import collections
+import logging
 import os
-import shutil
 import threading
+from six.moves import queue
 import wandb.util
 
+from wandb.filesync import snapshot
 from wandb.filesync import step_upload
 
+logger = logging.getLogger(__name__)
+
 
 RequestUpload = collections.namedtuple(
     'RequestUpload', ('path', 'save_name', 'artifact_id', 'copy', 'use_prepare_flow', 'save_fn', 'digest'))
@@ -17,6 +21,9 @@ RequestCommitArtifact = collections.namedtuple(
     'RequestCommitArtifact', ('artifact_id', 'on_commit'))
 RequestFinish = collections.namedtuple('RequestFinish', ())
 
+# Threads that copy and hash files, so one big file doesn't hold up the rest.
+SNAPSHOT_THREADS = 4
+
     
 class StepChecksum(object):
     def __init__(self, api, tempdir, request_queue, output_queue, stats):
@@ -29,29 +36,20 @@ class StepChecksum(object):
         self._thread = threading.Thread(target=self._thread_body)
         self._thread.daemon = True
 
+        # Files are snapshotted on a small pool. A file has at most one
+        # snapshot in flight; later requests for it wait in a deque keyed by
+        # save_name and are run by the same worker afterwards.
+        self._snapshot_queue = queue.Queue()
+        self._workers = []
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._snapshotting = {}
+
     def _thread_body(self):
-        finished = False
         while True:
             req = self._request_queue.get()
             if isinstance(req, RequestUpload):
-                path = req.path
-                if req.copy:
-                    path = os.path.join(self._tempdir.name, '%s-%s' % (
-                        wandb.util.generate_id(), req.save_name))
-                    wandb.util.mkdir_exists_ok(os.path.dirname(path))
-                    shutil.copy2(req.path, path)
-                checksum = None
-                if req.use_prepare_flow:
-                    # passing a checksum through indicates that we'd like to use the
-                    # "prepare" file upload flow, in which we prepare the files in
-                    # the database before uploading them. This is currently only
-                    # used for artifact manifests
-                    checksum = wandb.util.md5_file(path)
-                self._stats.init_file(req.save_name, os.path.getsize(path))
-                self._output_queue.put(
-                    step_upload.RequestUpload(
-                        path, req.save_name, req.artifact_id, checksum, req.copy,
-                        req.save_fn, req.digest))
+                self._request_snapshot(req)
             elif isinstance(req, RequestStoreManifestFiles):
                 for entry in req.manifest.entries.values():
                     if entry.local_path:
@@ -69,14 +67,87 @@ class StepChecksum(object):
                                 make_save_fn_with_entry(req.save_fn, entry),
                                 entry.digest))
             elif isinstance(req, RequestCommitArtifact):
+                # the artifact's files must reach StepUpload before its commit
+                self._wait_snapshots()
                 self._output_queue.put(step_upload.RequestCommitArtifact(req.artifact_id, req.on_commit))
             elif isinstance(req, RequestFinish):
                 break
             else:
                 raise Exception('internal error')
 
+        self._wait_snapshots()
+        for _ in self._workers:
+            self._snapshot_queue.put(None)
+        for worker in self._workers:
+            worker.join()
         self._output_queue.put(step_upload.RequestFinish())
 
+    def _request_snapshot(self, req):
+        with self._lock:
+            waiting = self._snapshotting.get(req.save_name)
+            if waiting is not None:
+                # Snapshots are taken when they run, so a waiting snapshot of
+                # a run file would copy the same data as this one.
+                if waiting and req.artifact_id is None and waiting[-1].artifact_id is None:
+                    waiting.pop()
+                waiting.append(req)
+                return
+            self._snapshotting[req.save_name] = collections.deque()
+            busy = len(self._snapshotting)
+        self._snapshot_queue.put(req)
+        if len(self._workers) < min(SNAPSHOT_THREADS, busy):
+            worker = threading.Thread(target=self._worker_body)
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+
+    def _worker_body(self):
+        while True:
+            req = self._snapshot_queue.get()
+            if req is None:
+                break
+            while req is not None:
+                try:
+                    self._snapshot(req)
+                except Exception:
+                    logger.exception('Failed to prepare %s for upload', req.path)
+                    if req.artifact_id is not None:
+                        self._output_queue.put(
+                            step_upload.EventPrepareFailed(req.artifact_id, req.save_name))
+                with self._lock:
+                    waiting = self._snapshotting[req.save_name]
+                    if waiting:
+                        req = waiting.popleft()
+                    else:
+                        del self._snapshotting[req.save_name]
+                        req = None
+                        self._idle.notify_all()
+
+    def _wait_snapshots(self):
+        with self._idle:
+            while self._snapshotting:
+                self._idle.wait()
+
+    def _snapshot(self, req):
+        path = req.path
+        checksum = None
+        if req.copy:
+            path = os.path.join(self._tempdir.name, '%s-%s' % (
+                wandb.util.generate_id(), req.save_name))
+            wandb.util.mkdir_exists_ok(os.path.dirname(path))
+            # passing a checksum through indicates that we'd like to use the
+            # "prepare" file upload flow, in which we prepare the files in
+            # the database before uploading them. This is currently only
+            # used for artifact manifests
+            checksum = snapshot.snapshot(req.path, path, md5=req.use_prepare_flow)
+        elif req.use_prepare_flow:
+            checksum = wandb.util.md5_file(path)
+        self._stats.init_file(req.save_name, os.path.getsize(path))
+        self._output_queue.put(
+            step_upload.RequestUpload(
+                path, req.save_name, req.artifact_id, checksum, req.copy,
+                req.save_fn, req.digest))
+
     def start(self):
         self._thread.start()
 
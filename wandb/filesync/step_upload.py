@@ -1,11 +1,18 @@
 """Batching file prepare requests to our API."""
 
 import collections
+import itertools
+import logging
+import os
 import threading
 from six.moves import queue
 
+from wandb.filesync import step_upload_urls
 from wandb.filesync import upload_job
 from wandb.errors.term import termerror
+from wandb.lib.filenames import is_wandb_file
+
+logger = logging.getLogger(__name__)
 
 
 RequestUpload = collections.namedtuple(
@@ -14,6 +21,34 @@ RequestUpload = collections.namedtuple(
 RequestCommitArtifact = collections.namedtuple(
     'RequestCommitArtifact', ('artifact_id', 'on_commit'))
 RequestFinish = collections.namedtuple('RequestFinish', ())
+# An artifact file that couldn't be prepared for upload, its artifact can't
+# be committed.
+EventPrepareFailed = collections.namedtuple(
+    'EventPrepareFailed', ('artifact_id', 'save_name'))
+
+# Workers take small wandb files (config, summary, metadata...) before
+# anything else, so they don't sit behind large checkpoints. Jobs of the same
+# priority are uploaded in the order they were requested.
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+_PRIORITY_STOP = 2
+SMALL_FILE_BYTES = 1024 * 1024
+
+# Upload url requests of run files that come in within this window are
+# resolved with one API call.
+URL_BATCH_TIME = 0.1
+URL_INTER_EVENT_TIME = 0.01
+URL_MAX_BATCH_SIZE = 500
+
+
+def upload_priority(event):
+    if event.artifact_id is None and is_wandb_file(event.save_name):
+        try:
+            if os.path.getsize(event.path) <= SMALL_FILE_BYTES:
+                return PRIORITY_HIGH
+        except OSError:
+            pass
+    return PRIORITY_NORMAL
 
 
 class StepUpload(object):
@@ -26,9 +61,21 @@ class StepUpload(object):
         self._thread = threading.Thread(target=self._thread_body)
         self._thread.daemon = True
 
+        # A fixed pool of at most max_jobs workers takes UploadJobs from a
+        # queue ordered by (priority, sequence number).
+        self._job_queue = queue.PriorityQueue()
+        self._job_seq = itertools.count()
+        self._workers = []
+
+        self._upload_urls = step_upload_urls.StepUploadUrls(
+            api, URL_BATCH_TIME, URL_INTER_EVENT_TIME, URL_MAX_BATCH_SIZE)
+
         # Indexed by files' `save_name`'s, which are their ID's in the Run.
+        # Holds jobs that are waiting for a worker or uploading.
         self._running_jobs = {}
-        self._pending_jobs = []
+        # Uploads of files that already have a running job, a deque of
+        # RequestUpload events per save_name.
+        self._pending_jobs = {}
 
         self._artifacts = {}
 
@@ -61,10 +108,27 @@ class StepUpload(object):
                 # Queue was empty and no jobs left.
                 break
 
+        for _ in self._workers:
+            self._job_queue.put((_PRIORITY_STOP, next(self._job_seq), None))
+        for worker in self._workers:
+            worker.join()
+        self._upload_urls.shutdown()
+
+    def _worker_body(self):
+        while True:
+            _, _, job = self._job_queue.get()
+            if job is None:
+                break
+            try:
+                job.run()
+            except Exception:
+                # job.run always reports back with EventJobDone, keep the
+                # worker alive for the next job
+                logger.exception("Upload job for %s failed", job.save_name)
+
     def _handle_event(self, event):
         if isinstance(event, upload_job.EventJobDone):
             job = event.job
-            job.join()
             if job.artifact_id:
                 if event.success:
                     self._artifacts[job.artifact_id]['pending_count'] -= 1
@@ -72,9 +136,12 @@ class StepUpload(object):
                 else:
                     termerror('Uploading artifact file failed. Artifact won\'t be committed.')
             self._running_jobs.pop(job.save_name)
-            # If we have any pending jobs, start one now
-            if self._pending_jobs:
-                event = self._pending_jobs.pop(0)
+            # If another upload of this file was waiting, start it now
+            pending = self._pending_jobs.get(job.save_name)
+            if pending:
+                event = pending.popleft()
+                if not pending:
+                    del self._pending_jobs[job.save_name]
                 self._start_upload_job(event)
         elif isinstance(event, RequestCommitArtifact):
             self._artifacts[event.artifact_id]['commit_requested'] = True
@@ -90,10 +157,18 @@ class StepUpload(object):
                         'commit_callbacks': set(),
                     }
                 self._artifacts[event.artifact_id]['pending_count'] += 1
-            if len(self._running_jobs) == self._max_jobs:
-                self._pending_jobs.append(event)
-            else:
-                self._start_upload_job(event)
+            self._start_upload_job(event)
+        elif isinstance(event, EventPrepareFailed):
+            # Counted as a pending file that never finishes, the same as an
+            # upload that failed.
+            if event.artifact_id not in self._artifacts:
+                self._artifacts[event.artifact_id] = {
+                    'pending_count': 0,
+                    'commit_requested': False,
+                    'commit_callbacks': set(),
+                }
+            self._artifacts[event.artifact_id]['pending_count'] += 1
+            termerror('Preparing artifact file %s failed. Artifact won\'t be committed.' % event.save_name)
         else:
             raise Exception('Programming error: unhandled event: %s' % str(event))
 
@@ -102,19 +177,34 @@ class StepUpload(object):
             raise Exception('Programming error: invalid event')
 
         # Operations on a single backend file must be serialized. if
-        # we're already uploading this file, put the event on the
-        # end of the queue
+        # we're already uploading this file, wait for that upload to finish
         if event.save_name in self._running_jobs:
-            self._pending_jobs.append(event)
+            self._defer_upload_job(event)
             return
 
-        # Start it.
+        # Queue it for the workers, adding one if all of them are busy.
         job = upload_job.UploadJob(
             self._event_queue, self._stats, self._api,
             event.save_name, event.path, event.artifact_id, event.md5, event.copied,
-            event.save_fn, event.digest)
+            event.save_fn, event.digest, upload_urls=self._upload_urls)
         self._running_jobs[event.save_name] = job
-        job.start()
+        self._job_queue.put((upload_priority(event), next(self._job_seq), job))
+        if len(self._workers) < min(self._max_jobs, len(self._running_jobs)):
+            worker = threading.Thread(target=self._worker_body)
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+
+    def _defer_upload_job(self, event):
+        pending = self._pending_jobs.setdefault(event.save_name, collections.deque())
+        # A run file only needs its newest version uploaded, drop a waiting
+        # upload it supersedes. Artifact files are each counted towards
+        # their artifact's commit, so they all get uploaded.
+        if pending and event.artifact_id is None and pending[-1].artifact_id is None:
+            superseded = pending.pop()
+            if superseded.copied and superseded.path != event.path and os.path.isfile(superseded.path):
+                os.remove(superseded.path)
+        pending.append(event)
 
     def _maybe_commit_artifact(self, artifact_id):
         artifact_status = self._artifacts[artifact_id]
@@ -124,6 +214,7 @@ class StepUpload(object):
                 callback()
 
     def start(self):
+        self._upload_urls.start()
         self._thread.start()
 
     def is_alive(self):
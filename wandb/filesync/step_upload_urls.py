@@ -0,0 +1,122 @@
+"""Batching run file upload url requests to our API."""
+
+import collections
+import threading
+import time
+from six.moves import queue
+
+from wandb.errors.error import CommError
+
+# Request for the signed upload url of a run file.
+RequestUploadUrl = collections.namedtuple(
+    'RequestUploadUrl', ('save_name', 'response_queue'))
+
+RequestFinish = collections.namedtuple('RequestFinish', ())
+
+ResponseUploadUrl = collections.namedtuple(
+    'ResponseUploadUrl', ('upload_url', 'upload_headers'))
+
+
+class StepUploadUrls(object):
+    """A thread that batches requests to our run file upload url API.
+
+    Any number of threads may call upload_url() in parallel. The thread gathers
+    the requests that come in within a short window and resolves all of their
+    urls with a single upload_urls call.
+    """
+
+    def __init__(self, api, batch_time, inter_event_time, max_batch_size):
+        self._api = api
+        self._inter_event_time = inter_event_time
+        self._batch_time = batch_time
+        self._max_batch_size = max_batch_size
+        self._request_queue = queue.Queue()
+        self._thread = threading.Thread(target=self._thread_body)
+        self._thread.daemon = True
+
+    def _thread_body(self):
+        while True:
+            request = self._request_queue.get()
+            if isinstance(request, RequestFinish):
+                break
+            finish, batch = self._gather_batch(request)
+            try:
+                upload_headers, result = self._upload_urls_batch(batch)
+            except Exception as e:
+                # every file of the batch failed, let the uploaders handle it
+                for url_request in batch:
+                    url_request.response_queue.put(e)
+            else:
+                for url_request in batch:
+                    file_info = result.get(url_request.save_name)
+                    if file_info is None:
+                        url_request.response_queue.put(CommError(
+                            'No upload url for %s' % url_request.save_name))
+                    else:
+                        url_request.response_queue.put(
+                            ResponseUploadUrl(file_info['url'], upload_headers))
+            if finish:
+                break
+
+    def _gather_batch(self, first_request):
+        batch_start_time = time.time()
+        batch = [first_request]
+        while True:
+            try:
+                request = self._request_queue.get(block=True, timeout=self._inter_event_time)
+                if isinstance(request, RequestFinish):
+                    return True, batch
+                batch.append(request)
+                remaining_time = self._batch_time - (time.time() - batch_start_time)
+                if remaining_time < 0 or len(batch) >= self._max_batch_size:
+                    break
+            except queue.Empty:
+                break
+        return False, batch
+
+    def _upload_urls_batch(self, batch):
+        """Execute the upload_urls API call.
+
+        Args:
+            batch: List of RequestUploadUrl objects
+        Returns:
+            (upload_headers, result) where result is a dict of (save_name: file_info)
+                pairs, file_info has a url key which is None if the file doesn't
+                need to be uploaded.
+        """
+        save_names = []
+        for url_request in batch:
+            if url_request.save_name not in save_names:
+                save_names.append(url_request.save_name)
+        project = self._api.get_project()
+        _, upload_headers, result = self._api.upload_urls(project, save_names)
+        return upload_headers, result
+
+    def upload_url(self, save_name):
+        """Get the signed upload url of a run file.
+
+        Returns:
+            ResponseUploadUrl, its upload_url is None if the file doesn't need to
+                be uploaded.
+        Raises:
+            The error of the upload_urls call that included this file.
+        """
+        response_queue = queue.Queue()
+        self._request_queue.put(RequestUploadUrl(save_name, response_queue))
+        response = response_queue.get()
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def start(self):
+        self._thread.start()
+
+    def finish(self):
+        self._request_queue.put(RequestFinish())
+
+    def is_alive(self):
+        return self._thread.is_alive()
+
+    def shutdown(self):
+        self.finish()
+        self._thread.join()
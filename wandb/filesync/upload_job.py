@@ -1,7 +1,6 @@
 import collections
 import os
 import logging
-import threading
 
 import wandb
 
@@ -9,9 +8,9 @@ EventJobDone = collections.namedtuple('EventJobDone', ('job', 'success'))
 logger = logging.getLogger(__file__)
 
 
-class UploadJob(threading.Thread):
-    def __init__(self, done_queue, stats, api, save_name, path, artifact_id, md5, copied, save_fn, digest):
-        """A file upload thread.
+class UploadJob(object):
+    def __init__(self, done_queue, stats, api, save_name, path, artifact_id, md5, copied, save_fn, digest, upload_urls=None):
+        """A file upload, run by one of the StepUpload worker threads.
 
         Arguments:
             done_queue: queue.Queue in which to put an EventJobDone event when
@@ -21,6 +20,8 @@ class UploadJob(threading.Thread):
             save_name: string logical location of the file relative to the run
                 directory.
             path: actual string path of the file to upload on the filesystem.
+            upload_urls: optional StepUploadUrls which batches the upload url
+                requests of run files.
         """
         self._done_queue = done_queue
         self._stats = stats
@@ -32,7 +33,7 @@ class UploadJob(threading.Thread):
         self.copied = copied
         self.save_fn = save_fn
         self.digest = digest
-        super(UploadJob, self).__init__()
+        self._upload_urls = upload_urls
 
     def run(self):
         success = False
@@ -84,10 +85,13 @@ class UploadJob(threading.Thread):
             # The classic file upload flow. We get a signed url and upload the file
             # then the backend handles the cloud storage metadata callback to create the
             # file entry. This flow has aged like a fine wine.
-            project = self._api.get_project()
-            _, upload_headers, result = self._api.upload_urls(project, [self.save_name])
-            file_info = result[self.save_name]
-            upload_url = file_info['url']
+            if self._upload_urls:
+                upload_url, upload_headers = self._upload_urls.upload_url(self.save_name)
+            else:
+                project = self._api.get_project()
+                _, upload_headers, result = self._api.upload_urls(project, [self.save_name])
+                file_info = result[self.save_name]
+                upload_url = file_info['url']
 
         if upload_url is None:
             logger.info("Skipped uploading %s", self.save_path)
@@ -3,6 +3,8 @@ import time
 
 import six
 import wandb
+from wandb.internal import tfevents
+from wandb.proto.wandb_tfevents_pb2 import Summary
 
 # We have atleast the default namestep and a global step to track
 # TODO: reset this structure on wandb.join
@@ -12,19 +14,15 @@ STEPS = {"": {"step": 0}, "global": {"step": 0, "last_log": None}}
 # can be a floating point.
 RATE_LIMIT_SECONDS = None
 IGNORE_KINDS = []
-tensor_util = wandb.util.get_module("tensorboard.util.tensor_util")
-
-
-pb = wandb.util.get_module(
-    "tensorboard.compat.proto.summary_pb2"
-) or wandb.util.get_module("tensorflow.summary")
-if pb:
-    Summary = pb.Summary
-else:
-    Summary = None
 
 
 def make_ndarray(tensor):
+    try:
+        # numeric tensors are converted without tensorboard
+        return tfevents.make_ndarray(tensor)
+    except ValueError:
+        pass
+    tensor_util = wandb.util.get_module("tensorboard.util.tensor_util")
     if tensor_util:
         res = tensor_util.make_ndarray(tensor)
         # Tensorboard can log generic objects and we don't want to save them
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Record batches - Group records sent to the internal process
+
+A batch is a bytes object holding serialized Record protos, each prefixed
+with its length as a little endian uint32.  Sending one batch costs a single
+queue put (and pickle of a bytes object) instead of one per record.
+
+"""
+
+import logging
+import struct
+import threading
+
+from wandb.proto import wandb_internal_pb2  # type: ignore
+
+logger = logging.getLogger("wandb")
+
+_LENGTH = struct.Struct("<I")
+
+
+def encode_records(records):
+    buf = bytearray()
+    for rec in records:
+        data = rec.SerializeToString()
+        buf += _LENGTH.pack(len(data))
+        buf += data
+    return bytes(buf)
+
+
+def decode_records(data):
+    offset = 0
+    end = len(data)
+    while offset < end:
+        (length,) = _LENGTH.unpack_from(data, offset)
+        start = offset + _LENGTH.size
+        offset = start + length
+        rec = wandb_internal_pb2.Record()
+        rec.ParseFromString(data[start:offset])
+        yield rec
+
+
+class RecordBatcher(object):
+    """Accumulate records and hand them off as batches.
+
+    A batch is flushed once it holds at least `max_bytes`, when `flush()` is
+    called, and by a background thread at most `max_seconds` after the first
+    record of the batch was added.
+    """
+
+    def __init__(self, flush_func, max_bytes=256 * 1024, max_seconds=0.05):
+        self._flush_func = flush_func
+        self._max_bytes = max_bytes
+        self._max_seconds = max_seconds
+
+        self._buf = bytearray()
+        self._lock = threading.Lock()
+        self._pending = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def add(self, rec):
+        data = rec.SerializeToString()
+        with self._lock:
+            self._buf += _LENGTH.pack(len(data))
+            self._buf += data
+            if len(self._buf) >= self._max_bytes or self._stopped.is_set():
+                self._flush()
+                return
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    name="wandb_batcher", target=self._thread_body
+                )
+                self._thread.daemon = True
+                self._thread.start()
+        self._pending.set()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self._buf:
+            return
+        data = bytes(self._buf)
+        self._buf = bytearray()
+        self._flush_func(data)
+
+    def _thread_body(self):
+        while not self._stopped.is_set():
+            self._pending.wait()
+            self._pending.clear()
+            # give the batch a chance to fill up before sending it
+            self._stopped.wait(self._max_seconds)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning("failed to flush record batch: %s", e)
+
+    def finish(self):
+        self.flush()
+        self._stopped.set()
+        self._pending.set()
+        if self._thread:
+            self._thread.join()
@@ -1,3 +1,5 @@
 NOTIFY_PROCESS = 1
 NOTIFY_SHUTDOWN = 2
 NOTIFY_REQUEST = 3
+NOTIFY_PROCESS_BATCH = 4
+NOTIFY_PROCESS_RING = 5
@@ -8,13 +8,14 @@ Manage backend sender.
 import json
 import logging
 import threading
+import time
 import uuid
 
 import six
 from six.moves import queue
 import wandb
 from wandb import data_types
-from wandb.interface import constants
+from wandb.interface import batch, constants, ringbuffer
 from wandb.proto import wandb_internal_pb2  # type: ignore
 from wandb.util import (
     get_h5_typename,
@@ -123,6 +124,9 @@ class BackendSender(object):
         request_queue=None,
         response_queue=None,
         process=None,
+        batch_bytes=None,
+        batch_seconds=None,
+        ring=None,
     ):
         self.process_queue = process_queue
         self.notify_queue = notify_queue
@@ -131,6 +135,15 @@ class BackendSender(object):
         self._run = None
         self._process = process
 
+        self._ring = ring
+        self._ring_lock = threading.Lock()
+
+        self._batcher = None
+        if batch_bytes:
+            self._batcher = batch.RecordBatcher(
+                self._queue_batch, max_bytes=batch_bytes, max_seconds=batch_seconds
+            )
+
         if self.request_queue:
             self._sync_message_router = MessageRouter(
                 request_queue, notify_queue, response_queue
@@ -365,13 +378,45 @@ class BackendSender(object):
     def _queue_process(self, rec):
         if self._process and not self._process.is_alive():
             raise Exception("problem")
+        if self._ring:
+            self._queue_ring(rec)
+            return
+        if self._batcher:
+            self._batcher.add(rec)
+            return
         self.process_queue.put(rec)
         self.notify_queue.put(constants.NOTIFY_PROCESS)
 
+    def _queue_ring(self, rec):
+        data = rec.SerializeToString()
+        with self._ring_lock:
+            if not self._ring.fits(data):
+                # leave a marker so the record is picked up in order
+                self.process_queue.put(rec)
+                data = ringbuffer.MARKER
+            while not self._ring.put(data):
+                # the ring is full, wait for the internal process to catch up
+                if self._process and not self._process.is_alive():
+                    raise Exception("problem")
+                time.sleep(0.001)
+            if self._ring.take_doorbell():
+                self.notify_queue.put(constants.NOTIFY_PROCESS_RING)
+
+    def _queue_batch(self, data):
+        self.process_queue.put(data)
+        self.notify_queue.put(constants.NOTIFY_PROCESS_BATCH)
+
+    def flush(self):
+        """Send any records held back by batching."""
+        if self._batcher:
+            self._batcher.flush()
+
     def _request_response(self, rec, timeout=5, local=False):
         assert (
             self._sync_message_router is not None
         ), "This BackendSender instance does not have a MessageRouter"
+        # requests must not overtake records still sitting in a batch
+        self.flush()
         future = self._sync_message_router.send_and_receive(rec, local)
         return future.get(timeout)
 
@@ -502,5 +547,7 @@ class BackendSender(object):
         return get_summary_response
 
     def join(self):
+        if self._batcher:
+            self._batcher.finish()
         if self._sync_message_router:
             self._sync_message_router.join()
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""Ring buffer - Shared memory transport to the internal process
+
+A single producer / single consumer ring of length-prefixed frames in a memory
+mapped file (on /dev/shm when available).  The header holds monotonically
+increasing write and read positions plus a flag the consumer raises before it
+goes to sleep, so the producer only rings the doorbell when someone is waiting.
+
+The producer publishes a frame by bumping the write position after copying the
+data, which relies on stores to the mapping becoming visible in program order.
+There is no fence around the doorbell flag, so a wakeup can be lost; the
+consumer sleeps at most DOORBELL_TIMEOUT seconds while the ring is in use and
+drains it whenever it wakes.
+
+"""
+
+import logging
+import mmap
+import os
+import struct
+import tempfile
+
+logger = logging.getLogger("wandb")
+
+HEADER_SIZE = 64
+_POS = struct.Struct("<Q")
+_FLAG = struct.Struct("<I")
+_LENGTH = struct.Struct("<I")
+
+_WRITE_POS = 0
+_READ_POS = 8
+_WAITING = 16
+
+# put(MARKER) writes a frame with this length and no data, get_all() returns
+# MARKER for it: the next record was too big and went on the process queue
+MARKER = None
+_MARKER_LENGTH = 0xFFFFFFFF
+
+# longest the consumer sleeps before looking at the ring again, in case the
+# producer missed the doorbell request
+DOORBELL_TIMEOUT = 0.1
+
+
+class RingBuffer(object):
+    def __init__(self, path, capacity=None):
+        """Open the ring at path, creating it when capacity is given."""
+        if capacity is not None:
+            with open(path, "wb") as f:
+                f.truncate(HEADER_SIZE + capacity)
+        self.path = path
+        self._file = open(path, "r+b")
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+        self._capacity = len(self._mm) - HEADER_SIZE
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    def _load(self, offset, fmt=_POS):
+        return fmt.unpack_from(self._mm, offset)[0]
+
+    def _store(self, offset, value, fmt=_POS):
+        fmt.pack_into(self._mm, offset, value)
+
+    def _copy_in(self, pos, data):
+        start = HEADER_SIZE + pos % self._capacity
+        first = min(len(data), len(self._mm) - start)
+        end = start + first
+        self._mm[start:end] = data[:first]
+        if first < len(data):
+            end = HEADER_SIZE + len(data) - first
+            self._mm[HEADER_SIZE:end] = data[first:]
+
+    def _copy_out(self, pos, size):
+        start = HEADER_SIZE + pos % self._capacity
+        first = min(size, len(self._mm) - start)
+        end = start + first
+        data = self._mm[start:end]
+        if first < size:
+            end = HEADER_SIZE + size - first
+            data += self._mm[HEADER_SIZE:end]
+        return data
+
+    def fits(self, data):
+        return len(data) < _MARKER_LENGTH and _LENGTH.size + len(data) <= self._capacity
+
+    def put(self, data):
+        """Append one frame, returns False if there is not enough room yet."""
+        if data is MARKER:
+            length, data = _MARKER_LENGTH, b""
+        else:
+            length = len(data)
+        size = _LENGTH.size + len(data)
+        write_pos = self._load(_WRITE_POS)
+        if size > self._capacity - (write_pos - self._load(_READ_POS)):
+            return False
+        self._copy_in(write_pos, _LENGTH.pack(length))
+        self._copy_in(write_pos + _LENGTH.size, data)
+        self._store(_WRITE_POS, write_pos + size)
+        return True
+
+    def get_all(self):
+        """Consume every frame published so far."""
+        write_pos = self._load(_WRITE_POS)
+        read_pos = self._load(_READ_POS)
+        frames = []
+        while read_pos < write_pos:
+            length = _LENGTH.unpack(self._copy_out(read_pos, _LENGTH.size))[0]
+            read_pos += _LENGTH.size
+            if length == _MARKER_LENGTH:
+                frames.append(MARKER)
+                continue
+            frames.append(self._copy_out(read_pos, length))
+            read_pos += length
+        self._store(_READ_POS, read_pos)
+        return frames
+
+    def empty(self):
+        return self._load(_WRITE_POS) == self._load(_READ_POS)
+
+    def request_doorbell(self):
+        """Consumer side: ask to be notified, False if frames are already waiting."""
+        self._store(_WAITING, 1, _FLAG)
+        if self.empty():
+            return True
+        self._store(_WAITING, 0, _FLAG)
+        return False
+
+    def take_doorbell(self):
+        """Producer side: True if the consumer is waiting and must be notified."""
+        if not self._load(_WAITING, _FLAG):
+            return False
+        self._store(_WAITING, 0, _FLAG)
+        return True
+
+    @classmethod
+    def create(cls, capacity):
+        shm_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+        fd, path = tempfile.mkstemp(prefix="wandb-ring-", dir=shm_dir)
+        os.close(fd)
+        try:
+            return cls(path, capacity)
+        except Exception:
+            os.remove(path)
+            raise
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def unlink(self):
+        try:
+            os.remove(self.path)
+        except OSError as e:
+            logger.warning("failed to remove ring buffer %s: %s", self.path, e)
@@ -17,10 +17,13 @@ header :=
 """
 from __future__ import print_function
 
+import io
 import logging
+import mmap
 import os
 import struct
 import sys
+import time
 import zlib
 
 import wandb
@@ -44,6 +47,24 @@ LEVELDBLOG_HEADER_MAGIC = (
 )
 LEVELDBLOG_HEADER_VERSION = 0
 
+# what commit() does once the pending blocks are written to the file
+DURABILITY_NONE = "none"  # nothing, data is only written when the buffer fills
+DURABILITY_FLUSH = "flush"  # hand every commit to the OS
+DURABILITY_FSYNC = "fsync"  # also fsync, at most once per fsync_seconds
+DURABILITY_MODES = (DURABILITY_NONE, DURABILITY_FLUSH, DURABILITY_FSYNC)
+
+# pending writes are held in a buffer of this many blocks
+WRITE_BUFFER_BLOCKS = 8
+
+_RECORD_HEADER = struct.Struct("<IHB")
+
+
+class DataStoreCorruptError(Exception):
+    """A record read from a datastore file is damaged."""
+
+    pass
+
+
 try:
     bytes("", "ascii")
 
@@ -60,10 +81,25 @@ except Exception:
 
 
 class DataStore(object):
-    def __init__(self):
+    def __init__(self, durability=DURABILITY_FLUSH, fsync_seconds=1):
+        if durability not in DURABILITY_MODES:
+            raise ValueError("Unknown durability: {}".format(durability))
+        self._durability = durability
+        self._fsync_seconds = fsync_seconds
         self._opened_for_scan = False
         self._fp = None
         self._index = 0
+        self._size = 0
+        self._mm = None
+        self._view = None
+
+        # group commit state, see commit()
+        self._buf = None
+        self._buf_len = 0
+        self._flush_index = 0
+        self._flush_offset = 0
+        self._last_fsync = 0
+        self._unsynced = False
 
         self._crc = [0] * (LEVELDBLOG_LAST + 1)
         for x in range(1, LEVELDBLOG_LAST + 1):
@@ -79,15 +115,67 @@ class DataStore(object):
             open_flags = "wb"
             if os.path.exists(fname):
                 raise IOError("File exists: {}".format(fname))
-        self._fp = open(fname, open_flags)
+        # unbuffered: each commit is a single write of whole blocks
+        self._fp = io.open(fname, open_flags, buffering=0)
+        self._buf = bytearray(LEVELDBLOG_BLOCK_LEN * WRITE_BUFFER_BLOCKS)
+        self._buf_len = 0
         self._write_header()
 
     def open_for_append(self, fname):
-        # TODO: implement
+        """Continue writing an existing file after its last intact record.
+
+        A torn tail left behind by an interrupted write is truncated.  A file
+        too short to hold the header is started over.
+        """
         self._fname = fname
-        logger.info("open: %s", fname)
-        self._fp = open(fname, "wb")
-        # do something with _index
+        logger.info("open for append: %s", fname)
+        if os.path.getsize(fname) < LEVELDBLOG_HEADER_LEN:
+            end = 0
+        else:
+            try:
+                self.open_for_scan(fname)
+                end = self._find_end()
+            finally:
+                self.close()
+                self._opened_for_scan = False
+        self._fp = io.open(fname, "r+b", buffering=0)
+        self._fp.truncate(end)
+        self._fp.seek(end)
+        self._buf = bytearray(LEVELDBLOG_BLOCK_LEN * WRITE_BUFFER_BLOCKS)
+        self._buf_len = 0
+        self._index = end
+        self._flush_offset = end
+        if end == 0:
+            self._write_header()
+
+    def _find_end(self):
+        """Offset just past the last intact record of a file opened for scan."""
+        # every block starts with a record header, walk back to the last block
+        # that starts a record and scan forward from there
+        start = self._index
+        block = self._size // LEVELDBLOG_BLOCK_LEN
+        while block > 0:
+            offset = block * LEVELDBLOG_BLOCK_LEN
+            if offset + LEVELDBLOG_HEADER_LEN <= self._size:
+                dtype = _RECORD_HEADER.unpack_from(self._view, offset)[2]
+                if dtype in (LEVELDBLOG_FULL, LEVELDBLOG_FIRST):
+                    start = offset
+                    break
+            block -= 1
+
+        self._index = end = start
+        while True:
+            try:
+                data = self.scan_data()
+            except DataStoreCorruptError:
+                logger.warning("corrupt record at %d in %s", end, self._fname)
+                break
+            if data is None:
+                break
+            end = self._index
+        if end < self._size:
+            logger.warning("truncating %s at %d", self._fname, end)
+        return end
 
     def open_for_scan(self, fname):
         self._fname = fname
@@ -96,34 +184,76 @@ class DataStore(object):
         self._index = 0
         self._opened_for_scan = True
         self._read_header()
+        self._size = os.fstat(self._fp.fileno()).st_size
+        # an empty mapping is an error, so a header only file is not mapped
+        if self._size > self._index:
+            self._mm = mmap.mmap(self._fp.fileno(), 0, access=mmap.ACCESS_READ)
+            # py2 mmap objects do not support memoryview, slicing them copies
+            self._view = memoryview(self._mm) if PY3 else self._mm
+
+    def tell(self):
+        """File offset of the next record to scan or write."""
+        return self._index
+
+    def seek(self, offset):
+        """Continue scanning at offset, as returned by write() or tell()."""
+        assert self._opened_for_scan
+        assert offset >= LEVELDBLOG_HEADER_LEN
+        self._index = offset
 
     def scan_record(self):
+        """Read the next physical record.
+
+        Returns:
+            (dtype, data) where data is a view into the mapped file, or None
+            at the end of the file (including a record cut short by a crash).
+
+        Raises:
+            DataStoreCorruptError: the record has a bad type or checksum.
+
+        """
         assert self._opened_for_scan
-        # TODO(jhr): handle some assertions as file corruption issues
-        # assume we have enough room to read header, checked by caller?
-        header = self._fp.read(LEVELDBLOG_HEADER_LEN)
-        if len(header) == 0:
+        if self._view is None or self._index >= self._size:
             return None
-        assert len(header) == LEVELDBLOG_HEADER_LEN
-        fields = struct.unpack("<IHB", header)
-        checksum, dlength, dtype = fields
-        # check len, better fit in the block
-        data = self._fp.read(dlength)
+        start = self._index + LEVELDBLOG_HEADER_LEN
+        if start > self._size:
+            logger.warning("truncated record header at %d", self._index)
+            return None
+        checksum, dlength, dtype = _RECORD_HEADER.unpack_from(self._view, self._index)
+        if not LEVELDBLOG_FULL <= dtype <= LEVELDBLOG_LAST:
+            raise DataStoreCorruptError(
+                "bad record type %d at %d" % (dtype, self._index)
+            )
+        end = start + dlength
+        if end > self._size:
+            logger.warning("truncated record at %d", self._index)
+            return None
+        data = self._view[start:end]
         checksum_computed = zlib.crc32(data, self._crc[dtype]) & 0xFFFFFFFF
-        assert checksum == checksum_computed
-        self._index += dlength
+        if checksum != checksum_computed:
+            raise DataStoreCorruptError("bad record checksum at %d" % self._index)
+        self._index = end
         return dtype, data
 
     def scan_data(self):
-        # TODO(jhr): handle some assertions as file corruption issues
+        """Read the next record, reassembling it if it spans blocks.
+
+        Returns:
+            The record data as bytes, or None at the end of the file.
+
+        Raises:
+            DataStoreCorruptError: a record is damaged or out of sequence.
+
+        """
         # how much left in the block.  if less than header len, read as pad,
         offset = self._index % LEVELDBLOG_BLOCK_LEN
         space_left = LEVELDBLOG_BLOCK_LEN - offset
-        if space_left < LEVELDBLOG_HEADER_LEN:
-            pad_check = "\x00" * space_left
-            pad = self._fp.read(space_left)
+        if space_left < LEVELDBLOG_HEADER_LEN and self._view is not None:
+            end = min(self._index + space_left, self._size)
+            pad = self._view[self._index : end]  # noqa: E203
             # verify they are zero
-            assert pad == pad_check
+            if pad != b"\x00" * len(pad):
+                raise DataStoreCorruptError("bad block padding at %d" % self._index)
             self._index += space_left
 
         record = self.scan_record()
@@ -131,20 +261,37 @@ class DataStore(object):
             return None
         dtype, data = record
         if dtype == LEVELDBLOG_FULL:
-            return data
+            return bytes(data)
 
-        assert dtype == LEVELDBLOG_FIRST
+        if dtype != LEVELDBLOG_FIRST:
+            raise DataStoreCorruptError("unexpected record type %d" % dtype)
+        parts = [data]
         while True:
             offset = self._index % LEVELDBLOG_BLOCK_LEN
-            assert offset == 0
+            if offset != 0:
+                raise DataStoreCorruptError(
+                    "record continues mid block at %d" % self._index
+                )
 
-            dtype, new_data = self.scan_record()
+            record = self.scan_record()
+            if record is None:
+                logger.warning("truncated record at end of %s", self._fname)
+                return None
+            dtype, data = record
+            parts.append(data)
             if dtype == LEVELDBLOG_LAST:
-                data += new_data
                 break
-            assert dtype == LEVELDBLOG_MIDDLE
-            data += new_data
-        return None
+            if dtype != LEVELDBLOG_MIDDLE:
+                raise DataStoreCorruptError("unexpected record type %d" % dtype)
+        return b"".join(parts)
+
+    def __iter__(self):
+        """Iterate over the data of each record in a file opened for scan."""
+        while True:
+            data = self.scan_data()
+            if data is None:
+                return
+            yield data
 
     def _write_header(self):
         data = struct.pack(
@@ -154,7 +301,7 @@ class DataStore(object):
             LEVELDBLOG_HEADER_VERSION,
         )
         assert len(data) == 7
-        self._fp.write(data)
+        self._append(data)
         self._index += len(data)
 
     def _read_header(self):
@@ -170,6 +317,14 @@ class DataStore(object):
         assert len(header) == header_length
         self._index += len(header)
 
+    def _append(self, data):
+        end = self._buf_len + len(data)
+        if end > len(self._buf):
+            self._write_buffer()
+            end = len(data)
+        self._buf[self._buf_len : end] = data  # noqa: E203
+        self._buf_len = end
+
     def _write_record(self, s, dtype=None):
         """Write record that must fit into a block."""
         # double check that there is enough space
@@ -182,15 +337,29 @@ class DataStore(object):
         dtype = dtype or LEVELDBLOG_FULL
         # print("record: length={} type={}".format(dlength, dtype))
         checksum = zlib.crc32(s, self._crc[dtype]) & 0xFFFFFFFF
-        self._fp.write(struct.pack("<IHB", checksum, dlength, dtype))
+        if self._buf_len + LEVELDBLOG_HEADER_LEN + dlength > len(self._buf):
+            self._write_buffer()
+        _RECORD_HEADER.pack_into(self._buf, self._buf_len, checksum, dlength, dtype)
+        self._buf_len += LEVELDBLOG_HEADER_LEN
         if dlength:
-            self._fp.write(s)
+            self._append(s)
         self._index += LEVELDBLOG_HEADER_LEN + len(s)
 
+    def _write_buffer(self):
+        """Write the pending data to the file in a single call."""
+        if not self._buf_len:
+            return
+        view = memoryview(self._buf)[: self._buf_len]
+        while len(view):
+            written = self._fp.write(view)
+            view = view[written:]
+        self._buf_len = 0
+        self._unsynced = True
+
     def _write_data(self, s):
         file_offset = self._index
-        flush_index = 0
-        flush_offset = 0
+        flush_index = self._flush_index
+        flush_offset = self._flush_offset
 
         offset = self._index % LEVELDBLOG_BLOCK_LEN
         space_left = LEVELDBLOG_BLOCK_LEN - offset
@@ -198,7 +367,7 @@ class DataStore(object):
         data_left = len(s)
         if space_left < LEVELDBLOG_HEADER_LEN:
             pad = "\x00" * space_left
-            self._fp.write(strtobytes(pad))
+            self._append(strtobytes(pad))
             self._index += space_left
             offset = 0
             space_left = LEVELDBLOG_BLOCK_LEN
@@ -235,9 +404,13 @@ class DataStore(object):
         Args:
             obj: Protocol buffer to write.
 
+        The record is buffered and reaches the file with the next commit().
+
         Returns:
             (file_offset, length, flush_index, flush_offset) if successful,
-            None otherwise
+            None otherwise.  flush_index is the number of the commit that
+            will carry the record and flush_offset the file offset that
+            commit starts at.
 
         """
         raw_size = obj.ByteSize()
@@ -246,7 +419,42 @@ class DataStore(object):
         ret = self._write_data(s)
         return ret
 
+    def commit(self):
+        """End the current group of records.
+
+        Depending on the durability mode the pending blocks are written to the
+        file and fsynced.  Calling it again without new records still fsyncs
+        once fsync_seconds have passed, so the last group is not left behind.
+
+        Returns:
+            The flush_index of the next group.
+
+        """
+        if self._index != self._flush_offset:
+            if self._durability != DURABILITY_NONE:
+                self._write_buffer()
+            self._flush_index += 1
+            self._flush_offset = self._index
+        if self._durability == DURABILITY_FSYNC and self._unsynced:
+            now = time.time()
+            if now - self._last_fsync >= self._fsync_seconds:
+                os.fsync(self._fp.fileno())
+                self._last_fsync = now
+                self._unsynced = False
+        return self._flush_index
+
     def close(self):
+        if self._buf is not None and self._fp is not None:
+            self._write_buffer()
+            if self._durability == DURABILITY_FSYNC and self._unsynced:
+                os.fsync(self._fp.fileno())
+            self._buf = None
+        if self._mm is not None:
+            if self._view is not self._mm:
+                self._view.release()
+            self._view = None
+            self._mm.close()
+            self._mm = None
         if self._fp is not None:
             logger.info("close: %s", self._fname)
             self._fp.close()
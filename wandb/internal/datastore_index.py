@@ -0,0 +1,310 @@
+"""Sidecar index for .wandb files.
+
+The index lives next to the datastore file (with an .idx suffix) and holds one
+fixed size entry per record:
+
+entry :=
+  offset: uint64       // file offset of the record in the datastore
+  step: int64          // history _step, -1 for other records
+  type: uint8          // field number of the record type in Record
+
+header :=
+  ident: char[4]
+  magic: uint16
+  version: uint8
+
+Entries are appended as records are written and flushed when the datastore
+commits them.  The index is not written atomically with the data: with
+durability "none" it runs ahead of the file, and a crash between the two
+commits (or a power loss before the index reaches the disk) leaves it behind.
+A reader drops a partial trailing entry and entries beyond the end of the
+datastore, and picks up records past the last entry by scanning the tail of
+the datastore.  The writer does the same when it reopens a file for append,
+so the index file itself is repaired.
+"""
+
+from __future__ import print_function
+
+import collections
+import io
+import json
+import logging
+import os
+import struct
+import time
+
+from wandb.proto import wandb_internal_pb2  # type: ignore
+
+from . import datastore
+
+logger = logging.getLogger(__name__)
+
+INDEX_SUFFIX = ".idx"
+INDEX_HEADER_IDENT = ":WBI"
+INDEX_HEADER_MAGIC = datastore.LEVELDBLOG_HEADER_MAGIC
+INDEX_HEADER_VERSION = 0
+
+_HEADER = struct.Struct("<4sHB")
+_ENTRY = struct.Struct("<QqB")
+
+NO_STEP = -1
+
+IndexEntry = collections.namedtuple("IndexEntry", ("offset", "step", "record_type"))
+
+_RECORD_FIELDS = wandb_internal_pb2.Record.DESCRIPTOR.oneofs_by_name[
+    "record_type"
+].fields
+_TYPE_NUMBERS = dict((f.name, f.number) for f in _RECORD_FIELDS)
+_TYPE_NAMES = dict((f.number, f.name) for f in _RECORD_FIELDS)
+
+
+def index_path(fname):
+    return fname + INDEX_SUFFIX
+
+
+def _record_step(rec):
+    for item in rec.history.item:
+        if item.key == "_step":
+            try:
+                return int(json.loads(item.value_json))
+            except (ValueError, TypeError):
+                return NO_STEP
+    return NO_STEP
+
+
+def _make_entry(rec, offset):
+    record_type = rec.WhichOneof("record_type")
+    if record_type is None:
+        return None
+    step = _record_step(rec) if record_type == "history" else NO_STEP
+    return IndexEntry(offset, step, record_type)
+
+
+def _scan(fname, offset=None):
+    """Yield (offset, record) for the records of fname, starting at offset."""
+    ds = datastore.DataStore()
+    ds.open_for_scan(fname)
+    try:
+        if offset is not None:
+            ds.seek(offset)
+        while True:
+            offset = ds.tell()
+            try:
+                data = ds.scan_data()
+            except datastore.DataStoreCorruptError as e:
+                logger.warning("stop indexing %s: %s", fname, e)
+                return
+            if data is None:
+                return
+            rec = wandb_internal_pb2.Record()
+            rec.ParseFromString(data)
+            yield offset, rec
+    finally:
+        ds.close()
+
+
+def _missing_entries(fname, entries):
+    """Entries for the records of fname written after the last of entries."""
+    start = entries[-1].offset if entries else None
+    missing = []
+    for offset, rec in _scan(fname, start):
+        if offset == start:
+            continue
+        entry = _make_entry(rec, offset)
+        if entry is not None:
+            missing.append(entry)
+    if missing:
+        logger.info("%d records missing from index of %s", len(missing), fname)
+    return missing
+
+
+class IndexWriter(object):
+    def __init__(self, fname, durability=datastore.DURABILITY_FLUSH, fsync_seconds=1):
+        self._fname = fname
+        self._fp = None
+        self._buf = bytearray()
+        self._fsync = durability == datastore.DURABILITY_FSYNC
+        self._fsync_seconds = fsync_seconds
+        self._last_fsync = 0
+        self._unsynced = False
+
+    def open_for_write(self):
+        logger.info("open index: %s", self._fname)
+        self._fp = io.open(self._fname, "wb", buffering=0)
+        self._fp.write(
+            _HEADER.pack(
+                datastore.strtobytes(INDEX_HEADER_IDENT),
+                INDEX_HEADER_MAGIC,
+                INDEX_HEADER_VERSION,
+            )
+        )
+
+    def open_for_append(self, data_fname, data_size):
+        """Continue an index whose datastore was reopened at data_size.
+
+        Entries for records that did not survive are dropped, records that
+        made it to the datastore but not to the index are added back, and an
+        index that is missing or unusable is rebuilt from the datastore.
+        """
+        entries = read_index(data_fname, data_size)
+        if entries is None and data_size > datastore.LEVELDBLOG_HEADER_LEN:
+            build_index(data_fname)
+            entries = read_index(data_fname, data_size)
+        if entries is None:
+            self.open_for_write()
+            return
+        logger.info("open index for append: %s", self._fname)
+        self._fp = io.open(self._fname, "r+b", buffering=0)
+        end = _HEADER.size + len(entries) * _ENTRY.size
+        self._fp.truncate(end)
+        self._fp.seek(end)
+        for entry in _missing_entries(data_fname, entries):
+            self._add_entry(entry)
+        self.commit()
+
+    def add(self, rec, offset):
+        """Add an entry for rec, written to the datastore at offset."""
+        entry = _make_entry(rec, offset)
+        if entry is not None:
+            self._add_entry(entry)
+
+    def _add_entry(self, entry):
+        self._buf += _ENTRY.pack(
+            entry.offset, entry.step, _TYPE_NUMBERS[entry.record_type]
+        )
+
+    def commit(self):
+        """Write the pending entries, call after the datastore committed.
+
+        With fsync durability the index is fsynced at most once per
+        fsync_seconds, like the datastore.
+        """
+        if self._buf:
+            self._fp.write(bytes(self._buf))
+            self._buf = bytearray()
+            self._unsynced = self._fsync
+        if self._unsynced:
+            now = time.time()
+            if now - self._last_fsync >= self._fsync_seconds:
+                self._sync()
+                self._last_fsync = now
+
+    def _sync(self):
+        os.fsync(self._fp.fileno())
+        self._unsynced = False
+
+    def close(self):
+        if self._fp is not None:
+            self.commit()
+            if self._unsynced:
+                self._sync()
+            logger.info("close index: %s", self._fname)
+            self._fp.close()
+            self._fp = None
+
+
+def read_index(fname, data_size=None):
+    """Read the index for the datastore fname.
+
+    Returns:
+        A list of IndexEntry, or None if there is no usable index.
+
+    """
+    try:
+        with open(index_path(fname), "rb") as f:
+            data = f.read()
+    except (IOError, OSError):
+        return None
+    if len(data) < _HEADER.size:
+        return None
+    ident, magic, version = _HEADER.unpack_from(data)
+    if (
+        ident != datastore.strtobytes(INDEX_HEADER_IDENT)
+        or magic != INDEX_HEADER_MAGIC
+        or version != INDEX_HEADER_VERSION
+    ):
+        logger.warning("Invalid index header: %s", index_path(fname))
+        return None
+    if data_size is None:
+        data_size = os.path.getsize(fname)
+
+    entries = []
+    end = len(data) - _ENTRY.size
+    pos = _HEADER.size
+    last = 0
+    while pos <= end:
+        offset, step, number = _ENTRY.unpack_from(data, pos)
+        pos += _ENTRY.size
+        # offsets only grow, anything else is a tail that never hit the disk
+        if offset >= data_size or offset <= last:
+            break
+        last = offset
+        entries.append(IndexEntry(offset, step, _TYPE_NAMES.get(number)))
+    return entries
+
+
+def build_index(fname):
+    """Write an index for an existing datastore file with a full scan."""
+    writer = IndexWriter(index_path(fname))
+    writer.open_for_write()
+    try:
+        for offset, rec in _scan(fname):
+            writer.add(rec, offset)
+    finally:
+        writer.close()
+
+
+def _entries(fname):
+    entries = read_index(fname)
+    if entries is None:
+        logger.info("building index for %s", fname)
+        build_index(fname)
+        return read_index(fname)
+    # the file may still be written to, leave repairing the index to the writer
+    return entries + _missing_entries(fname, entries)
+
+
+def read_records(fname, entries):
+    """Read the records at the offsets of the given index entries."""
+    ds = datastore.DataStore()
+    ds.open_for_scan(fname)
+    records = []
+    try:
+        for entry in entries:
+            ds.seek(entry.offset)
+            data = ds.scan_data()
+            if data is None:
+                break
+            rec = wandb_internal_pb2.Record()
+            rec.ParseFromString(data)
+            records.append(rec)
+    finally:
+        ds.close()
+    return records
+
+
+def last_records(fname, record_type, n=1):
+    """Return the last n records of record_type, oldest first.
+
+    The index is built (with a single full scan) if the file does not have one.
+    """
+    selected = []
+    for entry in reversed(_entries(fname)):
+        if len(selected) >= n:
+            break
+        if entry.record_type == record_type:
+            selected.append(entry)
+    selected.reverse()
+    return read_records(fname, selected)
+
+
+def last_history(fname, n=1):
+    return last_records(fname, "history", n)
+
+
+def last_step(fname):
+    """The last history _step in the file, or None if there is none."""
+    for entry in reversed(_entries(fname)):
+        if entry.record_type == "history" and entry.step != NO_STEP:
+            return entry.step
+    return None
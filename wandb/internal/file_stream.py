@@ -1,16 +1,20 @@
 import base64
 import binascii
 import collections
+import json
 import logging
 import threading
 import requests
 import time
 import wandb
 import itertools
+import zlib
 from six.moves import queue
 from wandb import util
 from wandb import env
 
+from . import spool
+
 MAX_LINE_SIZE = 4*1024*1024 - 100*1024  # imposed by back end
 
 logger = logging.getLogger(__name__)
@@ -102,6 +106,59 @@ class BinaryFilePolicy(DefaultFilePolicy):
         }
 
 
+def gzip_compress(data, level=1):
+    """Gzip data, zlib.compressobj works the same on py2 and py3."""
+    # wbits 16 + 15: gzip header and trailer, 32K window
+    c = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return c.compress(data) + c.flush()
+
+
+class BatchSizer(object):
+    """Picks the size of file_stream posts from observed throughput.
+
+    Posts should take about target_seconds, so the byte budget follows an
+    exponentially weighted average of bytes/sec over the posts so far,
+    clamped to [min_bytes, max_bytes].
+    """
+
+    def __init__(self, target_seconds=2, min_bytes=64 * 1024, max_bytes=8 * 1024 * 1024, initial_bytes=512 * 1024):
+        self._target_seconds = target_seconds
+        self._min_bytes = min_bytes
+        self._max_bytes = max_bytes
+        self._rate = None
+        self.max_bytes = initial_bytes
+
+    def observe(self, nbytes, seconds):
+        # tiny posts say more about latency than bandwidth, dont let them
+        # shrink the budget of a run that only logs occasionally
+        if nbytes < self.max_bytes / 4 and seconds < self._target_seconds:
+            return
+        rate = nbytes / max(seconds, 1e-3)
+        self._rate = rate if self._rate is None else 0.7 * self._rate + 0.3 * rate
+        budget = int(self._rate * self._target_seconds)
+        self.max_bytes = max(self._min_bytes, min(self._max_bytes, budget))
+
+    def split(self, chunks):
+        """Split chunks, in order, into batches of at most max_bytes.
+
+        A chunk larger than the budget goes out in a batch of its own.
+        """
+        batches = []
+        batch = []
+        batch_bytes = 0
+        for chunk in chunks:
+            size = len(chunk.data)
+            if batch and batch_bytes + size > self.max_bytes:
+                batches.append(batch)
+                batch = []
+                batch_bytes = 0
+            batch.append(chunk)
+            batch_bytes += size
+        if batch:
+            batches.append(batch)
+        return batches
+
+
 class FileStreamApi(object):
     """Pushes chunks of files to our streaming endpoint.
 
@@ -114,11 +171,17 @@ class FileStreamApi(object):
 
     HTTP_TIMEOUT = env.get_http_timeout(10)
     MAX_ITEMS_PER_PUSH = 10000
+    # errors that are not worth retrying, same as request_with_retry
+    FATAL_STATUS_CODES = (400, 403, 404, 409)
 
-    def __init__(self, api, run_id, start_time, settings=None):
+    def __init__(self, api, run_id, start_time, settings=None, compress=False,
+                 max_pending_bytes=64 * 1024 * 1024, spool_dir=None):
         if settings is None:
             settings = dict()
         self._settings = settings
+        self._compress = compress
+        self._sizer = BatchSizer()
+        self._max_pending_bytes = max_pending_bytes
         self._api = api
         self._run_id = run_id
         self._start_time = start_time
@@ -132,10 +195,28 @@ class FileStreamApi(object):
         })
         self._file_policies = {}
         self._queue = queue.Queue()
+        # with a spool, pushed chunks wait on disk instead of in the queue and
+        # failed posts are retried until they go through
+        self._spool = spool.ChunkSpool(spool_dir) if spool_dir else None
+        self._finishing = threading.Event()
+        # batches go from the batching thread to the posting thread through a
+        # one slot queue: one post in flight while the next one is assembled
+        self._post_queue = queue.Queue(maxsize=1)
+
+        # bytes pushed but not posted yet, push() blocks while there are
+        # more than max_pending_bytes
+        self._pending_cond = threading.Condition()
+        self._pending_bytes = 0
+        self._posts = 0
+        self._posted_bytes = 0
+        self._last_latency = 0.0
+
         self._thread = threading.Thread(target=self._thread_body)
         # It seems we need to make this a daemon thread to get sync.py's atexit handler to run, which
         # cleans this thread up.
         self._thread.daemon = True
+        self._post_thread = threading.Thread(target=self._post_thread_body)
+        self._post_thread.daemon = True
         self._init_endpoint()
 
     def _init_endpoint(self):
@@ -150,6 +231,7 @@ class FileStreamApi(object):
     def start(self):
         self._init_endpoint()
         self._thread.start()
+        self._post_thread.start()
 
     def set_default_file_policy(self, filename, file_policy):
         """Set an upload policy for a file unless one has already been set.
@@ -174,60 +256,92 @@ class FileStreamApi(object):
         else:
             return max(5, self.heartbeat_seconds)
 
-    def _read_queue(self):
+    def _read_queue(self, timeout):
         # called from the push thread (_thread_body), this does an initial read
-        # that'll block for up to rate_limit_seconds. Then it tries to read
-        # as much out of the queue as it can. We do this because the http post
-        # to the server happens within _thread_body, and can take longer than
-        # our rate limit. So next time we get a chance to read the queue we want
-        # read all the stuff that queue'd up since last time.
+        # that'll block for up to timeout. Then it tries to read as much out of
+        # the queue as it can, so everything that queued up while we were
+        # waiting for the posting thread goes into the next batch.
         #
-        # If we have more than MAX_ITEMS_PER_PUSH in the queue then the push thread
-        # will get behind and data will buffer up in the queue.
+        # If we have more than MAX_ITEMS_PER_PUSH in the queue the rest is
+        # picked up on the next read.
         return util.read_many_from_queue(
-            self._queue, self.MAX_ITEMS_PER_PUSH, self.rate_limit_seconds())
+            self._queue, self.MAX_ITEMS_PER_PUSH, timeout)
 
     def _thread_body(self):
         posted_data_time = time.time()
         posted_anything_time = time.time()
         ready_chunks = []
+        ready_bytes = 0
         finished = None
         while finished is None:
-            items = self._read_queue()
+            timeout = self.rate_limit_seconds()
+            if ready_chunks and ready_bytes >= self._sizer.max_bytes:
+                # a full batch is waiting for the posting thread
+                timeout = 0.1
+            items = self._read_queue(timeout)
             for item in items:
                 if isinstance(item, self.Finish):
                     finished = item
                 else:
                     # item is Chunk
                     ready_chunks.append(item)
+                    ready_bytes += len(item.data)
+            if self._spool and ready_bytes < self._sizer.max_bytes:
+                spooled = self._read_spool(self._sizer.max_bytes - ready_bytes)
+                ready_chunks.extend(spooled)
+                ready_bytes += sum(len(c.data) for c in spooled)
 
             cur_time = time.time()
 
-            if ready_chunks and (finished or cur_time - posted_data_time > self.rate_limit_seconds()):
-                posted_data_time = cur_time
-                posted_anything_time = cur_time
-                self._send(ready_chunks)
-                ready_chunks = []
-
-            if cur_time - posted_anything_time > self.heartbeat_seconds:
+            # a full batch goes out without waiting for the rate limit
+            if ready_chunks and (finished or ready_bytes >= self._sizer.max_bytes or
+                                 cur_time - posted_data_time > self.rate_limit_seconds()):
+                batches = self._sizer.split(ready_chunks)
+                # only block on the posting thread when finishing, otherwise
+                # keep batching while a post is in flight
+                while batches and (finished or not self._post_queue.full()):
+                    self._post_queue.put(self._make_payload(batches.pop(0)))
+                    posted_data_time = cur_time
+                    posted_anything_time = cur_time
+                ready_chunks = [c for batch in batches for c in batch]
+                ready_bytes = sum(len(c.data) for c in ready_chunks)
+
+            if cur_time - posted_anything_time > self.heartbeat_seconds and \
+                    not self._post_queue.full():
                 posted_anything_time = cur_time
-                self._handle_response(util.request_with_retry(self._client.post,
-                                                              self._endpoint, json={'complete': False, 'failed': False}))
+                self._post_queue.put(({'complete': False, 'failed': False}, 0, None))
+        while self._spool:
+            spooled = self._read_spool(self._sizer.max_bytes)
+            if not spooled:
+                break
+            self._post_queue.put(self._make_payload(spooled))
         # post the final close message. (item is self.Finish instance now)
-        util.request_with_retry(self._client.post,
-                                self._endpoint, json={'complete': True, 'exitcode': int(finished.exitcode)})
-
-    def _handle_response(self, response):
-        """Logs dropped chunks and updates dynamic settings"""
-        if isinstance(response, Exception):
-            raise response
-            wandb.termerror('Droppped streaming file chunk (see wandb/debug.log)')
-            logging.error("dropped chunk %s" % response)
-        elif response.json().get("limits"):
-            parsed = response.json()
-            self._api.dynamic_settings.update(parsed["limits"])
-
-    def _send(self, chunks):
+        self._post_queue.put(finished)
+
+    def _read_spool(self, max_bytes):
+        chunks = self._spool.read(max_bytes)
+        with self._pending_cond:
+            self._pending_bytes += sum(len(c.data) for c in chunks)
+        return chunks
+
+    def _post_thread_body(self):
+        while True:
+            item = self._post_queue.get()
+            if isinstance(item, self.Finish):
+                self._post({'complete': True, 'exitcode': int(item.exitcode)})
+                return
+            try:
+                self._post_payload(*item)
+            except Exception as e:
+                # keep posting, a dead posting thread would stall finish()
+                logger.error('dropped file_stream post: %s', e)
+
+    def _make_payload(self, chunks):
+        """Build the json payload for chunks.
+
+        Returns:
+            (payload, number of bytes, spool offsets to acknowledge once posted)
+        """
         # create files dict. dict of <filename: chunks> pairs where chunks is a list of
         # [chunk_id, chunk_data] tuples (as lists since this will be json).
         files = {}
@@ -241,9 +355,95 @@ class FileStreamApi(object):
                 file_chunks)
             if not files[filename]:
                 del files[filename]
+        acks = None
+        if self._spool:
+            acks = dict((c.filename, c.end) for c in chunks if isinstance(c, spool.SpooledChunk))
+        return {'files': files}, sum(len(c.data) for c in chunks), acks
+
+    def _retry_later(self, response):
+        """True if a failed post might still go through."""
+        if not isinstance(response, Exception):
+            return False
+        if isinstance(response, requests.exceptions.HTTPError):
+            return response.response.status_code not in self.FATAL_STATUS_CODES
+        return True
+
+    def _post_payload(self, payload, nbytes, acks=None):
+        start = time.time()
+        try:
+            response = self._post(payload)
+            # the data is safe in the spool, keep trying through an outage
+            # (request_with_retry backs off) unless we are shutting down
+            while acks and self._retry_later(response) and not self._finishing.is_set():
+                logger.warning('file_stream post failed, retrying: %s', response)
+                response = self._post(payload)
+            if acks and not self._retry_later(response):
+                self._spool.ack(acks)
+        finally:
+            latency = time.time() - start
+            with self._pending_cond:
+                self._pending_bytes -= nbytes
+                self._pending_cond.notify_all()
+        if nbytes:
+            self._sizer.observe(nbytes, latency)
+            self._last_latency = latency
+            self._posts += 1
+            self._posted_bytes += nbytes
+        self._handle_response(response)
+
+    def _post(self, payload):
+        """Post payload to the endpoint, gzipped if enabled.
+
+        Returns:
+            The response, or the exception from request_with_retry.
+        """
+        if not self._compress:
+            return util.request_with_retry(self._client.post, self._endpoint, json=payload)
+        body = gzip_compress(json.dumps(payload).encode('utf-8'))
+        response = util.request_with_retry(
+            self._client.post, self._endpoint, data=body,
+            headers={'Content-Type': 'application/json', 'Content-Encoding': 'gzip'})
+        if self._gzip_rejected(response):
+            # the server could not read the compressed body, stop sending them
+            logger.warning('file_stream rejected gzip body (%s), sending uncompressed',
+                           response.response.status_code)
+            self._compress = False
+            return self._post(payload)
+        return response
+
+    def _gzip_rejected(self, response):
+        """True if a failed post was refused because of its Content-Encoding.
+
+        That is a 415, or a 400 that blames the encoding.  Other errors are
+        about the payload and say nothing about gzip support.
+        """
+        if not isinstance(response, requests.exceptions.HTTPError) or \
+                response.response is None:
+            return False
+        status = response.response.status_code
+        if status == 415:
+            return True
+        if status != 400:
+            return False
+        text = (getattr(response.response, 'text', None) or '').lower()
+        return any(word in text for word in ('gzip', 'encoding', 'decompress'))
 
-        self._handle_response(util.request_with_retry(
-            self._client.post, self._endpoint, json={'files': files}))
+    def _handle_response(self, response):
+        """Logs dropped chunks and updates dynamic settings"""
+        if isinstance(response, Exception):
+            raise response
+            wandb.termerror('Droppped streaming file chunk (see wandb/debug.log)')
+            logging.error("dropped chunk %s" % response)
+        elif response.json().get("limits"):
+            parsed = response.json()
+            self._api.dynamic_settings.update(parsed["limits"])
+
+    def _send(self, chunks):
+        """Post chunks right away from the calling thread."""
+        payload, nbytes, acks = self._make_payload(chunks)
+        with self._pending_cond:
+            self._pending_bytes += nbytes
+        self._post_payload(payload, nbytes, acks)
 
     def stream_file(self, path):
         name = path.split("/")[-1]
@@ -258,8 +458,38 @@ class FileStreamApi(object):
             chunk_id: TODO: change to 'offset'
             chunk: File data.
         """
+        if self._spool:
+            self._spool.append(filename, data)
+            return
+        with self._pending_cond:
+            # backpressure: wait for posts to catch up, unless posting stopped
+            while self._pending_bytes > self._max_pending_bytes and \
+                    self._post_thread.is_alive():
+                self._pending_cond.wait(1)
+            self._pending_bytes += len(data)
         self._queue.put(Chunk(filename, data))
 
+    def stats(self):
+        """Counters showing whether streaming is keeping up.
+
+        Returns:
+            dict with queue_depth (chunks not batched yet), pending_bytes
+            (pushed but not posted), last_latency (seconds the last post
+            took), posts and posted_bytes.
+        """
+        with self._pending_cond:
+            pending_bytes = self._pending_bytes
+        if self._spool:
+            # everything in memory is also still in the spool
+            pending_bytes = self._spool.pending_bytes()
+        return {
+            'queue_depth': self._queue.qsize(),
+            'pending_bytes': pending_bytes,
+            'last_latency': self._last_latency,
+            'posts': self._posts,
+            'posted_bytes': self._posted_bytes,
+        }
+
     def finish(self, exitcode):
         """Cleans up.
 
@@ -268,5 +498,9 @@ class FileStreamApi(object):
         Args:
             exitcode: The exitcode of the watched process.
         """
+        self._finishing.set()
         self._queue.put(self.Finish(exitcode))
         self._thread.join()
+        self._post_thread.join()
+        if self._spool:
+            self._spool.close()
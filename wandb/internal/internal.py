@@ -18,9 +18,11 @@ import psutil  # type: ignore
 import six
 from six.moves import queue
 import wandb
-from wandb.interface import constants
+from wandb.interface import batch, constants, ringbuffer
 from wandb.internal import datastore
+from wandb.internal import datastore_index
 from wandb.internal import sender
+from wandb.proto import wandb_internal_pb2  # type: ignore
 from wandb.util import sentry_exc
 
 # from wandb.stuff import io_wrap
@@ -100,17 +102,60 @@ def wandb_stream_read(fd):
     # print("done reading", file=sys.stderr)
 
 
+def _write_record(ds, index, rec):
+    offset = ds.write(rec)[0]
+    if index:
+        index.add(rec, offset)
+
+
+def _write_pending(ds, index, q):
+    """Write everything already queued, then commit it as one group."""
+    while True:
+        try:
+            i = q.get_nowait()
+        except queue.Empty:
+            break
+        _write_record(ds, index, i)
+    ds.commit()
+    if index:
+        index.commit()
+
+
 def wandb_write(settings, q, stopped):
-    ds = datastore.DataStore()
-    ds.open_for_write(settings.sync_file)
+    ds = datastore.DataStore(
+        durability=settings._sync_file_durability,
+        fsync_seconds=settings._sync_file_fsync_seconds,
+    )
+    # a sync_file_spec without a timespec lets a restarted run continue its log
+    append = os.path.exists(settings.sync_file)
+    if append:
+        ds.open_for_append(settings.sync_file)
+    else:
+        ds.open_for_write(settings.sync_file)
+    index = None
+    if settings._sync_file_index:
+        index = datastore_index.IndexWriter(
+            datastore_index.index_path(settings.sync_file),
+            durability=settings._sync_file_durability,
+            fsync_seconds=settings._sync_file_fsync_seconds,
+        )
+        if append:
+            index.open_for_append(settings.sync_file, ds.tell())
+        else:
+            index.open_for_write()
     while not stopped.isSet():
         try:
             i = q.get(timeout=1)
         except queue.Empty:
+            # lets an interval fsync catch up with the last group
+            ds.commit()
             continue
-        ds.write(i)
-        # print("write", i)
+        _write_record(ds, index, i)
+        _write_pending(ds, index, q)
+    _write_pending(ds, index, q)
     ds.close()
+    if index:
+        index.close()
 
 
 def wandb_read(settings, q, data_q, stopped):
@@ -136,6 +181,8 @@ def wandb_send(
         try:
             i = q.get(timeout=1)
         except queue.Empty:
+            # nothing new arrived, make sure coalesced summary updates go out
+            sh.flush_summary_if_due()
             continue
 
         sh.send(i)
@@ -143,6 +190,17 @@ def wandb_send(
     sh.finish()
 
 
+def _drain_ring(ring, process_q, send_q, write_q):
+    for data in ring.get_all():
+        if data is ringbuffer.MARKER:
+            rec = process_q.get()
+        else:
+            rec = wandb_internal_pb2.Record()
+            rec.ParseFromString(data)
+        send_q.put(rec)
+        write_q.put(rec)
+
+
 class WriteSerializingFile(object):
     """Wrapper for a file object that serializes writes.
     """
@@ -225,6 +283,7 @@ def wandb_internal(  # noqa: C901
     child_pipe,
     log_level,
     use_redirect,
+    ring_path=None,
 ):
     parent_pid = os.getppid()
 
@@ -339,24 +398,41 @@ def wandb_internal(  # noqa: C901
     send_thread.start()
     write_thread.start()
 
+    ring = None
+    queue_timeout = settings._internal_queue_timeout
+    if ring_path:
+        ring = ringbuffer.RingBuffer(ring_path)
+        # a lost doorbell only delays the records in the ring this long
+        queue_timeout = min(queue_timeout, ringbuffer.DOORBELL_TIMEOUT)
+
     done = False
     while not done:
         count = 0
         # TODO: think about this try/except clause
         try:
             while True:
-                try:
-                    i = notify_queue.get(
-                        block=True, timeout=settings._internal_queue_timeout
-                    )
-                except queue.Empty:
-                    i = queue.Empty
-                if i == queue.Empty:
+                if ring and not ring.request_doorbell():
+                    # records arrived since the last drain, dont wait on the queue
+                    i = constants.NOTIFY_PROCESS_RING
+                else:
+                    try:
+                        i = notify_queue.get(block=True, timeout=queue_timeout)
+                    except queue.Empty:
+                        i = queue.Empty
+                if ring:
+                    # ring records were sent before whatever woke us up
+                    _drain_ring(ring, process_queue, send_queue, write_queue)
+                if i == queue.Empty or i == constants.NOTIFY_PROCESS_RING:
                     pass
                 elif i == constants.NOTIFY_PROCESS:
                     rec = process_queue.get()
                     send_queue.put(rec)
                     write_queue.put(rec)
+                elif i == constants.NOTIFY_PROCESS_BATCH:
+                    data = process_queue.get()
+                    for rec in batch.decode_records(data):
+                        send_queue.put(rec)
+                        write_queue.put(rec)
                 elif i == constants.NOTIFY_SHUTDOWN:
                     # make sure queue is empty?
                     stopped.set()
@@ -386,3 +462,5 @@ def wandb_internal(  # noqa: C901
     read_thread.join()
     send_thread.join()
     write_thread.join()
+    if ring:
+        ring.close()
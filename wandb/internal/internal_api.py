@@ -15,6 +15,7 @@ import socket
 import time
 import sys
 import random
+import threading
 import traceback
 
 if os.name == 'posix' and sys.version_info[0] < 3:
@@ -38,11 +39,31 @@ from wandb.errors.error import CommError, UsageError
 from wandb.lib.filenames import DIFF_FNAME, METADATA_FNAME
 
 from .file_stream import FileStreamApi
-from .progress import Progress
+from .progress import Progress, ProgressRange
 
 logger = logging.getLogger(__name__)
 
 
+def _persisted_bytes(response):
+    """Bytes persisted by a resumable upload session, from its 308 response."""
+    # "Range: bytes=0-<last byte>", missing when nothing was persisted yet
+    match = re.match(r'bytes=0-(\d+)$', response.headers.get('Range', ''))
+    return int(match.group(1)) + 1 if match else 0
+
+
+def _is_resumable_session(url, response=None):
+    """Whether url is a resumable upload session, which takes ranged PUTs.
+
+    A PUT to a plain signed url replaces the object, so resuming is only
+    tried for urls of resumable sessions (GCS's have an upload_id or
+    uploadType=resumable), or once the storage answered like one, with a 308.
+    """
+    query = six.moves.urllib.parse.parse_qs(six.moves.urllib.parse.urlparse(url).query)
+    if 'upload_id' in query or query.get('uploadType') == ['resumable']:
+        return True
+    return response is not None and response.status_code == 308
+
+
 class Api(object):
     """W&B Internal Api wrapper
 
@@ -59,6 +80,15 @@ class Api(object):
     """
 
     HTTP_TIMEOUT = env.get_http_timeout(10)
+    # Connections kept open to storage, one per concurrent upload
+    UPLOAD_POOL_SIZE = 64
+    # Failed uploads of files this big are resumed from the bytes the storage
+    # already has, when the upload url is a resumable upload session
+    RESUMABLE_UPLOAD_MIN_BYTES = 8 * 1024 * 1024
+    # Resumed uploads are sent in chunks of this many bytes, a multiple of 256 KiB
+    RESUMABLE_CHUNK_BYTES = 64 * 1024 * 1024
+    RESUMABLE_UPLOAD_RETRIES = 8
+    RESUMABLE_RETRY_SECONDS = 1
 
     def __init__(self, default_settings=None, load_settings=True, retry_timedelta=datetime.timedelta(days=1), environ=os.environ):
         self._environ = environ
@@ -101,6 +131,8 @@ class Api(object):
                                retryable_exceptions=(RetryError, requests.RequestException))
         self._current_run_id = None
         self._file_stream_api = None
+        self._upload_session = None
+        self._upload_session_lock = threading.Lock()
 
     def reauth(self):
         """Ensures the current api key is set in the transport"""
@@ -979,6 +1011,19 @@ class Api(object):
 
         return path, response
 
+    @property
+    def upload_session(self):
+        """requests.Session shared by the upload threads, so they reuse connections"""
+        with self._upload_session_lock:
+            if self._upload_session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=self.UPLOAD_POOL_SIZE, pool_maxsize=self.UPLOAD_POOL_SIZE)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._upload_session = session
+            return self._upload_session
+
     def upload_file(self, url, file, callback=None, extra_headers={}):
         """Uploads a file to W&B with failure resumption
 
@@ -997,19 +1042,87 @@ class Api(object):
         if progress.len == 0:
             raise CommError("%s is an empty file" % file.name)
         try:
-            response = requests.put(
+            response = self.upload_session.put(
                 url, data=progress, headers=extra_headers)
             response.raise_for_status()
         except requests.exceptions.RequestException as e:
             status_code = e.response.status_code if e.response != None else 0
             # Retry errors from cloud storage or local network issues
             if status_code in (308, 409, 429, 500, 502, 503, 504) or isinstance(e, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+                if progress.len >= self.RESUMABLE_UPLOAD_MIN_BYTES and \
+                        _is_resumable_session(url, e.response):
+                    resumed = self._resume_upload(url, file, progress, extra_headers)
+                    if resumed is not None:
+                        return resumed
                 util.sentry_reraise(retry.TransientException(exc=e))
             else:
                 util.sentry_reraise(e)
 
         return response
 
+    def _resume_upload(self, url, file, progress, extra_headers):
+        """Finish an interrupted upload, starting from the bytes the storage has.
+
+        This works with resumable upload sessions (like GCS's), which answer a
+        PUT of "Content-Range: bytes */<size>" with a 308 and the range they
+        persisted, or with a 200 once the upload is complete. The rest of the
+        file is then sent in chunks, asking for the persisted range again after
+        each failure. When every byte arrived but the session wasn't
+        finalized, a final empty PUT completes it. Only call this for urls
+        _is_resumable_session accepts, the status query would empty a plain
+        upload url's object.
+
+        Returns:
+            The response that completed the upload, or None when the session
+            is gone or the upload kept failing, in which case it has to be
+            restarted from the beginning.
+        """
+        total = progress.len
+        # the md5 and length headers describe the whole file, not a chunk
+        headers = dict((k, v) for k, v in extra_headers.items()
+                       if k.lower() not in ('content-md5', 'content-length'))
+        offset = None
+        failures = 0
+        while failures <= self.RESUMABLE_UPLOAD_RETRIES:
+            try:
+                if offset is None or offset >= total:
+                    # ask for the persisted range, this also finalizes a
+                    # session that has every byte
+                    response = self.upload_session.put(url, data=b'', headers=dict(
+                        headers, **{'Content-Range': 'bytes */%d' % total}))
+                else:
+                    end = min(offset + self.RESUMABLE_CHUNK_BYTES, total) - 1
+                    file.seek(offset)
+                    progress.bytes_read = offset
+                    response = self.upload_session.put(
+                        url, data=ProgressRange(progress, end + 1 - offset),
+                        headers=dict(headers, **{'Content-Range': 'bytes %d-%d/%d' % (offset, end, total)}))
+                if response.status_code in (200, 201):
+                    logger.info('resumed upload to %s complete', url)
+                    return response
+                if response.status_code == 308:
+                    persisted = _persisted_bytes(response)
+                    if offset is None:
+                        logger.info('resuming upload to %s at byte %d of %d', url, persisted, total)
+                    elif persisted > offset:
+                        failures = 0
+                    else:
+                        # the chunk was dropped or the session wasn't
+                        # finalized, send it again
+                        failures += 1
+                    offset = persisted
+                    continue
+                if offset is None and response.status_code not in (429, 500, 502, 503, 504):
+                    # the session expired or was cancelled
+                    return None
+                logger.info('resumable upload to %s failed: %d', url, response.status_code)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                logger.info('resumable upload to %s failed: %s', url, e)
+            offset = None
+            failures += 1
+            time.sleep(self.RESUMABLE_RETRY_SECONDS * min(2 ** failures, 32))
+        return None
+
     upload_file_retry = normalize_exceptions(retry.retriable(num_retries=5)(upload_file))
 
     @normalize_exceptions
@@ -53,3 +53,33 @@ class Progress(object):
         return bites
 
     next = __next__
+
+
+class ProgressRange(object):
+    """The next length bytes of a Progress, as a request body.
+
+    Progress still reports the bytes read and checks the file didn't shrink.
+    """
+
+    def __init__(self, progress, length):
+        self.progress = progress
+        self.len = length
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        bites = self.progress.read(size) if size else b""
+        self.remaining -= len(bites)
+        return bites
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        bites = self.read(Progress.ITER_BYTES)
+        if len(bites) == 0:
+            raise StopIteration
+        return bites
+
+    next = __next__
@@ -32,6 +32,7 @@ from wandb.util import sentry_set_scope
 from . import artifacts
 from . import file_stream
 from . import internal_api
+from . import summary
 from . import tb_watcher
 from .file_pusher import FilePusher
 from .git_repo import GitRepo
@@ -89,7 +90,15 @@ class SendManager(object):
 
         # keep track of config and summary from key/val updates
         # self._consolidated_config = dict()
-        self._consolidated_summary = dict()
+        # settings built by wandb sync only have a few keys, use the
+        # SummaryManager defaults for the flush settings they don't have
+        self._summary = summary.SummaryManager(
+            os.path.join(self._settings.files_dir, SUMMARY_FNAME),
+            flush_seconds=getattr(self._settings, "_summary_flush_seconds", 1),
+            flush_steps=getattr(self._settings, "_summary_flush_steps", None),
+            on_flush=self._on_summary_flush,
+        )
+        self._summary_saved = False
 
     def send(self, record):
         record_type = record.WhichOneof("record_type")
@@ -137,6 +146,10 @@ class SendManager(object):
                     )
                 except Exception as e:
                     logger.warning("Failed to check stop requested status: %s", e)
+        if self._fs:
+            status_resp.file_stream.SetInParent()
+            for key, value in six.iteritems(self._fs.stats()):
+                setattr(status_resp.file_stream, key, value)
         self._resp_q.put(result)
 
     def handle_tbdata(self, data):
@@ -184,6 +197,9 @@ class SendManager(object):
     def handle_request_defer(self, data):
         logger.info("handle defer")
 
+        # write out any coalesced summary before the final file uploads
+        self._summary.flush()
+
         if self._dir_watcher:
             self._dir_watcher.finish()
             self._dir_watcher = None
@@ -345,8 +361,19 @@ class SendManager(object):
 
         # Only spin up our threads on the first run message
         if is_wandb_init:
+            spool_dir = None
+            if self._settings._file_stream_spool and self._settings.sync_file:
+                spool_dir = os.path.join(
+                    os.path.dirname(self._settings.sync_file), "file_stream"
+                )
             self._fs = file_stream.FileStreamApi(
-                self._api, run.run_id, start_time, settings=self._api_settings
+                self._api,
+                run.run_id,
+                start_time,
+                settings=self._api_settings,
+                compress=self._settings._file_stream_gzip,
+                max_pending_bytes=self._settings._file_stream_max_pending_bytes,
+                spool_dir=spool_dir,
             )
             # Ensure the streaming polices have the proper offsets
             self._fs.set_file_policy(
@@ -383,28 +410,28 @@ class SendManager(object):
             self._fs.push(HISTORY_FNAME, json.dumps(history_dict))
             # print("got", x)
         # save history into summary
-        self._consolidated_summary.update(history_dict)
-        self._save_summary(self._consolidated_summary)
+        self._summary.update(history_dict)
 
     def handle_history(self, data):
         history = data.history
         history_dict = dict_from_proto_list(history.item)
         self._save_history(history_dict)
 
-    def _save_summary(self, summary_dict):
-        json_summary = json.dumps(summary_dict)
+    def _on_summary_flush(self, json_summary):
         if self._fs:
             self._fs.push(SUMMARY_FNAME, json_summary)
-        summary_path = os.path.join(self._settings.files_dir, SUMMARY_FNAME)
-        with open(summary_path, "w") as f:
-            f.write(json_summary)
+        # the summary file only needs its upload policy registered once
+        if self._dir_watcher and not self._summary_saved:
+            self._summary_saved = True
             self._save_file(SUMMARY_FNAME)
 
     def handle_summary(self, data):
         summary = data.summary
         summary_dict = dict_from_proto_list(summary.update)
-        self._consolidated_summary.update(summary_dict)
-        self._save_summary(self._consolidated_summary)
+        self._summary.update(summary_dict)
+
+    def flush_summary_if_due(self):
+        self._summary.flush_if_due()
 
     def handle_stats(self, data):
         stats = data.stats
@@ -491,7 +518,7 @@ class SendManager(object):
 
     def handle_request_get_summary(self, data):
         result = wandb_internal_pb2.Result(uuid=data.uuid)
-        for key, value in six.iteritems(self._consolidated_summary):
+        for key, value in six.iteritems(self._summary.summary):
             item = wandb_internal_pb2.SummaryItem()
             item.key = key
             item.value_json = json.dumps(value)
@@ -502,6 +529,7 @@ class SendManager(object):
         logger.info("shutting down sender")
         if self._tb_watcher:
             self._tb_watcher.finish()
+        self._summary.flush()
         if self._dir_watcher:
             self._dir_watcher.finish()
         if self._pusher:
@@ -0,0 +1,192 @@
+"""Disk spool for file_stream chunks.
+
+Chunks pushed to file_stream are appended to one spool file per streamed
+file, each record being the utf-8 data prefixed with its length as a little
+endian uint32.  Per file we keep three offsets:
+
+    ack <= read <= write
+
+Offsets are logical, they keep growing when the start of the file is cut
+away, so acknowledging a batch read before that still works.
+
+Records before ack have been posted, records between ack and read are in a
+batch that is being posted, and records after read are still waiting.
+
+A spool file is written as a series of segments of about SEGMENT_BYTES, each
+starting at a logical offset.  Segments that are entirely acknowledged are
+deleted, and the last one is truncated once everything is acknowledged, so
+the spool does not grow with the run and nothing is ever copied.
+"""
+
+from __future__ import print_function
+
+import collections
+import logging
+import os
+import struct
+import threading
+
+import six
+
+logger = logging.getLogger(__name__)
+
+_LENGTH = struct.Struct("<I")
+
+# a new segment is started once the current one would grow past this
+SEGMENT_BYTES = 16 * 1024 * 1024
+
+SpooledChunk = collections.namedtuple("SpooledChunk", ("filename", "data", "end"))
+
+
+class _Segment(object):
+    def __init__(self, path, start):
+        self.path = path
+        self.fp = open(path, "w+b")
+        # logical offsets of the records in this segment
+        self.start = start
+        self.end = start
+
+
+class _SpoolFile(object):
+    def __init__(self, prefix):
+        self._prefix = prefix
+        self._count = 0
+        self.segments = collections.deque()
+        self.ack = 0
+        self.read = 0
+        self.write = 0
+        self._reading = None
+        self._add_segment()
+
+    def _add_segment(self):
+        path = "%s.%d.spool" % (self._prefix, self._count)
+        self._count += 1
+        self.segments.append(_Segment(path, self.write))
+
+    def append(self, data):
+        segment = self.segments[-1]
+        size = _LENGTH.size + len(data)
+        if (
+            segment.end > segment.start
+            and segment.end - segment.start + size > SEGMENT_BYTES
+        ):
+            self._add_segment()
+            segment = self.segments[-1]
+        segment.fp.seek(segment.end - segment.start)
+        segment.fp.write(_LENGTH.pack(len(data)))
+        segment.fp.write(data)
+        # readers use the same handle, this only hands data to the OS
+        segment.fp.flush()
+        segment.end += size
+        self.write = segment.end
+
+    def next_length(self):
+        """Length of the record at the read offset, leaving its segment at its data."""
+        for segment in self.segments:
+            if segment.start <= self.read < segment.end:
+                break
+        self._reading = segment
+        segment.fp.seek(self.read - segment.start)
+        (length,) = _LENGTH.unpack(segment.fp.read(_LENGTH.size))
+        return length
+
+    def take(self, length):
+        """Read the record next_length was called for."""
+        data = self._reading.fp.read(length)
+        self.read += _LENGTH.size + length
+        return data
+
+    def acknowledge(self, end):
+        self.ack = max(self.ack, end)
+        while len(self.segments) > 1 and self.segments[0].end <= self.ack:
+            segment = self.segments.popleft()
+            segment.fp.close()
+            os.remove(segment.path)
+        segment = self.segments[-1]
+        if self.ack == self.write and segment.end > segment.start:
+            segment.fp.truncate(0)
+            segment.start = segment.end = self.write
+
+    def close(self):
+        for segment in self.segments:
+            segment.fp.close()
+        if self.ack == self.write:
+            for segment in self.segments:
+                os.remove(segment.path)
+        else:
+            logger.warning(
+                "file_stream spool %s kept with %d unsent bytes",
+                self.segments[0].path,
+                self.write - self.ack,
+            )
+
+
+class ChunkSpool(object):
+    def __init__(self, directory):
+        self._directory = directory
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self._lock = threading.Lock()
+        self._files = collections.OrderedDict()
+
+    def _file(self, filename):
+        spool_file = self._files.get(filename)
+        if spool_file is None:
+            prefix = os.path.join(self._directory, str(len(self._files)))
+            spool_file = self._files[filename] = _SpoolFile(prefix)
+        return spool_file
+
+    def append(self, filename, data):
+        if isinstance(data, six.text_type):
+            data = data.encode("utf-8")
+        with self._lock:
+            self._file(filename).append(data)
+
+    def read(self, max_bytes):
+        """Take up to max_bytes of waiting chunks, at least one if any wait.
+
+        Files take turns, one chunk at a time, so a backlog in one of them
+        doesn't hold up the others.
+
+        Returns:
+            A list of SpooledChunk, pass their end offsets to ack() once
+            they have been posted.
+        """
+        chunks = []
+        nbytes = 0
+        with self._lock:
+            waiting = [
+                (filename, spool_file)
+                for filename, spool_file in six.iteritems(self._files)
+                if spool_file.read < spool_file.write
+            ]
+            while waiting:
+                for item in list(waiting):
+                    filename, spool_file = item
+                    length = spool_file.next_length()
+                    if chunks and nbytes + length > max_bytes:
+                        # smaller chunks of other files may still fit
+                        waiting.remove(item)
+                        continue
+                    data = spool_file.take(length).decode("utf-8")
+                    chunks.append(SpooledChunk(filename, data, spool_file.read))
+                    nbytes += length
+                    if spool_file.read == spool_file.write:
+                        waiting.remove(item)
+        return chunks
+
+    def ack(self, offsets):
+        """Drop records up to the given end offset for each file."""
+        with self._lock:
+            for filename, end in six.iteritems(offsets):
+                self._files[filename].acknowledge(end)
+
+    def pending_bytes(self):
+        """Bytes spooled but not acknowledged yet."""
+        with self._lock:
+            return sum(f.write - f.ack for f in self._files.values())
+
+    def close(self):
+        with self._lock:
+            for spool_file in self._files.values():
+                spool_file.close()
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+summary.
+"""
+
+import json
+import logging
+import time
+
+import six
+from wandb.lib import filesystem
+
+
+logger = logging.getLogger(__name__)
+
+
+class SummaryManager(object):
+    """Keeps the consolidated run summary and persists it at a bounded rate.
+
+    Every key keeps its own cached json fragment so an update only encodes the
+    keys that changed.  Updates are coalesced until `flush_seconds` have passed
+    since the last flush (or `flush_steps` updates are pending, if set), then the
+    summary is assembled from the cached fragments, written atomically to
+    `path` and handed to `on_flush`.
+    """
+
+    def __init__(self, path, flush_seconds=1, flush_steps=None, on_flush=None):
+        self._path = path
+        self._flush_seconds = flush_seconds
+        self._flush_steps = flush_steps
+        self._on_flush = on_flush
+
+        self._summary = dict()
+        self._encoded = dict()
+        self._dirty = set()
+        self._pending = 0
+        self._last_flush = None
+
+    @property
+    def summary(self):
+        return self._summary
+
+    @property
+    def dirty(self):
+        return bool(self._dirty)
+
+    def update(self, summary_dict):
+        for k, v in six.iteritems(summary_dict):
+            if k not in self._encoded:
+                # reserve the slot so fragments keep the summary's key order
+                self._encoded[k] = None
+            self._summary[k] = v
+            self._dirty.add(k)
+        self._pending += 1
+        self.flush_if_due()
+
+    def flush_if_due(self):
+        if not self._dirty:
+            return False
+        due = self._last_flush is None
+        if self._flush_steps and self._pending >= self._flush_steps:
+            due = True
+        if time.time() - (self._last_flush or 0) >= self._flush_seconds:
+            due = True
+        if due:
+            self.flush()
+        return due
+
+    def flush(self):
+        if not self._dirty:
+            return None
+        for k in self._dirty:
+            self._encoded[k] = "{}: {}".format(
+                json.dumps(k), json.dumps(self._summary[k])
+            )
+        self._dirty = set()
+        self._pending = 0
+        self._last_flush = time.time()
+
+        json_summary = "{" + ", ".join(six.itervalues(self._encoded)) + "}"
+        filesystem.atomic_write(self._path, json_summary)
+        if self._on_flush:
+            self._on_flush(json_summary)
+        return json_summary
@@ -2,6 +2,8 @@
 tensor b watcher.
 """
 
+import heapq
+import itertools
 import json
 import os
 import threading
@@ -14,9 +16,13 @@ from wandb import data_types
 from wandb import util
 from wandb.util import json_dumps_safer_history
 
+from . import tfevents
+
 
 # Give some time for tensorboard data to be flushed
 SHUTDOWN_DELAY = 5
+# How often logdirs are checked for new events
+POLL_SECONDS = 1
 
 
 def _link_and_save_file(path, base_path=None, sender=None):
@@ -38,14 +44,57 @@ def _link_and_save_file(path, base_path=None, sender=None):
     sender._save_file(file_name, policy="live")
 
 
+def _history_value(v):
+    """Convert a value the way a round trip through json_dumps_safer_history
+    would, without encoding it for the common types tf summaries have"""
+    if v is None or isinstance(v, (bool, float, six.integer_types, six.text_type)):
+        return v
+    if util.is_numpy_array(v):
+        if v.size == 1:
+            return v.flatten()[0].item()
+        elif v.size <= 32:
+            return v.tolist()
+    elif util.np and isinstance(v, util.np.generic):
+        return v.item()
+    elif isinstance(v, (list, tuple)):
+        return [_history_value(i) for i in v]
+    elif isinstance(v, dict) and all(isinstance(k, six.string_types) for k in v):
+        return {k: _history_value(i) for k, i in six.iteritems(v)}
+    return json.loads(json_dumps_safer_history(v))
+
+
+def history_row(row):
+    """Convert the values tf_summary_to_dict returns to a history row"""
+    data = {}
+    for k, v in six.iteritems(row):
+        if v is None:
+            continue
+        if isinstance(v, data_types.Histogram):
+            v = v.to_json()
+        elif isinstance(v, data_types.WBValue):
+            # TODO(jhr): support more wandb data types
+            continue
+        data[k] = _history_value(v)
+    return data
+
+
 class TBWatcher(object):
+    """Follows the tfevents files in the logdirs it's given.
+
+    One poller thread reads whatever was appended to any of them every
+    POLL_SECONDS and queues the events for the consumer.
+    """
+
     def __init__(self, settings, sender=None):
         self._logdirs = {}
         self._consumer = None
+        self._poller = None
+        self._shutdown = None
+        self._lock = threading.Lock()
         self._settings = settings
         self._sender = sender
-        # TODO(jhr): do we need locking in this queue?
-        self._watcher_queue = queue.PriorityQueue()
+        # events are put in arrival order, the consumer orders them
+        self._watcher_queue = queue.Queue()
         wandb.tensorboard.reset_state()
 
     def _calculate_namespace(self, logdir):
@@ -76,51 +125,58 @@ class TBWatcher(object):
             self._consumer.start()
 
         tbdir_watcher = TBDirWatcher(self, logdir, save, namespace, self._watcher_queue)
-        self._logdirs[logdir] = tbdir_watcher
-        tbdir_watcher.start()
+        with self._lock:
+            self._logdirs[logdir] = tbdir_watcher
+        if not self._poller:
+            self._poller = threading.Thread(target=self._poll_body)
+            self._poller.daemon = True
+            self._poller.start()
+
+    def _poll_body(self):
+        """Check every logdir for new events every POLL_SECONDS"""
+        shutdown_time = None
+        while True:
+            with self._lock:
+                tbdir_watchers = list(six.itervalues(self._logdirs))
+            for tbdir_watcher in tbdir_watchers:
+                tbdir_watcher.poll()
+            if self._shutdown:
+                now = time.time()
+                if not shutdown_time:
+                    shutdown_time = now + SHUTDOWN_DELAY
+                elif now > shutdown_time:
+                    break
+            time.sleep(POLL_SECONDS)
 
     def finish(self):
-        for tbdirwatcher in six.itervalues(self._logdirs):
-            tbdirwatcher.shutdown()
-        for tbdirwatcher in six.itervalues(self._logdirs):
-            tbdirwatcher.finish()
+        self._shutdown = True
+        if self._poller:
+            self._poller.join()
         if self._consumer:
             self._consumer.finish()
 
 
 class TBDirWatcher(object):
+    """Tails the tfevents files in a logdir.
+
+    Each file is read from the offset where the last poll left off, files
+    that didn't grow since aren't opened.
+    """
+
     def __init__(self, tbwatcher, logdir, save, namespace, queue):
-        self.directory_watcher = util.get_module(
-            "tensorboard.backend.event_processing.directory_watcher",
-            required="Please install tensorboard package",
-        )
-        self.event_file_loader = util.get_module(
-            "tensorboard.backend.event_processing.event_file_loader",
-            required="Please install tensorboard package",
-        )
-        self.tf_compat = util.get_module(
-            "tensorboard.compat", required="Please install tensorboard package"
-        )
         self._tbwatcher = tbwatcher
-        self._generator = self.directory_watcher.DirectoryWatcher(
-            logdir, self._loader(save, namespace), self._is_new_tensorflow_events_file
-        )
-        self._thread = threading.Thread(target=self._thread_body)
+        self._readers = {}
         self._first_event_timestamp = None
-        self._shutdown = None
         self._queue = queue
         self._file_version = None
+        self._save = save
         self._namespace = namespace
         self._logdir = logdir
 
-    def start(self):
-        self._thread.start()
-
     def _is_new_tensorflow_events_file(self, path):
         """Checks if a path has been modified since launch and contains tfevents"""
         if not path:
             raise ValueError("Path must be a nonempty string")
-        path = self.tf_compat.tf.compat.as_str_any(path)
         base = os.path.basename(path)
         start_time = self._tbwatcher._settings._start_time
         return (
@@ -129,42 +185,48 @@ class TBDirWatcher(object):
             and not base.endswith(".profile-empty")  # noqa: W503
         )
 
-    def _loader(self, save=True, namespace=None):
-        """Incredibly hacky class generator to optionally save / prefix tfevent files"""
-        _loader_sender = self._tbwatcher._sender
-
-        class EventFileLoader(self.event_file_loader.EventFileLoader):
-            def __init__(self, file_path):
-                super(EventFileLoader, self).__init__(file_path)
-                if save:
-                    # TODO: save plugins?
-                    logdir = os.path.dirname(file_path)
-                    parts = list(os.path.split(logdir))
-                    if namespace and parts[-1] == namespace:
-                        parts.pop()
-                        logdir = os.path.join(*parts)
-                    _link_and_save_file(
-                        file_path, base_path=logdir, sender=_loader_sender
-                    )
-
-        return EventFileLoader
-
-    def _thread_body(self):
-        """Check for new events every second"""
-        shutdown_time = None
-        while True:
+    def _list_paths(self):
+        if os.path.isfile(self._logdir):
+            return [self._logdir]
+        try:
+            names = os.listdir(self._logdir)
+        except OSError:
+            # the directory was deleted, or isn't there yet
+            return []
+        return [os.path.join(self._logdir, name) for name in names]
+
+    def _add_file(self, path):
+        self._readers[path] = tfevents.EventFileReader(path)
+        if self._save:
+            # TODO: save plugins?
+            logdir = os.path.dirname(path)
+            parts = list(os.path.split(logdir))
+            if self._namespace and parts[-1] == self._namespace:
+                parts.pop()
+                logdir = os.path.join(*parts)
+            _link_and_save_file(path, base_path=logdir, sender=self._tbwatcher._sender)
+
+    def poll(self):
+        """Queue the events written since the last poll"""
+        for path in self._list_paths():
+            if path in self._readers:
+                continue
+            try:
+                if not self._is_new_tensorflow_events_file(path):
+                    continue
+            except OSError:
+                continue
+            self._add_file(path)
+        for path in sorted(self._readers):
+            reader = self._readers[path]
             try:
-                for event in self._generator.Load():
+                if os.path.getsize(path) <= reader.offset:
+                    continue
+                for event in reader.read_events():
                     self.process_event(event)
-            except self.directory_watcher.DirectoryDeletedError:
-                break
-            if self._shutdown:
-                now = time.time()
-                if not shutdown_time:
-                    shutdown_time = now + SHUTDOWN_DELAY
-                elif now > shutdown_time:
-                    break
-            time.sleep(1)
+            except (IOError, OSError):
+                # the file was removed, keep its offset in case it comes back
+                continue
 
     def process_event(self, event):
         # print("\nEVENT:::", self._logdir, self._namespace, event, "\n")
@@ -177,16 +239,9 @@ class TBDirWatcher(object):
         if event.HasField("summary"):
             self._queue.put(Event(event, self._namespace))
 
-    def shutdown(self):
-        self._shutdown = True
-
-    def finish(self):
-        self.shutdown()
-        self._thread.join()
-
 
 class Event(object):
-    """An event wrapper to enable priority queueing"""
+    """An event wrapper, recording when it was queued"""
 
     def __init__(self, event, namespace):
         self.event = event
@@ -198,10 +253,15 @@ class Event(object):
 
 
 class TBEventConsumer(object):
-    """Consumes tfevents from a priority queue.  There should always
+    """Consumes tfevents from a queue.  There should always
     only be one of these per run_manager.  We wait for 10 seconds of queued
     events to reduce the chance of multiple tfevent files triggering
     out of order steps.
+
+    Events wait in a heap ordered by wall_time. Every time the oldest one has
+    been waiting for delay seconds, it and all the other events that are due
+    behind it are handled in one batch, then the consumer sleeps until the
+    next one is due or a new event comes in.
     """
 
     def __init__(self, tbwatcher, queue, delay=10):
@@ -217,27 +277,41 @@ class TBEventConsumer(object):
     def finish(self):
         self._delay = 0
         self._shutdown = True
+        # wake the consumer up, it may be waiting for the next deadline
+        self._queue.put(None)
         self._thread.join()
 
     def _thread_body(self):
         tb_history = TBHistory()
+        pending = []
+        seq = itertools.count()
         while True:
+            timeout = None
+            if pending:
+                timeout = max(0, pending[0][2].created_at + self._delay - time.time())
             try:
-                event = self._queue.get(True, 1)
-                # If the event was added later than delay, put it back in the queue
-                if event.created_at > time.time() - self._delay:
-                    self._queue.put(event)
-                    time.sleep(0.1)
-                    continue
+                event = self._queue.get(True, timeout)
+                while True:
+                    if event is not None:
+                        heapq.heappush(
+                            pending, (event.event.wall_time, next(seq), event)
+                        )
+                    event = self._queue.get_nowait()
             except queue.Empty:
-                event = None
-                if self._shutdown:
-                    break
-            if event:
-                self._handle_event(event, history=tb_history)
-                items = tb_history._get_and_reset()
-                for item in items:
+                pass
+
+            # everything that arrived before the watermark, in wall_time order,
+            # stopping at the first event that is still too recent
+            watermark = time.time() - self._delay
+            handled = False
+            while pending and pending[0][2].created_at <= watermark:
+                self._handle_event(heapq.heappop(pending)[2], history=tb_history)
+                handled = True
+            if handled:
+                for item in tb_history._get_and_reset():
                     self._save_row(item)
+            if self._shutdown and not pending and self._queue.empty():
+                break
         # flush uncommitted data
         tb_history._flush()
         items = tb_history._get_and_reset()
@@ -253,17 +327,7 @@ class TBEventConsumer(object):
         )
 
     def _save_row(self, row):
-        data = {}
-        for k, v in six.iteritems(row):
-            if v is None:
-                continue
-            if isinstance(v, data_types.Histogram):
-                v = v.to_json()
-            elif isinstance(v, data_types.WBValue):
-                # TODO(jhr): support more wandb data types
-                continue
-            data[k] = json.loads(json_dumps_safer_history(v))
-        self._tbwatcher._sender._save_history(data)
+        self._tbwatcher._sender._save_history(history_row(row))
 
 
 class TBHistory(object):
@@ -0,0 +1,174 @@
+"""tfevents reader.
+
+tfevents files are TFRecord files, a sequence of serialized Event protos:
+
+record :=
+  length: uint64        // little-endian
+  length_crc: uint32    // masked crc32c of length ; little-endian
+  data: uint8[length]
+  data_crc: uint32      // masked crc32c of data ; little-endian
+
+Writers append whole records and flush them at any point, so a reader
+tailing a live file can see a partial record at the end.  EventFileReader
+remembers the offset just past the last complete record and picks up from
+there on the next read.  Only the length checksum is verified, it's what
+tells a partial record from a corrupt one; a bad record body fails to parse.
+"""
+
+from __future__ import print_function
+
+import logging
+import struct
+
+from google.protobuf.message import DecodeError
+import six
+from wandb import util
+from wandb.proto import wandb_tfevents_pb2
+
+np = util.get_module("numpy")
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct("<QI")
+_FOOTER_LEN = 4
+
+_CRC32C_POLY = 0x82F63B78
+_CRC_MASK_DELTA = 0xA282EAD8
+
+
+def _crc32c_table():
+    table = []
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = (crc >> 1) ^ (_CRC32C_POLY if crc & 1 else 0)
+        table.append(crc)
+    return table
+
+
+_CRC32C_TABLE = _crc32c_table()
+
+
+def crc32c(data):
+    crc = 0xFFFFFFFF
+    for byte in six.iterbytes(data):
+        crc = _CRC32C_TABLE[(crc ^ byte) & 0xFF] ^ (crc >> 8)
+    return crc ^ 0xFFFFFFFF
+
+
+def masked_crc32c(data):
+    crc = crc32c(data)
+    return (((crc >> 15) | (crc << 17)) + _CRC_MASK_DELTA) & 0xFFFFFFFF
+
+
+def encode_record(data):
+    """Frame a serialized proto as a TFRecord."""
+    length = struct.pack("<Q", len(data))
+    return b"".join(
+        [
+            length,
+            struct.pack("<I", masked_crc32c(length)),
+            data,
+            struct.pack("<I", masked_crc32c(data)),
+        ]
+    )
+
+
+class EventFileReader(object):
+    """Reads the events in a tfevents file, starting at offset.
+
+    Each read returns the events that were completely written since the
+    last one.  The file is only open while it's being read, a log directory
+    can hold many more event files than we can keep open.
+    """
+
+    def __init__(self, path, offset=0):
+        self.path = path
+        self.offset = offset
+        self._corrupt = False
+
+    def read_events(self):
+        """Yield the events written since the last read."""
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            for event in self._read_records(f):
+                yield event
+
+    def _read_records(self, f):
+        while True:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                break
+            length, length_crc = _HEADER.unpack(header)
+            if masked_crc32c(header[:8]) != length_crc:
+                if not self._corrupt:
+                    logger.warning(
+                        "corrupt record at offset %d of %s", self.offset, self.path
+                    )
+                    self._corrupt = True
+                break
+            data = f.read(length + _FOOTER_LEN)
+            if len(data) < length + _FOOTER_LEN:
+                break
+            self.offset += _HEADER.size + length + _FOOTER_LEN
+            event = wandb_tfevents_pb2.Event()
+            try:
+                event.ParseFromString(data[:length])
+            except DecodeError:
+                logger.warning(
+                    "skipping unparseable record before offset %d of %s",
+                    self.offset,
+                    self.path,
+                )
+                continue
+            yield event
+
+
+# tensorflow DataType enum values, and the TensorProto field each one's
+# values are stored in when they aren't packed in tensor_content
+DT_STRING = 7
+DT_HALF = 19
+
+_DTYPES = {
+    1: ("float32", "float_val"),
+    2: ("float64", "double_val"),
+    3: ("int32", "int_val"),
+    4: ("uint8", "int_val"),
+    5: ("int16", "int_val"),
+    6: ("int8", "int_val"),
+    9: ("int64", "int64_val"),
+    10: ("bool", "bool_val"),
+    17: ("uint16", "int_val"),
+    DT_HALF: ("float16", "half_val"),
+    22: ("uint32", "uint32_val"),
+    23: ("uint64", "uint64_val"),
+}
+
+
+def make_ndarray(tensor):
+    """Convert a TensorProto to a numpy array.
+
+    Returns None for string tensors, which we don't log, and raises
+    ValueError for dtypes it can't convert.
+    """
+    if tensor.dtype == DT_STRING:
+        return None
+    if np is None or tensor.dtype not in _DTYPES:
+        raise ValueError("Can't convert tensor of dtype {}".format(tensor.dtype))
+    dtype, field = _DTYPES[tensor.dtype]
+    shape = [d.size for d in tensor.tensor_shape.dim]
+    num_elements = int(np.prod(shape, dtype=np.int64))
+    if tensor.tensor_content:
+        return np.frombuffer(tensor.tensor_content, dtype=dtype).copy().reshape(shape)
+    values = getattr(tensor, field)
+    if tensor.dtype == DT_HALF:
+        # half_val holds the bits of each float16
+        values = np.array(values, dtype="uint16").view("float16")
+    else:
+        values = np.array(values, dtype=dtype)
+    if len(values) == 0:
+        return np.zeros(shape, dtype=dtype)
+    if len(values) < num_elements:
+        # trailing elements repeat the last value given
+        values = np.pad(values, (0, num_elements - len(values)), "edge")
+    return values.reshape(shape)
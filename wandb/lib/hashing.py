@@ -0,0 +1,286 @@
+"""Single pass file hashing for artifacts.
+
+hash_file() reads a file once, in large buffers, and from that one pass gets
+its md5, its size and mtime (from the open file, no separate stat) and
+optionally a copy in the md5 object store of the artifacts cache, so the
+file doesn't have to be read again to fill the cache on upload.
+
+hash_files() hashes many files on a thread pool, or on a process pool when
+the number of processes is given, which scales with cores for datasets made
+of a great many small files.
+
+Both can consult a DigestCache, a persistent map from a file's path and stat
+fields to its md5, and only read the files that changed since they were last
+hashed, or whose object is missing from the md5 object store.
+"""
+
+import base64
+import codecs
+import collections
+import hashlib
+import io
+import logging
+import multiprocessing
+import multiprocessing.dummy
+import os
+import tempfile
+import threading
+import time
+
+from wandb.lib import filesystem
+
+FileDigest = collections.namedtuple("FileDigest", ("path", "md5", "size", "mtime"))
+
+logger = logging.getLogger(__name__)
+
+READ_BYTES = 1024 * 1024
+HASH_THREADS = 8
+
+# files modified this recently aren't put in the DigestCache
+RACY_SECONDS = 2
+
+_LOOKUP = "SELECT size, mtime, inode, dev, md5 FROM digests WHERE path = ?"
+
+
+def md5_obj_path(obj_dir, b64_md5):
+    """Path of an object in the md5 object store at obj_dir."""
+    hex_md5 = codecs.getencoder("hex")(base64.b64decode(b64_md5))[0].decode("ascii")
+    return os.path.join(obj_dir, hex_md5[:2], hex_md5[2:])
+
+
+class DigestCache(object):
+    """md5s of files keyed by path, size, mtime, inode and device, in sqlite.
+
+    An entry is only used while all of those stat fields are unchanged. Files
+    modified less than RACY_SECONDS before they were hashed aren't stored: a
+    write later within the same mtime tick would go unnoticed. Any sqlite
+    error disables the cache for the rest of the process, hashing still works
+    without it.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._lock = threading.Lock()
+        self._conn = None
+        self._disabled = False
+
+    def _connection(self):
+        if self._conn is None and not self._disabled:
+            try:
+                import sqlite3
+
+                filesystem._safe_makedirs(os.path.dirname(self._path))
+                conn = sqlite3.connect(self._path, timeout=30, check_same_thread=False)
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS digests ("
+                    "path TEXT PRIMARY KEY, size INTEGER, mtime REAL,"
+                    " inode INTEGER, dev INTEGER, md5 TEXT)"
+                )
+                conn.commit()
+                self._conn = conn
+            except Exception as e:
+                self._disable(e)
+        return self._conn
+
+    def _disable(self, e):
+        logger.warning("digest cache %s disabled: %s", self._path, e)
+        self._disabled = True
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def lookup(self, files):
+        """Cached md5s of files, a list of (path, os.stat_result) pairs.
+
+        Returns:
+            A dict of path to base64 md5 for the files that are cached and
+            unchanged.
+        """
+        found = {}
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return found
+            try:
+                for path, st in files:
+                    row = conn.execute(_LOOKUP, (os.path.abspath(path),)).fetchone()
+                    if row is not None and tuple(row[:4]) == (
+                        st.st_size,
+                        st.st_mtime,
+                        st.st_ino,
+                        st.st_dev,
+                    ):
+                        found[path] = row[4]
+            except Exception as e:
+                self._disable(e)
+        return found
+
+    def add(self, files):
+        """Store md5s for files, a list of (path, os.stat_result, md5)."""
+        now = time.time()
+        rows = [
+            (os.path.abspath(path), st.st_size, st.st_mtime, st.st_ino, st.st_dev, md5)
+            for path, st, md5 in files
+            if now - st.st_mtime >= RACY_SECONDS
+        ]
+        if not rows:
+            return
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?, ?, ?)", rows
+                )
+                conn.commit()
+            except Exception as e:
+                self._disable(e)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def hash_file(path, obj_dir=None, digest_cache=None):
+    """Hash path, reading it once.
+
+    Arguments:
+        path: the file to hash.
+        obj_dir: if given, the data is also copied to the md5 object store
+            rooted there (unless the object is already in it).
+        digest_cache: DigestCache to look the file up in first, and to store
+            its md5 in once hashed.
+
+    Returns:
+        FileDigest with the base64 md5 of the data read.
+    """
+    if digest_cache is not None:
+        return hash_files([path], obj_dir, digest_cache=digest_cache)[0]
+    hash_md5 = hashlib.md5()
+    size = 0
+    tmp_path = None
+    out = None
+    with io.open(path, "rb", buffering=0) as f:
+        st = os.fstat(f.fileno())
+        mtime = st.st_mtime
+        # small files are read with a single call, into a buffer that fits
+        buf = bytearray(min(READ_BYTES, st.st_size + 1))
+        view = memoryview(buf)
+        if obj_dir is not None:
+            filesystem._safe_makedirs(obj_dir)
+            fd, tmp_path = tempfile.mkstemp(dir=obj_dir, prefix=".", suffix=".tmp")
+            out = os.fdopen(fd, "wb")
+        try:
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                size += n
+                hash_md5.update(view[:n])
+                if out is not None:
+                    out.write(view[:n])
+        except Exception:
+            if out is not None:
+                out.close()
+                os.remove(tmp_path)
+            raise
+    b64_md5 = base64.b64encode(hash_md5.digest()).decode("ascii")
+    if out is not None:
+        out.close()
+        obj_path = md5_obj_path(obj_dir, b64_md5)
+        if os.path.isfile(obj_path) and os.path.getsize(obj_path) == size:
+            os.remove(tmp_path)
+        else:
+            filesystem._safe_makedirs(os.path.dirname(obj_path))
+            filesystem._replace(tmp_path, obj_path)
+    return FileDigest(path, b64_md5, size, mtime)
+
+
+def _hash_file_args(args):
+    return hash_file(*args)
+
+
+def _hash_files(paths, obj_dir, processes):
+    if len(paths) == 1:
+        return [hash_file(paths[0], obj_dir)]
+    if processes is None:
+        pool = multiprocessing.dummy.Pool(min(HASH_THREADS, len(paths)))
+        workers = HASH_THREADS
+    else:
+        workers = processes or multiprocessing.cpu_count()
+        pool = multiprocessing.Pool(workers)
+    # small files are cheap to hash, send them to the workers in chunks
+    chunksize = max(1, min(256, len(paths) // (workers * 4)))
+    try:
+        return pool.map(_hash_file_args, [(path, obj_dir) for path in paths], chunksize)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def hash_files(paths, obj_dir=None, processes=None, digest_cache=None):
+    """Hash many files, see hash_file.
+
+    Arguments:
+        paths: the files to hash.
+        obj_dir: md5 object store to copy the files to, or None.
+        processes: hash on a pool of this many processes instead of threads,
+            0 for one per core.
+        digest_cache: DigestCache of files that don't need to be read again,
+            unless obj_dir is given and doesn't hold their object yet.
+
+    Returns:
+        A list of FileDigest, in the order of paths.
+    """
+    paths = list(paths)
+    if not paths:
+        return []
+    stats = {}
+    cached = {}
+    if digest_cache is not None:
+        for path in paths:
+            try:
+                stats[path] = os.stat(path)
+            except OSError:
+                # hashing it raises the error
+                pass
+        cached = digest_cache.lookup(
+            [(path, stats[path]) for path in paths if path in stats]
+        )
+        if obj_dir is not None:
+            # read the files missing from the object store, to copy them in
+            for path, md5 in list(cached.items()):
+                obj_path = md5_obj_path(obj_dir, md5)
+                if not (
+                    os.path.isfile(obj_path)
+                    and os.path.getsize(obj_path) == stats[path].st_size
+                ):
+                    del cached[path]
+
+    misses = [path for path in paths if path not in cached]
+    digests = {}
+    if misses:
+        digests = dict(zip(misses, _hash_files(misses, obj_dir, processes)))
+    if digest_cache is not None and digests:
+        # only store what was read from the file we stat'ed
+        digest_cache.add(
+            [
+                (path, stats[path], digest.md5)
+                for path, digest in digests.items()
+                if path in stats
+                and digest.size == stats[path].st_size
+                and digest.mtime == stats[path].st_mtime
+            ]
+        )
+
+    results = []
+    for path in paths:
+        if path in digests:
+            results.append(digests[path])
+        else:
+            st = stats[path]
+            results.append(FileDigest(path, cached[path], st.st_size, st.st_mtime))
+    return results
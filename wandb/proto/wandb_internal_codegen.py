@@ -39,6 +39,14 @@ protoc.main((
     'wandb/proto/wandb_internal.proto',
     ))
 
+protoc.main((
+    '',
+    '-I', proto_root,
+    '-I', '.',
+    '--python_out=.',
+    'wandb/proto/wandb_tfevents.proto',
+    ))
+
 protoc.main((
     '',
     '-I', proto_root,
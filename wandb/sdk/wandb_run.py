@@ -93,12 +93,20 @@ class ExitHooks(object):
 class RunStatusChecker(object):
     """Periodically polls the background process for relevant updates.
 
-    For now, we just use this to figure out if the user has requested a stop.
+    We use this to figure out if the user has requested a stop, and to warn
+    when file_stream is falling behind: the backlog is at least
+    BEHIND_WARN_BYTES and kept growing for BEHIND_WARN_SECONDS.
     """
 
+    BEHIND_WARN_BYTES = 10 * 1024 * 1024
+    BEHIND_WARN_SECONDS = 60
+
     def __init__(self, interface, polling_interval=15):
         self._interface = interface
         self._polling_interval = polling_interval
+        self.file_stream_status = None
+        self._behind_since = None
+        self._behind_warned = False
 
         self._join_event = threading.Event()
         self._thread = threading.Thread(target=self.check_status)
@@ -116,8 +124,40 @@ class RunStatusChecker(object):
             if status_response.run_should_stop:
                 thread.interrupt_main()
                 return
+            self._check_file_stream(status_response.file_stream)
             join_requested = self._join_event.wait(self._polling_interval)
 
+    def _check_file_stream(self, status):
+        last = self.file_stream_status
+        self.file_stream_status = status
+        logger.info(
+            "file_stream: queue_depth=%d pending_bytes=%d last_latency=%.2f",
+            status.queue_depth,
+            status.pending_bytes,
+            status.last_latency,
+        )
+        now = time.time()
+        if (
+            last is None
+            or status.pending_bytes <= last.pending_bytes
+            or status.pending_bytes < self.BEHIND_WARN_BYTES
+        ):
+            self._behind_since = None
+            self._behind_warned = False
+            return
+        if self._behind_since is None:
+            self._behind_since = now
+        if (
+            not self._behind_warned
+            and now - self._behind_since >= self.BEHIND_WARN_SECONDS
+        ):
+            self._behind_warned = True
+            wandb.termwarn(
+                "Uploads are falling behind: {} MiB waiting to be streamed".format(
+                    status.pending_bytes // (1024 * 1024)
+                )
+            )
+
     def join(self):
         self._join_event.set()
         self._thread.join()
@@ -286,6 +286,18 @@ class Settings(six.with_metaclass(CantTouchThis, object)):
         _early_logger=None,
         _internal_queue_timeout=2,
         _internal_check_process=8,
+        _summary_flush_seconds=1,
+        _summary_flush_steps=None,
+        _file_stream_gzip=False,
+        _file_stream_max_pending_bytes=64 * 1024 * 1024,
+        _file_stream_spool=True,
+        _sync_file_durability="flush",
+        _sync_file_fsync_seconds=1,
+        _sync_file_index=True,
+        _transport="queue",
+        _transport_batch_bytes=256 * 1024,
+        _transport_batch_seconds=0.05,
+        _transport_shm_bytes=8 * 1024 * 1024,
         _disable_meta=None,
         _disable_stats=None,
         _jupyter_path=None,
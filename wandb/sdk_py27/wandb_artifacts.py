@@ -1,7 +1,15 @@
+import collections
+import contextlib
+import hashlib
+import logging
+import multiprocessing.dummy
 import re
 import os
+import tempfile
+import threading
 import time
 import shutil
+import psutil  # type: ignore
 import requests
 from six.moves.urllib.parse import urlparse
 
@@ -12,30 +20,269 @@ from wandb.internal.progress import Progress
 from wandb.apis import InternalApi
 from wandb.errors.error import CommError
 from wandb import util
+from wandb.lib import filesystem, hashing
 from wandb.errors.term import termwarn, termlog
 
 
+logger = logging.getLogger(__name__)
+
+_COPY_CHUNK_BYTES = 1024 * 1024
+
+# objects this big are downloaded in parts, over parallel ranged GETs
+RANGED_DOWNLOAD_MIN_BYTES = 64 * 1024 * 1024
+RANGED_DOWNLOAD_PART_BYTES = 16 * 1024 * 1024
+RANGED_DOWNLOAD_PART_THREADS = 8
+RANGED_DOWNLOAD_PART_RETRIES = 3
+
+# GETs in flight across all downloads of the process, whether of many small
+# files or parts of a few large ones; the size of the session's connection pool
+DOWNLOAD_CONCURRENCY = 64
+_download_slots = threading.BoundedSemaphore(DOWNLOAD_CONCURRENCY)
+
+CacheCleanup = collections.namedtuple(
+    "CacheCleanup", ("total_bytes", "reclaimed_bytes", "removed_files")
+)
+
+
 class ArtifactsCache(object):
-    def __init__(self, cache_dir):
+    """Content addressed store of artifact files, shared between processes.
+
+    Objects are written to a temp file and renamed into place, so a reader
+    never sees a partial object. Every hit sets the object's atime, leaving its
+    mtime alone (downloads compare it to their copies), and cleanup() evicts
+    by the later of the two. Objects that are in use, like the files of an
+    artifact waiting to be uploaded, are pin()ned by their process and never
+    evicted while it runs. With max_bytes set the cache cleans itself up as
+    objects get added. Fetching a missing object is done under obj_lock(), so
+    concurrent consumers wait for one download instead of each making their
+    own.
+    """
+
+    _TMP_PREFIX = "."
+    _TMP_SUFFIX = ".tmp"
+    # temp files untouched for this long were left behind by a crash
+    _STALE_TMP_SECONDS = 60 * 60
+    # objects used this recently are never evicted, someone may be reading them
+    _EVICT_MIN_AGE_SECONDS = 5 * 60
+    # clean up once this fraction of max_bytes has been added
+    _CLEANUP_FRACTION = 0.1
+    # objects share this many lock files, there is no need for one per object
+    _OBJ_LOCK_STRIPES = 4096
+
+    def __init__(self, cache_dir, max_bytes=None):
         self._cache_dir = cache_dir
         util.mkdir_exists_ok(self._cache_dir)
         self._md5_obj_dir = os.path.join(self._cache_dir, "obj", "md5")
         self._etag_obj_dir = os.path.join(self._cache_dir, "obj", "etag")
+        self._lock_path = os.path.join(self._cache_dir, "cleanup.lock")
+        self._obj_locks_dir = os.path.join(self._cache_dir, "locks")
+        self._pins_dir = os.path.join(self._cache_dir, "pins")
+        self._pins = {}
+        self._pins_lock = threading.Lock()
+        self._max_bytes = max_bytes
+        self._added_bytes = None
+        self._added_lock = threading.Lock()
 
-    def check_md5_obj_path(self, b64_md5, size):
-        hex_md5 = util.bytes_to_hex(base64.b64decode(b64_md5))
-        path = os.path.join(self._cache_dir, "obj", "md5", hex_md5[:2], hex_md5[2:])
-        if os.path.isfile(path) and os.path.getsize(path) == size:
+    @property
+    def md5_obj_dir(self):
+        return self._md5_obj_dir
+
+    def has_obj(self, path, size):
+        # objects are renamed into place once complete, the size is enough
+        return os.path.isfile(path) and os.path.getsize(path) == size
+
+    def _check_obj_path(self, path, size):
+        if self.has_obj(path, size):
+            try:
+                os.utime(path, (time.time(), os.stat(path).st_mtime))
+            except OSError:
+                # a read only cache still works, it's just not LRU
+                pass
             return path, True
         util.mkdir_exists_ok(os.path.dirname(path))
+        self.added(size)
         return path, False
 
+    def check_md5_obj_path(self, b64_md5, size):
+        hex_md5 = util.bytes_to_hex(base64.b64decode(b64_md5))
+        path = os.path.join(self._cache_dir, "obj", "md5", hex_md5[:2], hex_md5[2:])
+        return self._check_obj_path(path, size)
+
     def check_etag_obj_path(self, etag, size):
         path = os.path.join(self._cache_dir, "obj", "etag", etag[:2], etag[2:])
-        if os.path.isfile(path) and os.path.getsize(path) == size:
-            return path, True
-        util.mkdir_exists_ok(os.path.dirname(path))
-        return path, False
+        return self._check_obj_path(path, size)
+
+    @contextlib.contextmanager
+    def obj_writer(self, path):
+        """Open a temp file that is renamed to the object path on success.
+
+        The temp file is removed instead if the block raises.
+        """
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(path), prefix=self._TMP_PREFIX, suffix=self._TMP_SUFFIX,
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                yield f
+            filesystem._replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @contextlib.contextmanager
+    def obj_lock(self, path):
+        """Hold an exclusive lock on the object at path, across processes."""
+        stripe = int(hashlib.md5(path.encode("utf-8")).hexdigest(), 16)
+        util.mkdir_exists_ok(self._obj_locks_dir)
+        lock_path = os.path.join(
+            self._obj_locks_dir, "%03x.lock" % (stripe % self._OBJ_LOCK_STRIPES)
+        )
+        with filesystem.file_lock(lock_path):
+            yield
+
+    def _pin_name(self, path):
+        obj_dir = os.path.join(self._cache_dir, "obj")
+        return os.path.relpath(path, obj_dir).replace(os.sep, "-")
+
+    def pin(self, path):
+        """Keep the object at path from being evicted until unpin(), or until
+        this process exits.
+        """
+        with self._pins_lock:
+            count = self._pins.get(path, 0)
+            if count == 0:
+                util.mkdir_exists_ok(self._pins_dir)
+                pin_path = os.path.join(
+                    self._pins_dir, "%s.%d" % (self._pin_name(path), os.getpid())
+                )
+                open(pin_path, "a").close()
+            self._pins[path] = count + 1
+
+    def unpin(self, path):
+        with self._pins_lock:
+            count = self._pins.pop(path, 0) - 1
+            if count > 0:
+                self._pins[path] = count
+            elif count == 0:
+                self._remove(
+                    os.path.join(
+                        self._pins_dir, "%s.%d" % (self._pin_name(path), os.getpid())
+                    )
+                )
+
+    @contextlib.contextmanager
+    def pinned(self, path):
+        self.pin(path)
+        try:
+            yield path
+        finally:
+            self.unpin(path)
+
+    def _pinned_names(self):
+        """Names of the pinned objects, removing the pins of exited processes."""
+        names = set()
+        try:
+            pins = os.listdir(self._pins_dir)
+        except OSError:
+            return names
+        for pin in pins:
+            name, _, pid = pin.rpartition(".")
+            if pid.isdigit() and psutil.pid_exists(int(pid)):
+                names.add(name)
+            else:
+                self._remove(os.path.join(self._pins_dir, pin))
+        return names
+
+    def copy_md5_obj(self, src_path, b64_md5, size):
+        """Add a copy of src_path to the cache unless it's there, returns its path."""
+        path, hit = self.check_md5_obj_path(b64_md5, size)
+        if not hit:
+            with self.obj_writer(path) as f:
+                with open(src_path, "rb") as src:
+                    shutil.copyfileobj(src, f, _COPY_CHUNK_BYTES)
+        return path
+
+    def added(self, size):
+        """Account for size bytes being added, cleaning up when enough were."""
+        if not self._max_bytes:
+            return
+        with self._added_lock:
+            # the first addition of the process checks the cache size
+            if self._added_bytes is not None:
+                self._added_bytes += size
+                if self._added_bytes < self._max_bytes * self._CLEANUP_FRACTION:
+                    return
+            self._added_bytes = 0
+        # leave room for what is being added
+        self.cleanup(max(0, self._max_bytes - size), blocking=False)
+
+    def cleanup(self, target_bytes, blocking=True):
+        """Evict least recently used objects until the cache fits target_bytes.
+
+        Temp files left behind by crashed writers are removed as well. Only
+        one process cleans up at a time; without blocking this returns None
+        right away if another one is.
+
+        Returns:
+            CacheCleanup with the size of the cache after the cleanup.
+        """
+        with filesystem.file_lock(self._lock_path, blocking=blocking) as locked:
+            if not locked:
+                return None
+            now = time.time()
+            pinned = self._pinned_names()
+            objects = []
+            total_bytes = 0
+            reclaimed_bytes = 0
+            removed_files = 0
+            for root, _, files in os.walk(os.path.join(self._cache_dir, "obj")):
+                for name in files:
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    if name.startswith(self._TMP_PREFIX) and name.endswith(
+                        self._TMP_SUFFIX
+                    ):
+                        if now - st.st_mtime > self._STALE_TMP_SECONDS:
+                            if self._remove(path):
+                                reclaimed_bytes += st.st_size
+                                removed_files += 1
+                        continue
+                    if self._pin_name(path) in pinned:
+                        continue
+                    last_used = max(st.st_atime, st.st_mtime)
+                    objects.append((last_used, st.st_size, path))
+                    total_bytes += st.st_size
+
+            objects.sort()
+            for last_used, size, path in objects:
+                if total_bytes <= target_bytes:
+                    break
+                try:
+                    # it may have been used since the walk
+                    st = os.stat(path)
+                    if (
+                        now - max(st.st_atime, st.st_mtime)
+                        < self._EVICT_MIN_AGE_SECONDS
+                    ):
+                        continue
+                except OSError:
+                    continue
+                if self._remove(path):
+                    total_bytes -= size
+                    reclaimed_bytes += size
+                    removed_files += 1
+            return CacheCleanup(total_bytes, reclaimed_bytes, removed_files)
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
 
 
 _artifacts_cache = None
@@ -45,10 +292,24 @@ def get_artifacts_cache():
     global _artifacts_cache
     if _artifacts_cache is None:
         cache_dir = os.path.join(env.get_cache_dir(), "artifacts")
-        _artifacts_cache = ArtifactsCache(cache_dir)
+        max_bytes = env.get_artifact_cache_max_bytes()
+        if max_bytes is not None:
+            max_bytes = util.from_human_size(max_bytes)
+        _artifacts_cache = ArtifactsCache(cache_dir, max_bytes=max_bytes)
     return _artifacts_cache
 
 
+_digest_cache = None
+
+
+def get_digest_cache():
+    global _digest_cache
+    if _digest_cache is None:
+        path = os.path.join(env.get_cache_dir(), "artifacts", "digests.db")
+        _digest_cache = hashing.DigestCache(path)
+    return _digest_cache
+
+
 class Artifact(object):
     """An artifact object you can write files into, and pass to log_artifact."""
 
@@ -121,11 +382,18 @@ class Artifact(object):
             raise ValueError("Path is not a file: %s" % local_path)
 
         name = name or os.path.basename(local_path)
+        # one read hashes the file and fills the cache for the upload
+        digest = hashing.hash_file(
+            local_path,
+            obj_dir=self._cache.md5_obj_dir,
+            digest_cache=get_digest_cache(),
+        )
+        self._cache.added(digest.size)
         entry = ArtifactManifestEntry(
             name,
             None,
-            digest=md5_file_b64(local_path),
-            size=os.path.getsize(local_path),
+            digest=digest.md5,
+            size=digest.size,
             local_path=local_path,
         )
         self._manifest.add_entry(entry)
@@ -151,26 +419,24 @@ class Artifact(object):
                     logical_path = os.path.join(name, logical_path)
                 paths.append((logical_path, physical_path))
 
-        def add_manifest_file(log_phy_path):
-            logical_path, physical_path = log_phy_path
+        digests = hashing.hash_files(
+            [physical_path for _, physical_path in paths],
+            obj_dir=self._cache.md5_obj_dir,
+            processes=env.get_artifact_hash_processes(),
+            digest_cache=get_digest_cache(),
+        )
+        self._cache.added(sum(digest.size for digest in digests))
+        for (logical_path, physical_path), digest in zip(paths, digests):
             self._manifest.add_entry(
                 ArtifactManifestEntry(
                     logical_path,
                     None,
-                    digest=md5_file_b64(physical_path),
-                    size=os.path.getsize(physical_path),
+                    digest=digest.md5,
+                    size=digest.size,
                     local_path=physical_path,
                 )
             )
 
-        import multiprocessing.dummy  # this uses threads
-
-        NUM_THREADS = 8
-        pool = multiprocessing.dummy.Pool(NUM_THREADS)
-        pool.map(add_manifest_file, paths)
-        pool.close()
-        pool.join()
-
         termlog("Done. %.1fs" % (time.time() - start_time), prefix=False)
 
     def add_reference(self, uri, name=None, checksum=True, max_objects=None):
@@ -219,12 +485,11 @@ class Artifact(object):
                     entry.local_path, start=self._artifact_dir.name
                 )
                 local_path = os.path.join(self._artifact_dir.name, rel_path)
-                cache_path, hit = self._cache.check_md5_obj_path(
-                    entry.digest, entry.size
+                entry.local_path = self._cache.copy_md5_obj(
+                    local_path, entry.digest, entry.size
                 )
-                if not hit:
-                    shutil.copyfile(local_path, cache_path)
-                entry.local_path = cache_path
+                # the entry is uploaded from the cache, possibly much later
+                self._cache.pin(entry.local_path)
 
             for entry in self._manifest.entries.values():
                 remap_entry(entry)
@@ -326,6 +591,10 @@ class ArtifactManifestEntry(object):
         return "<ManifestEntry %s>" % summary
 
 
+class _RangesNotSupported(Exception):
+    pass
+
+
 class WandbStoragePolicy(StoragePolicy):
     @classmethod
     def name(cls):
@@ -371,18 +640,157 @@ class WandbStoragePolicy(StoragePolicy):
         if hit:
             return path
 
-        response = self._session.get(
-            self._file_url(self._api, artifact.entity, manifest_entry.digest),
-            auth=("api", self._api.api_key),
-            stream=True,
-        )
-        response.raise_for_status()
-
-        with open(path, "wb") as file:
-            for data in response.iter_content(chunk_size=16 * 1024):
-                file.write(data)
+        with self._cache.obj_lock(path):
+            # another process may have downloaded it while this one waited
+            if self._cache.has_obj(path, manifest_entry.size):
+                return path
+            url = self._file_url(self._api, artifact.entity, manifest_entry.digest)
+            if manifest_entry.size >= RANGED_DOWNLOAD_MIN_BYTES and hasattr(
+                os, "pwrite"
+            ):
+                try:
+                    self._ranged_download(url, path, name, manifest_entry)
+                    return path
+                except _RangesNotSupported:
+                    logger.info("ranged GETs not supported for %s", name)
+            self._stream_download(url, path, name, manifest_entry)
         return path
 
+    def _check_digest(self, name, manifest_entry, md5):
+        if md5 != manifest_entry.digest:
+            raise ValueError(
+                "Digest mismatch for %s: expected %s but downloaded %s"
+                % (name, manifest_entry.digest, md5)
+            )
+
+    def _stream_download(self, url, path, name, manifest_entry):
+        with _download_slots:
+            response = self._session.get(
+                url, auth=("api", self._api.api_key), stream=True
+            )
+            response.raise_for_status()
+
+            hash_md5 = hashlib.md5()
+            with self._cache.obj_writer(path) as file:
+                for data in response.iter_content(chunk_size=_COPY_CHUNK_BYTES):
+                    file.write(data)
+                    hash_md5.update(data)
+                md5 = base64.b64encode(hash_md5.digest()).decode("ascii")
+                self._check_digest(name, manifest_entry, md5)
+
+    def _ranged_download(self, url, path, name, manifest_entry):
+        """Download path in parts, into a preallocated temp file.
+
+        Completed parts are recorded next to the temp file, so a download
+        interrupted by a crash resumes from the parts it was missing. The
+        caller holds the object lock, no one else writes these files.
+        """
+        size = manifest_entry.size
+        part_bytes = RANGED_DOWNLOAD_PART_BYTES
+        nparts = (size + part_bytes - 1) // part_bytes
+        dir_name, base_name = os.path.split(path)
+        tmp_path = os.path.join(dir_name, ".%s.download.tmp" % base_name)
+        parts_path = os.path.join(dir_name, ".%s.parts.tmp" % base_name)
+        header = "%d %d" % (size, part_bytes)
+
+        done = set()
+        if os.path.isfile(tmp_path) and os.path.getsize(tmp_path) == size:
+            try:
+                with open(parts_path) as f:
+                    lines = f.read().splitlines()
+                if lines and lines[0] == header:
+                    done = set(int(line) for line in lines[1:] if line.isdigit())
+            except (IOError, OSError):
+                pass
+        if done:
+            logger.info("resuming download of %s, %d/%d parts", name, len(done), nparts)
+        else:
+            with open(parts_path, "w") as f:
+                f.write(header + "\n")
+
+        fd = os.open(tmp_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if not done:
+                os.ftruncate(fd, 0)
+                if hasattr(os, "posix_fallocate"):
+                    try:
+                        os.posix_fallocate(fd, 0, size)
+                    except OSError:
+                        os.ftruncate(fd, size)
+                else:
+                    os.ftruncate(fd, size)
+            parts_lock = threading.Lock()
+
+            def download_part(index):
+                start = index * part_bytes
+                end = min(start + part_bytes, size) - 1
+                self._download_range(url, fd, start, end)
+                with parts_lock:
+                    with open(parts_path, "a") as f:
+                        f.write("%d\n" % index)
+
+            todo = [i for i in range(nparts) if i not in done]
+            pool = multiprocessing.dummy.Pool(
+                min(RANGED_DOWNLOAD_PART_THREADS, max(1, len(todo)))
+            )
+            try:
+                pool.map(download_part, todo)
+            finally:
+                pool.close()
+                pool.join()
+        except _RangesNotSupported:
+            os.close(fd)
+            fd = None
+            os.remove(tmp_path)
+            os.remove(parts_path)
+            raise
+        finally:
+            if fd is not None:
+                os.close(fd)
+
+        md5 = hashing.hash_file(tmp_path).md5
+        if md5 != manifest_entry.digest:
+            os.remove(tmp_path)
+            os.remove(parts_path)
+            self._check_digest(name, manifest_entry, md5)
+        filesystem._replace(tmp_path, path)
+        os.remove(parts_path)
+
+    def _download_range(self, url, fd, start, end):
+        """Write bytes start to end (inclusive) of url at the same offsets of fd.
+
+        A part cut short is retried from where it stopped.
+        """
+        offset = start
+        for attempt in range(RANGED_DOWNLOAD_PART_RETRIES):
+            try:
+                with _download_slots:
+                    response = self._session.get(
+                        url,
+                        auth=("api", self._api.api_key),
+                        headers={"Range": "bytes=%d-%d" % (offset, end)},
+                        stream=True,
+                    )
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        response.close()
+                        raise _RangesNotSupported()
+                    for data in response.iter_content(chunk_size=_COPY_CHUNK_BYTES):
+                        data = data[: end + 1 - offset]
+                        os.pwrite(fd, data, offset)
+                        offset += len(data)
+                if offset > end:
+                    return
+                logger.info("range %d-%d of %s cut short", start, end, url)
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.ChunkedEncodingError,
+            ) as e:
+                if attempt == RANGED_DOWNLOAD_PART_RETRIES - 1:
+                    raise
+                logger.info("retrying range %d-%d of %s: %s", start, end, url, e)
+        raise CommError("Failed to download bytes %d-%d of %s" % (start, end, url))
+
     def store_reference(
         self, artifact, path, name=None, checksum=True, max_objects=None
     ):
@@ -401,9 +809,7 @@ class WandbStoragePolicy(StoragePolicy):
 
     def store_file(self, artifact_id, entry, preparer, progress_callback=None):
         # write-through cache
-        cache_path, hit = self._cache.check_md5_obj_path(entry.digest, entry.size)
-        if not hit:
-            shutil.copyfile(entry.local_path, cache_path)
+        self._cache.copy_md5_obj(entry.local_path, entry.digest, entry.size)
 
         resp = preparer.prepare(
             lambda: {
@@ -415,18 +821,29 @@ class WandbStoragePolicy(StoragePolicy):
 
         exists = resp.upload_url is None
         if not exists:
+            headers = {
+                header.split(":", 1)[0]: header.split(":", 1)[1]
+                for header in (resp.upload_headers or {})
+            }
             with open(entry.local_path, "rb") as file:
                 # This fails if we don't send the first byte before the signed URL
                 # expires.
-                r = self._session.put(
-                    resp.upload_url,
-                    headers={
-                        header.split(":", 1)[0]: header.split(":", 1)[1]
-                        for header in (resp.upload_headers or {})
-                    },
-                    data=Progress(file, callback=progress_callback),
-                )
-                r.raise_for_status()
+                if entry.size == 0:
+                    # upload_file refuses empty files
+                    r = self._session.put(
+                        resp.upload_url,
+                        headers=headers,
+                        data=Progress(file, callback=progress_callback),
+                    )
+                    r.raise_for_status()
+                else:
+                    # retried, and resumed where the storage supports it
+                    self._api.upload_file_retry(
+                        resp.upload_url,
+                        file,
+                        progress_callback,
+                        extra_headers=headers,
+                    )
         return exists
 
 
@@ -577,12 +994,13 @@ class LocalFileHandler(StorageHandler):
             raise ValueError("Failed to find file at path %s" % local_path)
 
         path = "%s/%s" % (artifact.cache_dir, manifest_entry.path)
+        digest_cache = get_digest_cache()
         if os.path.isfile(path):
-            md5 = md5_file_b64(path)
+            md5 = hashing.hash_file(path, digest_cache=digest_cache).md5
             if md5 == manifest_entry.digest:
                 # Skip download.
                 return path
-        md5 = md5_file_b64(local_path)
+        md5 = hashing.hash_file(local_path, digest_cache=digest_cache).md5
         if md5 != manifest_entry.digest:
             raise ValueError(
                 "Digest mismatch for path %s: expected %s but found %s"
@@ -613,6 +1031,7 @@ class LocalFileHandler(StorageHandler):
                 % (max_objects, local_path),
                 newline=False,
             )
+            sub_paths = []
             for root, dirs, files in os.walk(local_path):
                 for sub_path in files:
                     i += 1
@@ -621,21 +1040,26 @@ class LocalFileHandler(StorageHandler):
                             "Exceeded %i objects tracked, pass max_objects to add_reference"
                             % max_objects
                         )
-                    entry = ArtifactManifestEntry(
-                        os.path.basename(sub_path),
-                        os.path.join(path, sub_path),
-                        size=os.path.getsize(sub_path),
-                        digest=md5_file_b64(sub_path),
-                    )
-                    entries.append(entry)
+                    sub_paths.append((root, sub_path))
+            # unchanged files are found in the digest cache without reading them
+            digests = hashing.hash_files(
+                [os.path.join(root, sub_path) for root, sub_path in sub_paths],
+                digest_cache=get_digest_cache(),
+            )
+            for (root, sub_path), digest in zip(sub_paths, digests):
+                entry = ArtifactManifestEntry(
+                    os.path.basename(sub_path),
+                    os.path.join(path, sub_path),
+                    size=digest.size,
+                    digest=digest.md5,
+                )
+                entries.append(entry)
             termlog("Done. %.1fs" % (time.time() - start_time), prefix=False)
         elif os.path.isfile(local_path):
             name = name or os.path.basename(local_path)
+            digest = hashing.hash_file(local_path, digest_cache=get_digest_cache())
             entry = ArtifactManifestEntry(
-                name,
-                path,
-                size=os.path.getsize(local_path),
-                digest=md5_file_b64(local_path),
+                name, path, size=digest.size, digest=digest.md5,
             )
             entries.append(entry)
         else:
@@ -101,6 +101,14 @@ class Backend:
             sync_file=sync_file,
             _internal_queue_timeout=20,
             _internal_check_process=0,
+            _summary_flush_seconds=1,
+            _summary_flush_steps=None,
+            _file_stream_gzip=False,
+            _file_stream_max_pending_bytes=64 * 1024 * 1024,
+            _file_stream_spool=True,
+            _sync_file_durability="flush",
+            _sync_file_fsync_seconds=1,
+            _sync_file_index=True,
             _disable_meta=True,
             _disable_stats=False,
             git_remote=None,
@@ -3,3 +3,4 @@ module sync
 """
 
 from .sync import SyncManager  # noqa: F401
+from .tb_import import TBImporter  # noqa: F401
@@ -35,10 +35,7 @@ class SyncThread(threading.Thread):
             sm = sender.SendManager(settings=settings, resp_q=resp_queue)
             ds = datastore.DataStore()
             ds.open_for_scan(sync_item)
-            while True:
-                data = ds.scan_data()
-                if data is None:
-                    break
+            for data in ds:
                 pb = wandb_internal_pb2.Record()
                 pb.ParseFromString(data)
                 sm.send(pb)
@@ -47,6 +44,7 @@ class SyncThread(threading.Thread):
                         _ = resp_queue.get(timeout=20)
                     except queue.Empty:
                         raise Exception("timeout?")
+            ds.close()
             sm.finish()
 
 
@@ -0,0 +1,169 @@
+"""
+tb_import: bulk import of TensorBoard log directories.
+
+Each logdir becomes a new run, unless a run id is given to update an earlier
+import of a single logdir.  Its event files are parsed in worker processes,
+the rows they hold are merged by step and streamed straight to the run's
+history, without going through the live tensorboard watcher and its delay.
+"""
+
+from __future__ import print_function
+
+import collections
+import json
+import logging
+import multiprocessing
+import os
+import time
+
+import six
+import wandb
+from wandb import util
+from wandb.integration.tensorboard.log import tf_summary_to_dict
+from wandb.internal import file_stream
+from wandb.internal import internal_api
+from wandb.internal import tb_watcher
+from wandb.internal import tfevents
+from wandb.lib.filenames import HISTORY_FNAME, SUMMARY_FNAME
+
+
+logger = logging.getLogger(__name__)
+
+# summaries that would be saved as media files, which we don't import
+SKIPPED_KINDS = ("image", "audio")
+
+
+def find_event_files(logdir):
+    """List the event files under logdir, with the namespace for their values.
+
+    Files in subdirectories are namespaced by their path, the way tensorboard
+    shows the train/ and validation/ runs of a logdir.
+    """
+    found = []
+    for dirpath, dirnames, filenames in os.walk(logdir):
+        dirnames.sort()
+        namespace = os.path.relpath(dirpath, logdir)
+        if namespace == os.curdir:
+            namespace = None
+        else:
+            namespace = namespace.replace(os.sep, "/")
+        for name in sorted(filenames):
+            if "tfevents" in name and not name.endswith(".profile-empty"):
+                found.append((os.path.join(dirpath, name), namespace))
+    return found
+
+
+def read_event_file(path_and_namespace):
+    """Read the history values of an event file, keyed by step."""
+    path, namespace = path_and_namespace
+    steps = {}
+    for event in tfevents.EventFileReader(path).read_events():
+        if not event.HasField("summary"):
+            continue
+        values = [
+            v for v in event.summary.value if v.WhichOneof("value") not in SKIPPED_KINDS
+        ]
+        if len(values) < len(event.summary.value):
+            del event.summary.value[:]
+            event.summary.value.extend(values)
+        row = tf_summary_to_dict(event, namespace)
+        if row is None:
+            continue
+        steps.setdefault(event.step, {}).update(tb_watcher.history_row(row))
+    return steps
+
+
+def merge_steps(file_steps):
+    """Merge the values of a logdir's event files into one row per step."""
+    merged = {}
+    for steps in file_steps:
+        for step, values in six.iteritems(steps):
+            row = merged.setdefault(step, {})
+            timestamp = max(row.get("_timestamp", 0), values["_timestamp"])
+            row.update(values)
+            row["_timestamp"] = timestamp
+    rows = []
+    for i, step in enumerate(sorted(merged)):
+        row = merged[step]
+        row["global_step"] = step
+        row["_step"] = i
+        rows.append(row)
+    return rows
+
+
+class TBImporter(object):
+    """Imports TensorBoard logdirs as runs, one run per logdir.
+
+    Event files are parsed by a pool of worker processes, up to `processes`
+    logdirs ahead of the one being uploaded.  Every logdir gets a random run
+    id, pass `run_id` to import a single logdir into that run instead.
+    """
+
+    def __init__(
+        self,
+        logdirs,
+        project=None,
+        entity=None,
+        processes=None,
+        api=None,
+        run_id=None,
+    ):
+        if run_id and len(logdirs) > 1:
+            raise ValueError("A run id can only be given for a single logdir")
+        self._logdirs = logdirs
+        self._run_id = run_id
+        self._project = project
+        self._entity = entity
+        self._processes = processes or multiprocessing.cpu_count()
+        self._api = api or internal_api.Api()
+
+    def run(self):
+        pool = multiprocessing.Pool(self._processes)
+        try:
+            pending = collections.deque()
+            for logdir in self._logdirs:
+                files = find_event_files(logdir)
+                if not files:
+                    wandb.termwarn("No tfevents files found in {}".format(logdir))
+                    continue
+                results = [pool.apply_async(read_event_file, (f,)) for f in files]
+                pending.append((logdir, results))
+                if len(pending) > self._processes:
+                    self._import(*pending.popleft())
+            while pending:
+                self._import(*pending.popleft())
+        finally:
+            pool.terminate()
+            pool.join()
+
+    def _import(self, logdir, results):
+        rows = merge_steps(r.get() for r in results)
+        if not rows:
+            wandb.termwarn("No summaries found in {}".format(logdir))
+            return
+        ups, _ = self._api.upsert_run(
+            name=self._run_id or util.generate_id(),
+            display_name=os.path.basename(os.path.normpath(logdir)),
+            project=self._project,
+            entity=self._entity,
+        )
+        project = ups["project"]
+        settings = dict(entity=project["entity"]["name"], project=project["name"])
+        fs = file_stream.FileStreamApi(
+            self._api, ups["name"], time.time(), settings=settings, compress=True
+        )
+        fs.set_file_policy(HISTORY_FNAME, file_stream.JsonlFilePolicy())
+        fs.set_file_policy(SUMMARY_FNAME, file_stream.SummaryFilePolicy())
+        fs.start()
+        summary = {}
+        for row in rows:
+            fs.push(HISTORY_FNAME, json.dumps(row))
+            summary.update(row)
+        fs.push(SUMMARY_FNAME, json.dumps(summary))
+        fs.finish(0)
+        logger.info("imported %s as run %s", logdir, ups["name"])
+        wandb.termlog(
+            "Imported {} steps from {} to {}/{}/{}".format(
+                len(rows), logdir, settings["entity"], settings["project"], ups["name"]
+            )
+        )